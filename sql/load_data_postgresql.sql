@@ -89,7 +89,7 @@ CREATE TABLE F_Team_Player_Season (
     id_team INT NOT NULL,
     id_player INT NOT NULL,
     number VARCHAR(10),
-    id_position INT NOT NULL,
+    id_position INT,
     market_value INT,
     PRIMARY KEY (season_id, id_team, id_player),
     FOREIGN KEY (season_id) REFERENCES D_Season(season_id),
@@ -104,6 +104,7 @@ CREATE TABLE F_Team_Player_Season (
 
 CREATE TABLE F_Match (
   id_match SERIAL PRIMARY KEY,
+  source_match_id VARCHAR(20) UNIQUE,
   id_date INT,
   id_home_team INT,
   id_away_team INT,
@@ -182,6 +183,97 @@ CREATE TABLE F_Team_Season (
   PRIMARY KEY (season_id, id_team)
 );
 
+CREATE TABLE F_Standings_Round (
+  id_competition INT,
+  season_id INT,
+  phase INT,
+  pool INT,
+  round INT,
+  id_team INT,
+  position INT,
+  played INT,
+  wins INT,
+  draws INT,
+  losses INT,
+  goals_for INT,
+  goals_against INT,
+  goal_diff INT,
+  points INT,
+  PRIMARY KEY (id_competition, season_id, phase, round, id_team)
+);
+
+CREATE TABLE F_Team_Rating (
+  id_match VARCHAR(20),
+  id_date INT,
+  id_competition INT,
+  season_id INT,
+  id_team INT,
+  id_opponent INT,
+  rating_before DECIMAL(7,2),
+  rating_after DECIMAL(7,2),
+  matches_rated INT,
+  PRIMARY KEY (id_match, id_team),
+  FOREIGN KEY (id_match) REFERENCES F_Match(source_match_id)
+);
+
+CREATE TABLE F_Head_To_Head (
+  id_team_a INT,
+  id_team_b INT,
+  matches INT,
+  wins_a INT,
+  draws INT,
+  wins_b INT,
+  goals_a INT,
+  goals_b INT,
+  first_id_date INT,
+  last_id_date INT,
+  last_id_match VARCHAR(20),
+  PRIMARY KEY (id_team_a, id_team_b),
+  FOREIGN KEY (last_id_match) REFERENCES F_Match(source_match_id)
+);
+
+CREATE TABLE F_Team_Form (
+  id_team INT,
+  id_match VARCHAR(20),
+  id_date INT,
+  id_competition INT,
+  season_id INT,
+  matches INT,
+  form_last5 VARCHAR(5),
+  points_last5 INT,
+  wins_last5 INT,
+  draws_last5 INT,
+  losses_last5 INT,
+  goals_for_last5 INT,
+  goals_against_last5 INT,
+  points_last10 INT,
+  wins_last10 INT,
+  draws_last10 INT,
+  losses_last10 INT,
+  goals_for_last10 INT,
+  goals_against_last10 INT,
+  PRIMARY KEY (id_team, id_match),
+  FOREIGN KEY (id_match) REFERENCES F_Match(source_match_id)
+);
+
+-- cube d'agrégats : une colonne de clé NULL signifie « tous » (niveau nommé par grouping)
+CREATE TABLE F_Team_Cube (
+  grouping VARCHAR(40),
+  id_competition INT,
+  season_id INT,
+  decade INT,
+  era VARCHAR(10),
+  id_team INT,
+  side VARCHAR(4),
+  matches INT,
+  wins INT,
+  draws INT,
+  losses INT,
+  goals_for INT,
+  goals_against INT,
+  points INT
+);
+
 CREATE TABLE F_TopScorers_AllTime (
   id_player INT,
   goals INT,
@@ -215,9 +307,38 @@ COPY D_Champions_All_time FROM 'warehouse_output/D_Champions_All_time.csv' WITH
 COPY D_Champions FROM 'warehouse_output/D_Champions.csv' WITH CSV HEADER;
 COPY D_Team_Seasons_clean FROM 'warehouse_output/D_Team_Seasons_clean.csv' WITH CSV HEADER;
 COPY F_Champions FROM 'warehouse_output/F_Champions.csv' WITH CSV HEADER;
-COPY F_Match FROM 'warehouse_output/F_Match.csv' WITH CSV HEADER;
+-- F_Match.csv n'a pas les colonnes de la table : id_match y est l'id Flashscore
+-- (-> source_match_id, cible des FK des faits par match) et id_match est généré ici
+CREATE TEMP TABLE F_Match_staging (
+  id_match VARCHAR(20),
+  id_date INT,
+  id_home_team INT,
+  id_away_team INT,
+  id_competition INT,
+  season_id INT,
+  id_stadium NUMERIC,
+  stage VARCHAR(255),
+  status VARCHAR(50),
+  result_home INT,
+  result_away INT,
+  regulation_time VARCHAR(50),
+  penalties VARCHAR(50),
+  venue VARCHAR(255)
+);
+COPY F_Match_staging FROM 'warehouse_output/F_Match.csv' WITH CSV HEADER;
+INSERT INTO F_Match (source_match_id, id_date, id_home_team, id_away_team, id_competition,
+                     season_id, id_stadium, result_home, result_away, penalties)
+SELECT id_match, id_date, id_home_team, id_away_team, id_competition,
+       season_id, id_stadium::INT, result_home, result_away, penalties
+FROM F_Match_staging;
+DROP TABLE F_Match_staging;
 COPY F_Team_Player_Season FROM 'warehouse_output/F_Team_Player_Season.csv' WITH CSV HEADER;
 COPY F_Team_Season FROM 'warehouse_output/F_Team_Season.csv' WITH CSV HEADER;
+COPY F_Standings_Round FROM 'warehouse_output/F_Standings_Round.csv' WITH CSV HEADER;
+COPY F_Team_Rating FROM 'warehouse_output/F_Team_Rating.csv' WITH CSV HEADER;
+COPY F_Head_To_Head FROM 'warehouse_output/F_Head_To_Head.csv' WITH CSV HEADER;
+COPY F_Team_Form FROM 'warehouse_output/F_Team_Form.csv' WITH CSV HEADER;
+COPY F_Team_Cube FROM 'warehouse_output/F_Team_Cube.csv' WITH CSV HEADER;
 COPY F_TopScorers_AllTime FROM 'warehouse_output/F_TopScorers_AllTime.csv' WITH CSV HEADER;
 COPY F_TopScorers_By_Season FROM 'warehouse_output/F_TopScorers_By_Season.csv' WITH CSV HEADER;
 
@@ -232,5 +353,9 @@ CREATE INDEX IDX_Match_Date ON F_Match(id_date);
 CREATE INDEX IDX_Match_Competition ON F_Match(id_competition);
 
 CREATE INDEX IDX_Champions_Season ON F_Champions(season_id);
+CREATE INDEX IDX_Standings_Team ON F_Standings_Round(id_team, season_id);
+CREATE INDEX IDX_Rating_Team ON F_Team_Rating(id_team, id_date);
+CREATE INDEX IDX_Form_Team_Date ON F_Team_Form(id_team, id_date);
+CREATE INDEX IDX_Cube_Grouping ON F_Team_Cube(grouping, id_team);
 CREATE INDEX IDX_TopScorers_Season ON F_TopScorers_By_Season(season_id);
 CREATE INDEX IDX_TeamPlayer_Season ON F_Team_Player_Season(season_id, id_team);
\ No newline at end of file
@@ -99,7 +99,7 @@ CREATE TABLE F_Team_Player_Season (
     id_team INT NOT NULL,
     id_player INT NOT NULL,
     number VARCHAR(10),
-    id_position INT NOT NULL,
+    id_position INT,
     market_value INT,
 
     PRIMARY KEY (season_id, id_team, id_player),
@@ -118,6 +118,7 @@ CREATE TABLE F_Team_Player_Season (
 -- F_Match: Match-level details (detailed results, scores, venues)
 CREATE TABLE F_Match (
   id_match INT IDENTITY(1,1) PRIMARY KEY,
+  source_match_id VARCHAR(20) UNIQUE,
   id_date INT,
   id_home_team INT,
   id_away_team INT,
@@ -135,6 +136,167 @@ CREATE TABLE F_Match (
   FOREIGN KEY (id_stadium) REFERENCES D_Stadium(id_stadium)
 );
 
+-- F_Team_Season: Team statistics per season (aggregated from F_Match by the ETL)
+CREATE TABLE F_Team_Season (
+  season_id INT NOT NULL,
+  id_team INT NOT NULL,
+  matches_total INT,
+  matches_home INT,
+  matches_away INT,
+  wins INT,
+  draws INT,
+  losses INT,
+  wins_home INT,
+  wins_away INT,
+  draws_home INT,
+  draws_away INT,
+  losses_home INT,
+  losses_away INT,
+  goals_for INT,
+  goals_against INT,
+  goals_diff INT,
+  goals_for_home INT,
+  goals_for_away INT,
+  goals_against_home INT,
+  goals_against_away INT,
+  goals_per_match DECIMAL(5,2),
+  goals_against_per_match DECIMAL(5,2),
+  points INT,
+  points_home INT,
+  points_away INT,
+
+  PRIMARY KEY (season_id, id_team),
+
+  FOREIGN KEY (season_id) REFERENCES D_Season(season_id),
+  FOREIGN KEY (id_team) REFERENCES D_Team(id_team)
+);
+
+-- F_Standings_Round: League table after every round (one row per team, phase and pool)
+CREATE TABLE F_Standings_Round (
+  id_competition INT NOT NULL,
+  season_id INT NOT NULL,
+  phase INT NOT NULL,
+  pool INT,
+  round INT NOT NULL,
+  id_team INT NOT NULL,
+  position INT,
+  played INT,
+  wins INT,
+  draws INT,
+  losses INT,
+  goals_for INT,
+  goals_against INT,
+  goal_diff INT,
+  points INT,
+
+  PRIMARY KEY (id_competition, season_id, phase, round, id_team),
+
+  FOREIGN KEY (id_competition) REFERENCES D_Competition(id_competition),
+  FOREIGN KEY (season_id) REFERENCES D_Season(season_id),
+  FOREIGN KEY (id_team) REFERENCES D_Team(id_team)
+);
+
+-- F_Team_Rating: Elo rating of each team before/after every match
+-- (id_match = Flashscore id, i.e. F_Match.source_match_id)
+CREATE TABLE F_Team_Rating (
+  id_match VARCHAR(20) NOT NULL,
+  id_date INT,
+  id_competition INT,
+  season_id INT,
+  id_team INT NOT NULL,
+  id_opponent INT,
+  rating_before DECIMAL(7,2),
+  rating_after DECIMAL(7,2),
+  matches_rated INT,
+
+  PRIMARY KEY (id_match, id_team),
+
+  FOREIGN KEY (id_match) REFERENCES F_Match(source_match_id),
+  FOREIGN KEY (id_date) REFERENCES D_Date(id_date),
+  FOREIGN KEY (id_competition) REFERENCES D_Competition(id_competition),
+  FOREIGN KEY (season_id) REFERENCES D_Season(season_id),
+  FOREIGN KEY (id_team) REFERENCES D_Team(id_team),
+  FOREIGN KEY (id_opponent) REFERENCES D_Team(id_team)
+);
+
+-- F_Head_To_Head: All-time record of each pair of teams (id_team_a < id_team_b)
+CREATE TABLE F_Head_To_Head (
+  id_team_a INT NOT NULL,
+  id_team_b INT NOT NULL,
+  matches INT,
+  wins_a INT,
+  draws INT,
+  wins_b INT,
+  goals_a INT,
+  goals_b INT,
+  first_id_date INT,
+  last_id_date INT,
+  last_id_match VARCHAR(20),
+
+  PRIMARY KEY (id_team_a, id_team_b),
+
+  FOREIGN KEY (id_team_a) REFERENCES D_Team(id_team),
+  FOREIGN KEY (id_team_b) REFERENCES D_Team(id_team),
+  FOREIGN KEY (first_id_date) REFERENCES D_Date(id_date),
+  FOREIGN KEY (last_id_date) REFERENCES D_Date(id_date),
+  FOREIGN KEY (last_id_match) REFERENCES F_Match(source_match_id)
+);
+
+-- F_Team_Form: Form of each team over its last 5 / 10 matches, after every match
+-- (id_match = Flashscore id, i.e. F_Match.source_match_id)
+CREATE TABLE F_Team_Form (
+  id_team INT NOT NULL,
+  id_match VARCHAR(20) NOT NULL,
+  id_date INT,
+  id_competition INT,
+  season_id INT,
+  matches INT,
+  form_last5 VARCHAR(5),
+  points_last5 INT,
+  wins_last5 INT,
+  draws_last5 INT,
+  losses_last5 INT,
+  goals_for_last5 INT,
+  goals_against_last5 INT,
+  points_last10 INT,
+  wins_last10 INT,
+  draws_last10 INT,
+  losses_last10 INT,
+  goals_for_last10 INT,
+  goals_against_last10 INT,
+
+  PRIMARY KEY (id_team, id_match),
+
+  FOREIGN KEY (id_team) REFERENCES D_Team(id_team),
+  FOREIGN KEY (id_match) REFERENCES F_Match(source_match_id),
+  FOREIGN KEY (id_date) REFERENCES D_Date(id_date),
+  FOREIGN KEY (id_competition) REFERENCES D_Competition(id_competition),
+  FOREIGN KEY (season_id) REFERENCES D_Season(season_id)
+);
+
+-- F_Team_Cube: Aggregates of every competition/season (or decade, era)/team/side level;
+-- a NULL key column means "all" (the level is named by grouping, e.g. 'competition|era|side')
+CREATE TABLE F_Team_Cube (
+  grouping VARCHAR(40) NOT NULL,
+  id_competition INT,
+  season_id INT,
+  decade INT,
+  era VARCHAR(10),
+  id_team INT,
+  side VARCHAR(4),
+  matches INT,
+  wins INT,
+  draws INT,
+  losses INT,
+  goals_for INT,
+  goals_against INT,
+  points INT,
+
+  FOREIGN KEY (id_competition) REFERENCES D_Competition(id_competition),
+  FOREIGN KEY (season_id) REFERENCES D_Season(season_id),
+  FOREIGN KEY (id_team) REFERENCES D_Team(id_team)
+);
+
 
 
 
@@ -157,6 +319,10 @@ CREATE INDEX IDX_Match_Competition ON F_Match(id_competition);
 
 -- Index sur les tables de faits
 CREATE INDEX IDX_Champions_Season ON F_Champions(season_id);
+CREATE INDEX IDX_Standings_Team ON F_Standings_Round(id_team, season_id);
+CREATE INDEX IDX_Rating_Team ON F_Team_Rating(id_team, id_date);
+CREATE INDEX IDX_Form_Team_Date ON F_Team_Form(id_team, id_date);
+CREATE INDEX IDX_Cube_Grouping ON F_Team_Cube(grouping, id_team);
 CREATE INDEX IDX_TopScorers_Season ON F_TopScorers_By_Season(season_id);
 CREATE INDEX IDX_TeamPlayer_Season ON F_Team_Player_Season(season_id, id_team);
 
@@ -164,7 +330,7 @@ CREATE OR ALTER VIEW V_Team_Season AS
 WITH HomeStats AS (
     SELECT
         season_id,
-        id_home_team AS id_team,&
+        id_home_team AS id_team,
         COUNT(*) AS matches_home,
         SUM(CASE WHEN result_home > result_away THEN 1 ELSE 0 END) AS wins_home,
         SUM(CASE WHEN result_home = result_away THEN 1 ELSE 0 END) AS draws_home,
@@ -172,6 +338,7 @@ WITH HomeStats AS (
         SUM(result_home) AS goals_for_home,
         SUM(result_away) AS goals_against_home
     FROM F_Match
+    WHERE result_home >= 0 AND result_away >= 0  -- -1 : match pas encore joué
     GROUP BY season_id, id_home_team
 ),
 AwayStats AS (
@@ -185,6 +352,7 @@ AwayStats AS (
         SUM(result_away) AS goals_for_away,
         SUM(result_home) AS goals_against_away
     FROM F_Match
+    WHERE result_home >= 0 AND result_away >= 0  -- -1 : match pas encore joué
     GROUP BY season_id, id_away_team
 )
 SELECT
@@ -0,0 +1,101 @@
+"""
+Palmarès des compétitions (data/champions/*_champions.csv) pour F_Champions.
+
+Les trois fichiers (cup, ligue_1, super_cup) sont lus en une passe :
+- la première ligne descriptive ("Season: e.g., 1955–56", ...) est détectée et ignorée
+- les saisons ('1922–23', '1907-08', '1960') sont ramenées aux libellés de D_Season
+- les scores ('1–0', '0–0 (4–3 p)') sont découpés en goal_winner / goal_runnerup
+- les noms d'équipes sont nettoyés (ville entre parenthèses ou en 'de Ville')
+
+La résolution des ids (saison, compétition, équipes) est faite par l'ETL (`etl.load_champions`).
+
+Usage:
+  from champions import read_champions
+"""
+
+import pandas as pd
+
+try:
+    from source_paths import season_label
+except ImportError:
+    from .source_paths import season_label
+
+CHAMPIONS_GLOB = '*_champions.csv'
+
+# colonne logique -> noms de colonnes candidats (minuscules)
+CHAMPIONS_COLUMN_CANDIDATES = {
+    'season': ['season', 'saison'],
+    'winner': ['winner', 'champion'],
+    'runnerup': ['runnerup', 'runner_up', 'finalist'],
+    'score': ['score'],
+}
+
+# valeurs qui ne désignent pas une équipe
+NOT_A_TEAM = ['not played', 'non joué', 'non disputé', '-']
+
+SCORE_PATTERN = r'(\d+)\s*[\-–]\s*(\d+)'
+CITY_SUFFIX = r'\s*\(([^)]*)\)\s*$'
+CITY_OF = r'^(.+?)\s+de\s+(.+)$'
+
+# noms sans ville dont le club est connu par ailleurs (finales de coupe d'avant 1956)
+TEAM_ALIASES = {
+    'Sporting Club': 'Sporting Club (Tunis)',
+}
+
+
+def header_row(path):
+    """0, ou 1 si la première ligne décrit les colonnes ("Nom: description") au lieu de les nommer"""
+    first = pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns
+    return 1 if all(':' in str(c) for c in first) else 0
+
+
+def read_champions_file(path):
+    """Palmarès d'un fichier : competition, season, start_year, winner, runnerup, goal_winner, goal_runnerup"""
+    df = pd.read_csv(path, header=header_row(path), encoding='utf-8-sig', dtype=str)
+    lower = {c.strip().lower(): c for c in df.columns}
+    competition = path.stem[:-len('_champions')] if path.stem.endswith('_champions') else path.stem
+    out = pd.DataFrame(index=df.index)
+    out['competition'] = competition
+    for logical, candidates in CHAMPIONS_COLUMN_CANDIDATES.items():
+        col = next((lower[c] for c in candidates if c in lower), None)
+        out[logical] = df[col].str.strip() if col is not None else None
+
+    # saisons : conversion sur les valeurs distinctes
+    labels = {s: season_label(s, competition) for s in out['season'].dropna().unique()}
+    out['start_year'] = out['season'].map(lambda s: labels.get(s, (None, None, None))[1]).astype('Int64')
+    out['season'] = out['season'].map(lambda s: labels.get(s, (None,))[0])
+
+    goals = out['score'].astype('string').str.extract(SCORE_PATTERN)
+    out['goal_winner'] = pd.to_numeric(goals[0], errors='coerce').astype('Int64')
+    out['goal_runnerup'] = pd.to_numeric(goals[1], errors='coerce').astype('Int64')
+    for col in ('winner', 'runnerup'):
+        out[col] = out[col].mask(out[col].str.lower().isin(NOT_A_TEAM))
+    return out.drop(columns=['score'])
+
+
+def read_champions(paths):
+    """Palmarès de tous les fichiers, dans l'ordre de `paths`"""
+    frames = [read_champions_file(p) for p in paths]
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+
+def team_labels(names):
+    """Nom d'équipe nettoyé pour chaque nom brut distinct : {brut: nom}.
+
+    La ville ('Racing Club (Tunis)', ou 'Italia de Tunis' si 'Italia (...)' existe aussi)
+    est retirée, sauf si le même nom apparaît avec plusieurs villes : le libellé devient
+    alors 'Nom (Ville)' ('Sporting Club de Tunis' -> 'Sporting Club (Tunis)').
+    Les noms ambigus sont d'abord remplacés via `TEAM_ALIASES`.
+    """
+    raw = pd.Series(pd.unique(pd.Series(names).dropna()), dtype=object)
+    named = raw.str.strip().replace(TEAM_ALIASES)
+    base = named.str.replace(CITY_SUFFIX, '', regex=True).str.strip()
+    city = named.str.extract(CITY_SUFFIX)[0].str.strip()
+    # 'X de Ville' n'est découpé que si 'X (Ville)' existe : 'Espérance de Tunis' reste entier
+    of_city = named.str.extract(CITY_OF)
+    use_of = city.isna() & of_city[0].isin(base[city.notna()])
+    base = base.where(~use_of, of_city[0])
+    city = city.where(~use_of, of_city[1])
+    homonyms = city.groupby(base).nunique()
+    keep_city = base.map(homonyms).gt(1) & city.notna()
+    return dict(zip(raw, base.where(~keep_city, base + ' (' + city + ')')))
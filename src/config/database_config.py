@@ -1,7 +1,6 @@
 # Configuration Database - SSMS Connection
 # Cette file contient les paramètres de connexion à SQL Server
-
-import pyodbc
+# pyodbc n'est importé qu'à la connexion (pas de driver ODBC requis pour importer ce module)
 
 # SQL Server Configuration
 SQL_SERVER_CONFIG = {
@@ -23,6 +22,7 @@ def get_connection_string():
 
 def connect_to_ssms():
     """Établit une connexion à SQL Server"""
+    import pyodbc
     try:
         conn = pyodbc.connect(get_connection_string())
         print("✓ Connexion à SQL Server réussie")
@@ -2,7 +2,9 @@
 Définitions simplifiées du schéma (basées sur `sql/schema.sql`).
 Fournit :
 - listes de colonnes attendues (toutes)
-- colonnes requises (minimum) pour valider les CSV générés
+- colonnes requises (minimum) pour valider les CSV générés ; une colonne requise ne doit pas
+  contenir de valeur nulle, sauf si elle figure dans `nullable`
+- types attendus des colonnes (`COLUMN_TYPES`) et clés étrangères (`FOREIGN_KEYS`)
 
 Remarque : les noms de colonnes sont normalisés en minuscules underscore.
 """
@@ -41,17 +43,42 @@ SCHEMA_DEFINITIONS = {
         "required": ["city_name"]
     },
     "F_Champions": {
-        "all": ["season_id", "competition_id", "winner_id", "runnerup_id", "score"],
-        "required": ["season_id", "competition_id", "winner_id"]
+        "all": ["season_id", "competition_id", "winner_id", "runnerup_id", "goal_winner", "goal_runnerup"],
+        "required": ["season_id", "competition_id", "winner_id"],
+        "nullable": ["winner_id"]
     },
     "F_Team_Player_Season": {
-        "all": ["season_id", "id_team", "id_player", "number", "id_position"],
+        "all": ["season_id", "id_team", "id_player", "number", "id_position", "market_value"],
         "required": ["season_id", "id_team", "id_player"]
     },
     "F_Match": {
         "all": ["id_match", "id_date", "id_home_team", "id_away_team", "id_competition", "season_id", "id_stadium", "result_home", "result_away", "penalties"],
         "required": ["id_home_team", "id_away_team", "id_competition", "season_id"]
     },
+    "F_Team_Season": {
+        "all": ["season_id", "id_team", "matches_total", "matches_home", "matches_away", "wins", "draws", "losses", "wins_home", "wins_away", "draws_home", "draws_away", "losses_home", "losses_away", "points", "points_home", "points_away", "goals_for", "goals_against", "goals_diff", "goals_for_home", "goals_for_away", "goals_against_home", "goals_against_away", "goals_per_match", "goals_against_per_match"],
+        "required": ["season_id", "id_team", "matches_total", "points"]
+    },
+    "F_Standings_Round": {
+        "all": ["id_competition", "season_id", "phase", "pool", "round", "id_team", "position", "played", "wins", "draws", "losses", "goals_for", "goals_against", "goal_diff", "points"],
+        "required": ["id_competition", "season_id", "phase", "pool", "round", "id_team", "position"]
+    },
+    "F_Team_Rating": {
+        "all": ["id_match", "id_date", "id_competition", "season_id", "id_team", "id_opponent", "rating_before", "rating_after", "matches_rated"],
+        "required": ["id_match", "id_team", "rating_before", "rating_after"]
+    },
+    "F_Head_To_Head": {
+        "all": ["id_team_a", "id_team_b", "matches", "wins_a", "draws", "wins_b", "goals_a", "goals_b", "first_id_date", "last_id_date", "last_id_match"],
+        "required": ["id_team_a", "id_team_b", "matches"]
+    },
+    "F_Team_Form": {
+        "all": ["id_team", "id_match", "id_date", "id_competition", "season_id", "matches", "form_last5", "points_last5", "wins_last5", "draws_last5", "losses_last5", "goals_for_last5", "goals_against_last5", "points_last10", "wins_last10", "draws_last10", "losses_last10", "goals_for_last10", "goals_against_last10"],
+        "required": ["id_team", "id_match", "matches"]
+    },
+    "F_Team_Cube": {
+        "all": ["grouping", "id_competition", "season_id", "decade", "era", "id_team", "side", "matches", "wins", "draws", "losses", "goals_for", "goals_against", "points"],
+        "required": ["grouping", "matches"]
+    },
     "F_TopScorers_AllTime": {
         "all": ["id_player", "goals"],
         "required": ["id_player"]
@@ -70,10 +97,73 @@ FILENAME_TO_TABLE = {
     "D_Season": ["d_season", "d_season_clean"],
     "D_Stadium": ["d_stadium", "d_stadium_clean"],
     "D_Date": ["d_date"],
+    "D_Position": ["d_position"],
     "F_Match": ["f_match", "f_match.csv"],
     "D_Champions": ["d_champions", "d_champions_clean"],
     "F_Champions": ["f_champions"],
+    "F_Team_Season": ["f_team_season"],
+    "F_Team_Player_Season": ["f_team_player_season"],
+    "F_Standings_Round": ["f_standings_round"],
+    "F_Team_Rating": ["f_team_rating"],
+    "F_Head_To_Head": ["f_head_to_head"],
+    "F_Team_Form": ["f_team_form"],
+    "F_Team_Cube": ["f_team_cube"],
     "D_Player": ["d_player", "d_player_clean"],
     "F_TopScorers_By_Season": ["d_topscorers_by_season","f_topscorers_by_season"],
     "F_TopScorers_AllTime": ["d_topscorers_alltime","f_topscorers_alltime"]
 }
+
+# Colonnes de table lues sous un autre nom dans les sorties de l'ETL : table -> {colonne table: colonne fichier}
+# (l'id_match des sorties est l'identifiant Flashscore ; en base, id_match est une clé générée)
+FILE_COLUMNS = {
+    "F_Match": {"source_match_id": "id_match"},
+}
+
+# Type attendu des colonnes (nom normalisé -> 'int', 'float' ou 'date') ; les autres sont du texte
+COLUMN_TYPES = {
+    **{c: "int" for c in [
+        "id_stadium", "capacity", "id_team", "id_city", "stadium_id", "season_id", "start_year", "end_year",
+        "id_competition", "id_date", "year", "month", "day", "quarter", "weekday", "iso_year", "iso_week",
+        "id_player", "id_position", "competition_id", "winner_id", "runnerup_id", "goal_winner", "goal_runnerup",
+        "number", "id_home_team", "id_away_team", "result_home", "result_away",
+        "matches_total", "matches_home", "matches_away", "wins", "draws", "losses", "wins_home", "wins_away",
+        "draws_home", "draws_away", "losses_home", "losses_away", "points", "points_home", "points_away",
+        "goals_for", "goals_against", "goals_diff", "goals_for_home", "goals_for_away", "goals_against_home",
+        "goals_against_away", "phase", "pool", "round", "position", "played", "goal_diff",
+        "id_opponent", "matches_rated", "id_team_a", "id_team_b", "matches", "wins_a", "wins_b", "goals_a",
+        "goals_b", "first_id_date", "last_id_date", "decade", "goals",
+        "points_last5", "wins_last5", "draws_last5", "losses_last5", "goals_for_last5", "goals_against_last5",
+        "points_last10", "wins_last10", "draws_last10", "losses_last10", "goals_for_last10", "goals_against_last10",
+    ]},
+    **{c: "float" for c in [
+        "latitude", "longitude", "market_value", "goals_per_match", "goals_against_per_match",
+        "rating_before", "rating_after",
+    ]},
+    "date": "date",
+    "birth_date": "date",
+}
+
+# Clés étrangères : table -> [(colonne, table référencée, colonne référencée)]
+_TEAM = ("D_Team", "id_team")
+_SEASON = ("D_Season", "season_id")
+_COMPETITION = ("D_Competition", "id_competition")
+# identifiant Flashscore du match (clé naturelle de F_Match)
+_MATCH = ("F_Match", "source_match_id")
+FOREIGN_KEYS = {
+    "F_Match": [("id_date", "D_Date", "id_date"), ("id_home_team", *_TEAM), ("id_away_team", *_TEAM),
+                ("id_competition", *_COMPETITION), ("season_id", *_SEASON), ("id_stadium", "D_Stadium", "id_stadium")],
+    "F_Champions": [("season_id", *_SEASON), ("competition_id", *_COMPETITION), ("winner_id", *_TEAM),
+                    ("runnerup_id", *_TEAM)],
+    "F_Team_Season": [("season_id", *_SEASON), ("id_team", *_TEAM)],
+    "F_Team_Player_Season": [("season_id", *_SEASON), ("id_team", *_TEAM),
+                             ("id_player", "D_Player", "id_player"),
+                             ("id_position", "D_Position", "id_position")],
+    "F_Standings_Round": [("id_competition", *_COMPETITION), ("season_id", *_SEASON), ("id_team", *_TEAM)],
+    "F_Team_Rating": [("id_match", *_MATCH), ("id_date", "D_Date", "id_date"),
+                      ("id_team", *_TEAM), ("id_opponent", *_TEAM)],
+    "F_Head_To_Head": [("id_team_a", *_TEAM), ("id_team_b", *_TEAM), ("last_id_match", *_MATCH)],
+    "F_Team_Form": [("id_team", *_TEAM), ("id_match", *_MATCH)],
+    "F_Team_Cube": [("id_competition", *_COMPETITION), ("season_id", *_SEASON), ("id_team", *_TEAM)],
+    "F_TopScorers_AllTime": [("id_player", "D_Player", "id_player")],
+    "F_TopScorers_By_Season": [("season_id", *_SEASON), ("id_player", "D_Player", "id_player")],
+}
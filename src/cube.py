@@ -0,0 +1,229 @@
+"""
+Cube d'agrégats matérialisé (F_Team_Cube) : compétition x saison x équipe x domicile/extérieur.
+
+Chaque cellule porte matches, victoires, nuls, défaites, buts pour/contre et points.
+Tous les niveaux sont précalculés en une seule table :
+- compétition : id_competition ou toutes
+- saison : season_id, décennie (decade), période avant/après l'indépendance
+  (BeforeAfterIndependence de D_Season) ou toutes
+- équipe : id_team ou toutes ; côté : 'home' / 'away' ou les deux
+La colonne `grouping` nomme les niveaux détaillés d'une cellule ('competition|era|side') ;
+une colonne de clé vide signifie « tous ».
+
+Les mesures sont additives : un run incrémental ajoute les cellules des lignes de F_Match
+nouvelles et retranche celles des lignes remplacées (`refresh_cube`), sans tout recalculer.
+
+Usage:
+  from cube import played_mask, team_side_facts, build_cube, refresh_cube, CubeIndex
+  CubeIndex(cube).get(competition=2, era='After', side='home')
+  python src/cube.py --matches 1000000     # benchmark sur des matches synthétiques
+"""
+
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+INDEPENDENCE_COLUMN = 'BeforeAfterIndependence'
+
+MEASURES = ['matches', 'wins', 'draws', 'losses', 'goals_for', 'goals_against', 'points']
+
+# niveaux de chaque axe : (nom dans `grouping`, colonne de clé) ; None = tous
+AXES = [
+    [('competition', 'id_competition'), None],
+    [('season', 'season_id'), ('decade', 'decade'), ('era', 'era'), None],
+    [('team', 'id_team'), None],
+    [('side', 'side'), None],
+]
+KEY_COLUMNS = ['id_competition', 'season_id', 'decade', 'era', 'id_team', 'side']
+CUBE_COLUMNS = ['grouping'] + KEY_COLUMNS + MEASURES
+
+
+def cuboids():
+    """[(grouping, colonnes de clé)] de toutes les combinaisons de niveaux, du plus détaillé au total"""
+    out = []
+    for levels in product(*AXES):
+        picked = [level for level in levels if level is not None]
+        out.append(('|'.join(name for name, _ in picked) or 'all', [col for _, col in picked]))
+    return out
+
+
+def season_attributes(dseason):
+    """season_id -> (decade, era) : décennie de l'année de début, période avant/après l'indépendance"""
+    start = pd.to_numeric(dseason['start_year'], errors='coerce')
+    decade = (start // 10 * 10).astype('Int64').fillna(-1).astype('int64')
+    era = dseason[INDEPENDENCE_COLUMN] if INDEPENDENCE_COLUMN in dseason else pd.Series(None, index=dseason.index)
+    return pd.DataFrame({'decade': decade.to_numpy(), 'era': era.fillna('Unknown').to_numpy(dtype=object)},
+                        index=dseason['season_id'].to_numpy())
+
+
+def played_mask(fmatch):
+    """Matches comptés dans F_Team_Season et le cube : saison connue et score connu
+
+    Un score -1 (ou vide) est un match pas encore joué ou un forfait sans score.
+    """
+    return (fmatch['season_id'].notna() & (fmatch['season_id'] != -1)
+            & fmatch['result_home'].ge(0) & fmatch['result_away'].ge(0))
+
+
+def team_side_facts(fmatch, dseason, points_scheme=(3, 1, 0), season_points=None):
+    """Cellules de base : une ligne par (compétition, saison, équipe, côté) des matches de `fmatch`
+
+    Mêmes matches que F_Team_Season (`played_mask`) ; un côté dont l'équipe est inconnue (-1) est ignoré.
+    """
+    fm = fmatch[played_mask(fmatch)]
+    if season_points:
+        schemes = fm['season_id'].map(lambda sid: season_points.get(sid, points_scheme))
+        win, draw, loss = (schemes.str[i].to_numpy() for i in range(3))
+    else:
+        win, draw, loss = points_scheme
+
+    def side(name, team, goals_for, goals_against):
+        gf = fm[goals_for].to_numpy('int64')
+        ga = fm[goals_against].to_numpy('int64')
+        known = (fm[team].notna() & (fm[team] != -1)).to_numpy()
+        return pd.DataFrame({
+            'id_competition': fm['id_competition'].to_numpy('int64'),
+            'season_id': fm['season_id'].to_numpy('int64'),
+            'id_team': fm[team].fillna(-1).to_numpy('int64'),
+            'side': name,
+            'matches': 1,
+            'wins': (gf > ga).astype('int64'),
+            'draws': (gf == ga).astype('int64'),
+            'losses': (gf < ga).astype('int64'),
+            'goals_for': gf,
+            'goals_against': ga,
+            'points': np.where(gf > ga, win, np.where(gf == ga, draw, loss)).astype('int64'),
+        })[known]
+
+    rows = pd.concat([side('home', 'id_home_team', 'result_home', 'result_away'),
+                      side('away', 'id_away_team', 'result_away', 'result_home')], ignore_index=True)
+    base = rows.groupby(['id_competition', 'season_id', 'id_team', 'side'], as_index=False)[MEASURES].sum()
+    attrs = season_attributes(dseason).reindex(base['season_id'].to_numpy())
+    base['decade'] = attrs['decade'].fillna(-1).astype('int64').to_numpy()
+    base['era'] = attrs['era'].fillna('Unknown').to_numpy(dtype=object)
+    return base
+
+
+def build_cube(base):
+    """F_Team_Cube : toutes les cellules de tous les niveaux à partir des cellules de base"""
+    frames = []
+    for grouping, keys in cuboids():
+        cells = base.groupby(keys, as_index=False, sort=True)[MEASURES].sum() if keys else base[MEASURES].sum().to_frame().T
+        cells.insert(0, 'grouping', grouping)
+        frames.append(cells)
+    cube = pd.concat(frames, ignore_index=True)
+    for col in KEY_COLUMNS:
+        if col not in cube:
+            cube[col] = None
+    for col in ('id_competition', 'season_id', 'decade', 'id_team'):
+        cube[col] = cube[col].astype('Int64')
+    cube[MEASURES] = cube[MEASURES].astype('int64')
+    return cube[CUBE_COLUMNS]
+
+
+def refresh_cube(cube, added, removed):
+    """Cube mis à jour par différence : + cellules de base `added`, - cellules de base `removed`
+
+    Les cellules dont le nombre de matches tombe à 0 disparaissent ; l'ordre des lignes
+    est celui d'un `build_cube` complet.
+    """
+    delta = pd.concat([build_cube(added), build_cube(removed).assign(**{m: lambda d, m=m: -d[m] for m in MEASURES})],
+                      ignore_index=True)
+    both = pd.concat([cube[CUBE_COLUMNS], delta], ignore_index=True)
+    for col in ('id_competition', 'season_id', 'decade', 'id_team'):
+        both[col] = both[col].astype('Int64')
+    order = {grouping: i for i, (grouping, _) in enumerate(cuboids())}
+    merged = both.groupby(['grouping'] + KEY_COLUMNS, dropna=False, sort=False, as_index=False)[MEASURES].sum()
+    merged = merged[merged['matches'] != 0]
+    merged = merged.assign(_order=merged['grouping'].map(order)).sort_values(
+        ['_order'] + KEY_COLUMNS, kind='stable', na_position='first').drop(columns='_order')
+    merged[MEASURES] = merged[MEASURES].astype('int64')
+    return merged[CUBE_COLUMNS].reset_index(drop=True)
+
+
+class CubeIndex:
+    """Accès O(1) aux cellules de F_Team_Cube, et tranches d'un niveau donné"""
+
+    ARGUMENTS = {'competition': 'id_competition', 'season': 'season_id', 'decade': 'decade',
+                 'era': 'era', 'team': 'id_team', 'side': 'side'}
+
+    def __init__(self, cube):
+        self.cube = cube.reset_index(drop=True)
+        self._values = self.cube[MEASURES].to_numpy('int64')
+        self._levels = {}
+        for grouping, rows in self.cube.groupby('grouping', sort=False):
+            keys = [self.ARGUMENTS[name] for name in grouping.split('|')] if grouping != 'all' else []
+            values = zip(*(rows[k].tolist() for k in keys)) if keys else [()] * len(rows)
+            self._levels[grouping] = (keys, dict(zip(values, rows.index.tolist())))
+
+    @staticmethod
+    def grouping(filters):
+        names = [name for name in CubeIndex.ARGUMENTS if filters.get(name) is not None]
+        return '|'.join(names) or 'all'
+
+    def get(self, **filters):
+        """Cellule (dict des mesures) pour les niveaux donnés, ex. get(competition=2, era='After') ; None si vide"""
+        unknown = set(filters) - set(self.ARGUMENTS)
+        if unknown:
+            raise ValueError(f"Niveau(x) inconnu(s): {sorted(unknown)} (possibles: {', '.join(self.ARGUMENTS)})")
+        level = self._levels.get(self.grouping(filters))
+        if level is None:
+            raise ValueError(f"Combinaison de niveaux non matérialisée: {sorted(filters)}")
+        keys, cells = level
+        i = cells.get(tuple(filters[name] for name in self.ARGUMENTS if filters.get(name) is not None))
+        return None if i is None else dict(zip(MEASURES, self._values[i].tolist()))
+
+    def rollup(self, by, **filters):
+        """Cellules du niveau `by` + `filters` (ex. rollup(['team'], competition=2, era='After'))"""
+        wanted = dict(filters, **{name: True for name in by})
+        rows = self.cube[self.cube['grouping'] == self.grouping(wanted)]
+        for name, value in filters.items():
+            rows = rows[rows[self.ARGUMENTS[name]] == value]
+        return rows
+
+
+def synthetic_fact(n, teams=200, seasons=120, seed=0):
+    """(F_Match, D_Season) synthétiques de `n` matches"""
+    rng = np.random.default_rng(seed)
+    home = rng.integers(1, teams + 1, n)
+    away = (home + rng.integers(1, teams, n) - 1) % teams + 1
+    start = 1907 + np.arange(seasons)
+    dseason = pd.DataFrame({'season_id': np.arange(1, seasons + 1), 'start_year': start,
+                            INDEPENDENCE_COLUMN: np.where(start + 1 >= 1956, 'After', 'Before')})
+    fmatch = pd.DataFrame({
+        'id_competition': rng.integers(1, 4, n),
+        'season_id': rng.integers(1, seasons + 1, n),
+        'id_home_team': home,
+        'id_away_team': away,
+        'result_home': rng.poisson(1.3, n),
+        'result_away': rng.poisson(1.0, n),
+    })
+    return fmatch, dseason
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Benchmark du cube d\'agrégats sur des matches synthétiques.')
+    parser.add_argument('--matches', type=int, default=1_000_000, help='Nombre de matches synthétiques (défaut: 1 000 000)')
+    args = parser.parse_args()
+
+    fmatch, dseason = synthetic_fact(args.matches)
+    t0 = time.perf_counter()
+    cube = build_cube(team_side_facts(fmatch, dseason))
+    print(f'{args.matches:,} matches -> {len(cube):,} cube cells ({len(cuboids())} levels) '
+          f'in {time.perf_counter() - t0:.2f}s')
+
+    t0 = time.perf_counter()
+    changed = fmatch.tail(1000)
+    cube = refresh_cube(cube, team_side_facts(changed.assign(result_home=changed['result_home'] + 1), dseason),
+                        team_side_facts(changed, dseason))
+    print(f'  incremental refresh for {len(changed):,} changed matches in {time.perf_counter() - t0:.2f}s')
+
+    index = CubeIndex(cube)
+    t0 = time.perf_counter()
+    for team in range(1, 201):
+        index.get(competition=2, era='After', team=team, side='home')
+    print(f'  200 cell lookups in {(time.perf_counter() - t0) * 1000:.1f} ms')
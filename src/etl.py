@@ -2,21 +2,42 @@
 ETL minimal pour construire un Data Warehouse historique (Tunisie: Ligue 1, Cup, Super Cup)
 - parcours `data/matches/**.csv` pour construire `F_Match`
 - construit dimensions: `D_Team`, `D_Competition`, `D_Season`, `D_Stadium`, `D_Date`
-- produit CSV nettoyés dans `warehouse_output/`
+- produit CSV (et/ou Parquet) nettoyés dans `warehouse_output/`
 
 Usage (PowerShell):
 > python -m pip install pandas python-dateutil
 > python src/etl.py
+> python src/etl.py --workers 4   # lecture des fichiers de matches en parallèle
+> python src/etl.py --format both  # CSV + Parquet (requiert pyarrow)
+> python src/etl.py --incremental  # ne relit que les fichiers modifiés depuis le dernier run
+> python src/etl.py --load sqlite:warehouse.db  # chargement par lots (voir src/loader.py)
 
 Le script est conservateur (heuristiques pour noms de colonnes) — adaptez si besoin.
 """
 
 import os
 import glob
+import json
+import codecs
+import shutil
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+import unicodedata
+import numpy as np
 import pandas as pd
-from dateutil import parser
 from pathlib import Path
-import pyodbc
+
+from key_registry import KeyRegistry
+from loader import load_warehouse
+from source_paths import parse_source_path, season_years
+from rosters import read_rosters, build_roster_tables, add_players_by_name
+from champions import CHAMPIONS_GLOB, read_champions, team_labels
+from standings import DEFAULT_TIE_BREAKERS, build_standings, parse_tie_breakers
+from ratings import ELO_DEFAULTS, RATING_COLUMNS, EloRatings, rated_matches
+from matchups import played_matches, build_head_to_head, build_team_form
+from cube import INDEPENDENCE_COLUMN, played_mask, team_side_facts, build_cube, refresh_cube
 
 # Database connection
 connection_string = """
@@ -30,115 +51,194 @@ ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = ROOT / 'data'
 MATCHES_GLOB = str(DATA_DIR / 'matches' / '**' / '*.csv')
 OUTPUT_DIR = ROOT / 'warehouse_output'
-OUTPUT_DIR.mkdir(exist_ok=True)
+KEY_REGISTRY_FILE = OUTPUT_DIR / '_keys.sqlite'
+RATINGS_CHECKPOINT_FILE = '_ratings.json'
+ROSTER_GLOB = 'player_data/*_all_teams_seasons.csv'
+
+# dimension -> (clé naturelle, clé de substitution) pour le registre de clés
+DIMENSION_KEYS = {
+    'D_Team': ('team_name', 'id_team'),
+    'D_Competition': ('competition', 'id_competition'),
+    'D_Season': ('season', 'season_id'),
+    'D_Stadium': ('stadium_name', 'id_stadium'),
+    'D_Date': ('date_iso', 'id_date'),
+    'D_Player': ('player_key', 'id_player'),  # 'nom|aaaa-mm-jj', cf. rosters.player_keys
+}
 
 # Helpers pour normaliser noms de colonnes
+def normalize_col_name(c):
+    return c.strip().lower().replace(' ', '_').replace('.', '_')
+
+
 def normalize_cols(df):
     df = df.copy()
-    df.columns = [c.strip().lower().replace(' ', '_').replace('.', '_') for c in df.columns]
+    df.columns = [normalize_col_name(c) for c in df.columns]
     return df
 
 # Heuristiques pour trouver colonnes importantes
-def pick_col(cols, candidates):
+def pick_col_explained(cols, candidates):
+    """Comme `pick_col`, retourne `(colonne, heuristique, candidat)` ; heuristique 'exact', 'contains' ou None"""
     for cand in candidates:
         for c in cols:
             if cand == c:
-                return c
+                return c, 'exact', cand
     # fuzzy contains
     for cand in candidates:
         for c in cols:
             if cand in c:
-                return c
-    return None
+                return c, 'contains', cand
+    return None, None, None
+
+
+def pick_col(cols, candidates):
+    return pick_col_explained(cols, candidates)[0]
+
+
+# colonne logique d'un fichier de matches -> candidats pour pick_col (noms normalisés)
+MATCH_COLUMN_CANDIDATES = {
+    'id_match': ['matchid','id_match','id','match_id'],
+    'stage': ['stage','round','phase'],
+    'status': ['status','state'],
+    'date_raw': ['date','match_date','kickoff'],
+    'home_team_name': ['home_name','home.name','home','home_team','home.name'],
+    'away_team_name': ['away_name','away.name','away','away_team','away.name'],
+    'result_home': ['result_home','result.home','home_score','result.home'],
+    'result_away': ['result_away','result.away','away_score','result.away'],
+    'regulation_time': ['result_regulationtime','result_regulation_time','regulation_time','result_regulationtime','result_regulation'],
+    'penalties': ['result_penalties','result.penalties','penalties'],
+    'venue': ['information_venue','information.venue','venue','stadium','stadium_name'],
+    'capacity': ['information_capacity','information.capacity','capacity','stadium_capacity'],
+}
+
+
+def resolve_match_columns(cols):
+    """{colonne logique: colonne (normalisée) du fichier ou None}"""
+    return {logical: pick_col(cols, candidates) for logical, candidates in MATCH_COLUMN_CANDIDATES.items()}
+
+
+class ColumnMapCache:
+    """Cache des correspondances colonne logique -> colonne physique par schéma d'en-tête.
+
+    Le schéma est identifié par l'empreinte de l'en-tête normalisé : les
+    heuristiques `pick_col` ne tournent qu'une fois par en-tête distinct.
+    Le cache peut être persisté en JSON entre deux runs.
+    """
+
+    def __init__(self, maps=None):
+        # empreinte -> {'columns': en-tête normalisé, 'mapping': {logique: [colonne, heuristique, candidat]}}
+        self.maps = dict(maps or {})
+        self.by_path = {}
+        self.files = {}
+
+    @staticmethod
+    def fingerprint(cols):
+        return hashlib.sha1('\x1f'.join(cols).encode('utf-8')).hexdigest()[:16]
+
+    def resolve(self, cols, path=None):
+        """{colonne logique: colonne ou None} pour l'en-tête normalisé `cols`"""
+        fp = self.fingerprint(cols)
+        if fp not in self.maps:
+            self.maps[fp] = {
+                'columns': list(cols),
+                'mapping': {logical: list(pick_col_explained(cols, candidates))
+                            for logical, candidates in MATCH_COLUMN_CANDIDATES.items()},
+            }
+        if path is not None:
+            self.by_path[path] = fp
+            self.files[fp] = self.files.get(fp, 0) + 1
+        return {logical: m[0] for logical, m in self.maps[fp]['mapping'].items()}
+
+    def merge(self, fp, entry):
+        """Intègre le résultat d'un worker (une résolution pour un fichier)"""
+        self.maps.setdefault(fp, entry)
+        self.files[fp] = self.files.get(fp, 0) + 1
+
+    def load(self, path):
+        if Path(path).exists():
+            with open(path, encoding='utf-8') as fh:
+                self.maps.update(json.load(fh))
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(self.maps, fh, indent=1)
+
+    def report(self):
+        """Lignes de rapport : fichiers par schéma et heuristique retenue par colonne logique"""
+        lines = [f'{len(self.files)} distinct match-file header(s)']
+        for fp, n in sorted(self.files.items(), key=lambda kv: -kv[1]):
+            lines.append(f'  schema {fp}: {n} file(s)')
+            for logical, (col, how, cand) in self.maps[fp]['mapping'].items():
+                detail = f'{col} ({how} on {cand!r})' if col else 'missing'
+                lines.append(f'    {logical:<16} <- {detail}')
+        return lines
+
+
+# cache du processus courant (pré-rempli dans les workers par `_init_worker`)
+COLUMN_MAPS = ColumnMapCache()
+
+
+def _init_worker(maps):
+    COLUMN_MAPS.maps.update(maps)
+
+
+def sniff_encoding(path, nbytes=64 * 1024):
+    """Encodage d'un CSV deviné sur ses premiers octets : utf-8(-sig) sinon latin1"""
+    with open(path, 'rb') as fh:
+        head = fh.read(nbytes)
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # final=False : une séquence multi-octets coupée en fin de fenêtre n'est pas une erreur
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin1'
+
+
+def iter_match_chunks(path, chunksize=None, encoding=None):
+    """Lit un fichier de matches par blocs de `chunksize` lignes (un seul bloc si None).
+
+    Seules les colonnes retenues par `resolve_match_columns` sont lues ;
+    chaque bloc a les colonnes de `read_match_file`.
+    """
+    encoding = encoding or sniff_encoding(path)
+    header = pd.read_csv(path, nrows=0, encoding=encoding).columns
+    physical = {normalize_col_name(c): c for c in header}
+    mapping = COLUMN_MAPS.resolve(list(physical), path=path)
+    usecols = list(dict.fromkeys(physical[c] for c in mapping.values() if c)) or None
+    comp, season = parse_source_path(path)[:2]
+
+    reader = pd.read_csv(path, encoding=encoding, usecols=usecols, chunksize=chunksize)
+    for df in (reader if chunksize else [reader]):
+        df = normalize_cols(df)
+        # extraire colonnes fiables
+        out = pd.DataFrame(index=df.index)
+        for logical, col in mapping.items():
+            if col in df.columns:
+                out[logical] = df[col]
+            elif logical == 'id_match':
+                out[logical] = df.index.astype(str)
+            else:
+                out[logical] = None
+        out['competition'] = comp
+        out['season'] = season
+        out['source_file'] = path
+        yield out
+
 
 # lire et normaliser un fichier de matches
 def read_match_file(path):
     try:
-        df = pd.read_csv(path)
-    except Exception:
-        df = pd.read_csv(path, encoding='latin1')
-    df = normalize_cols(df)
-    # détecter colonnes
-    cols = df.columns.tolist()
-    id_col = pick_col(cols, ['matchid','id_match','id','match_id'])
-    stage_col = pick_col(cols, ['stage','round','phase'])
-    status_col = pick_col(cols, ['status','state'])
-    date_col = pick_col(cols, ['date','match_date','kickoff'])
-    home_col = pick_col(cols, ['home_name','home.name','home','home_team','home.name'])
-    away_col = pick_col(cols, ['away_name','away.name','away','away_team','away.name'])
-    res_home = pick_col(cols, ['result_home','result.home','home_score','result.home'])
-    res_away = pick_col(cols, ['result_away','result.away','away_score','result.away'])
-    reg_col = pick_col(cols, ['result_regulationtime','result_regulation_time','regulation_time','result_regulationtime','result_regulation'])
-    pen_col = pick_col(cols, ['result_penalties','result.penalties','penalties'])
-    venue_col = pick_col(cols, ['information_venue','information.venue','venue','stadium','stadium_name'])
-    cap_col = pick_col(cols, ['information_capacity','information.capacity','capacity','stadium_capacity'])
-
-    # extraire colonnes fiables
-    out = pd.DataFrame()
-    out['id_match'] = df[id_col] if id_col in df.columns else df.index.astype(str)
-    out['stage'] = df[stage_col] if stage_col in df.columns else None
-    out['status'] = df[status_col] if status_col in df.columns else None
-    out['date_raw'] = df[date_col] if date_col in df.columns else None
-    out['home_team_name'] = df[home_col] if home_col in df.columns else None
-    out['away_team_name'] = df[away_col] if away_col in df.columns else None
-    out['result_home'] = df[res_home] if res_home in df.columns else None
-    out['result_away'] = df[res_away] if res_away in df.columns else None
-    out['regulation_time'] = df[reg_col] if reg_col in df.columns else None
-    out['penalties'] = df[pen_col] if pen_col in df.columns else None
-    out['venue'] = df[venue_col] if venue_col in df.columns else None
-    out['capacity'] = df[cap_col] if cap_col in df.columns else None
-
-    # competition / season deduced depuis le chemin et le nom de fichier
-    p = str(path).replace('\\','/')
-    # example: .../matches/ligue_1/tunisia_ligue_professionnelle_1_2019_2020.csv
-    #          .../matches/cup/tunisia_tunisia_cup_tunisia_cup_2010_2011.csv
-    #          .../matches/super_cup/super_cup_super_cup_2019.csv
-    parts = p.split('/')
-    comp = None
-    season = None
-    # si dossier parent contient ligue_1, cup, super_cup, on le prend
-    for part in parts:
-        low = part.lower()
-        if low in ('ligue_1','cup','super_cup','supercup'):
-            comp = low
-    
-    # try parse season from filename (robust logic for all patterns)
-    fname = os.path.basename(path)
-    import re
-    
-    # Pattern 1: yyyy_yyyy or yyyy-yyyy (e.g. 2019_2020, 2000-01, 2010_2011)
-    m = re.search(r'(\d{4})[\-_](\d{2,4})', fname)
-    if m:
-        year1 = m.group(1)
-        year2 = m.group(2)
-        # Normalize to 2-digit year if needed
-        if len(year2) == 4:
-            season = f"{year1}-{year2[2:]}"  # 2019_2020 -> 2019-20
-        else:
-            season = f"{year1}-{year2}"  # 2000-01 or 2010-11
-    else:
-        # Pattern 2: Single year at end (e.g. super_cup_2019) -> assume 2019-20
-        m2 = re.search(r'(\d{4})(?:\.csv)?$', fname)
-        if m2:
-            year = int(m2.group(1))
-            # For single year, assume it refers to season year-to-year+1
-            # But check if it's a super_cup or cup (special handling)
-            if comp in ('super_cup', 'cup'):
-                # super_cup_2019 -> 2019-20
-                season = f"{year}-{str(year+1)[2:]}"
-            else:
-                # For ligue_1 with single year, might be incomplete data
-                season = str(year)
-    
-    out['competition'] = comp
-    out['season'] = season
-    out['source_file'] = path
-    return out
+        return pd.concat(list(iter_match_chunks(path)))
+    except UnicodeDecodeError:
+        # l'encodage deviné sur le début du fichier ne tient pas plus loin
+        return pd.concat(list(iter_match_chunks(path, encoding='latin1')))
 
 
 def parse_date_safe(s):
     if pd.isna(s):
         return None
+    from dateutil import parser
     try:
         return parser.parse(str(s), dayfirst=True)
     except Exception:
@@ -148,7 +248,239 @@ def parse_date_safe(s):
             return None
 
 
-def build_dimensions(matches_df, data_dir):
+# Formats Flashscore connus (jour en premier, comme dateutil avec dayfirst=True).
+# Les formats ISO (année en premier) ne sont pas listés : dateutil les lit avec
+# dayfirst=True en inversant jour et mois, on les laisse donc au fallback.
+KNOWN_DATE_FORMATS = ['%d.%m.%Y %H:%M', '%d.%m.%Y', '%d/%m/%Y %H:%M', '%d/%m/%Y']
+
+# cache des valeurs qui passent par dateutil (partagé entre fichiers d'un même processus)
+_parse_date_cached = lru_cache(maxsize=100_000)(parse_date_safe)
+
+
+def parse_dates(values):
+    """Équivalent vectorisé de `values.apply(parse_date_safe)`.
+
+    Chaque valeur distincte n'est parsée qu'une fois : les formats connus sont
+    essayés en bloc avec `pd.to_datetime(format=...)`, le reste passe par
+    `parse_date_safe` (dateutil). Retourne une Series datetime64[ns].
+    """
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(np.asarray(uniques, dtype=object))
+    parsed = np.full(len(uniques) + 1, np.datetime64('NaT'), dtype='datetime64[ns]')
+    todo = np.ones(len(uniques), dtype=bool)
+
+    text = uniques.astype(str).str.strip()
+    for fmt in KNOWN_DATE_FORMATS:
+        if not todo.any():
+            break
+        got = pd.to_datetime(text[todo], format=fmt, errors='coerce')
+        ok = got.notna().to_numpy()
+        idx = got.index[ok]
+        parsed[idx] = got[ok].to_numpy().astype('datetime64[ns]')
+        todo[idx] = False
+
+    for i in np.flatnonzero(todo):
+        d = _parse_date_cached(uniques.iat[i])
+        if d is not None and not pd.isna(d):
+            parsed[i] = pd.Timestamp(d).to_datetime64()
+
+    # code -1 (valeur manquante) pointe sur le NaT final
+    return pd.Series(parsed[codes], index=values.index)
+
+
+# représentation compacte des matches en mémoire : textes répétés en category,
+# scores en petits entiers nullables, chemin source en code de fichier
+CATEGORY_COLUMNS = ['stage', 'status', 'home_team_name', 'away_team_name', 'regulation_time',
+                    'penalties', 'venue', 'capacity', 'competition', 'season']
+SCORE_COLUMNS = ['result_home', 'result_away']
+
+
+def compact_match_frame(dfm):
+    """Convertit une frame de `read_match_file` (dates déjà parsées) en types compacts.
+
+    `date_raw` et `source_file` sont retirés : le parent rattache le fichier
+    par un code (voir `load_matches`).
+    """
+    dfm = dfm.drop(columns=['date_raw', 'source_file'])
+    for c in CATEGORY_COLUMNS:
+        dfm[c] = dfm[c].astype('category')
+    for c in SCORE_COLUMNS:
+        dfm[c] = pd.to_numeric(dfm[c], errors='coerce').astype('Int16')
+    return dfm
+
+
+def concat_matches(dfs):
+    """`pd.concat` des frames de matches en gardant les colonnes category (union des catégories)"""
+    if len(dfs) > 1:
+        for c in [c for c in dfs[0].columns if isinstance(dfs[0][c].dtype, pd.CategoricalDtype)]:
+            cats = pd.unique(np.concatenate([np.asarray(df[c].cat.categories, dtype=object) for df in dfs]))
+            for df in dfs:
+                df[c] = df[c].cat.set_categories(cats)
+    return pd.concat(dfs, ignore_index=True)
+
+
+def ingest_match_file(path, chunksize=None):
+    """Lit, normalise, parse les dates et compacte un fichier de matches.
+
+    Avec `chunksize`, le fichier est traité par blocs : seul un bloc brut est
+    en mémoire à la fois. Exécuté dans un processus worker en mode parallèle :
+    retourne `(path, frame, erreur, schéma)` pour que le parent garde l'ordre,
+    les messages et le rapport des correspondances de colonnes.
+    """
+    def compact_chunks(encoding=None):
+        chunks = []
+        for dfm in iter_match_chunks(path, chunksize=chunksize, encoding=encoding):
+            # parse dates
+            dfm['date_parsed'] = parse_dates(dfm['date_raw'])
+            chunks.append(compact_match_frame(dfm))
+        return concat_matches(chunks)
+
+    try:
+        try:
+            dfm = compact_chunks()
+        except UnicodeDecodeError:
+            dfm = compact_chunks(encoding='latin1')
+    except Exception as e:
+        return path, None, e, None
+    fp = COLUMN_MAPS.by_path.get(path)
+    return path, dfm, None, (fp, COLUMN_MAPS.maps[fp])
+
+
+def load_matches(files, workers=1, chunksize=None):
+    """Charge tous les fichiers de matches, en parallèle si `workers > 1`.
+
+    L'ordre des frames retournées suit toujours l'ordre trié des fichiers,
+    quel que soit le nombre de workers. `source_file` est une category dont
+    les catégories sont la liste triée des fichiers.
+    """
+    files = sorted(files)
+    ingest = partial(ingest_match_file, chunksize=chunksize)
+    parallel = workers and workers > 1 and len(files) > 1
+    if parallel:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(COLUMN_MAPS.maps,)) as pool:
+            results = list(pool.map(ingest, files, chunksize=max(1, len(files) // (workers * 4))))
+    else:
+        results = [ingest(p) for p in files]
+
+    code_dtype = np.int16 if len(files) < 2 ** 15 else np.int32
+    dfs = []
+    for i, (p, dfm, err, schema) in enumerate(results):
+        if err is not None:
+            print('Failed reading', p, err)
+            continue
+        if parallel:
+            COLUMN_MAPS.merge(*schema)
+        dfm['source_file'] = pd.Categorical.from_codes(np.full(len(dfm), i, dtype=code_dtype), categories=files)
+        dfs.append(dfm)
+    return dfs
+
+
+def peak_memory_mb():
+    """Pic de mémoire résidente du processus (et des workers) en Mo, None si indisponible"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 2 ** 20
+        except (ImportError, AttributeError):
+            return None
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    unit = 1 if os.uname().sysname == 'Darwin' else 1024
+    self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    children_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    return max(self_peak, children_peak) / 2 ** 20
+
+
+# phase de la saison (calendrier tunisien août -> mai), indexée par mois (1-12)
+SEASON_PHASES = np.array([None,
+                          'second_half', 'second_half', 'second_half', 'second_half', 'second_half',
+                          'off_season', 'off_season',
+                          'first_half', 'first_half', 'first_half', 'first_half', 'first_half'], dtype=object)
+
+D_DATE_COLUMNS = ['date', 'id_date', 'date_iso', 'time', 'year', 'month', 'day',
+                  'quarter', 'weekday', 'iso_year', 'iso_week', 'season_phase']
+
+
+def calendar_days(dates, known=()):
+    """Jours (à minuit) de l'intervalle couvert par `dates` sans aucun horodatage dans `dates` ni `known`"""
+    dates = pd.DatetimeIndex(dates)
+    if len(dates) == 0:
+        return pd.DatetimeIndex([], dtype='datetime64[ns]')
+    days = pd.date_range(dates.min().normalize(), dates.max().normalize(), freq='D')
+    covered = dates.normalize().append(pd.DatetimeIndex(known).normalize())
+    return days[~days.isin(covered)]
+
+
+def build_date_dimension(dates, start_id=1, fill_days=None):
+    """D_Date : une ligne par horodatage distinct de `dates`, triée, ids à partir de `start_id`.
+
+    `fill_days` (cf. `calendar_days`) ajoute des jours sans match, avec `time` vide,
+    pour un calendrier continu. Tous les attributs sont calculés sur les tableaux
+    datetime64 ; seules les heures distinctes sont formatées.
+    """
+    stamps = pd.DatetimeIndex(pd.unique(pd.DatetimeIndex(dates).dropna())).astype('datetime64[ns]')
+    fill = pd.DatetimeIndex(fill_days if fill_days is not None else [], dtype='datetime64[ns]')
+    all_dates = stamps.append(fill)
+    order = np.argsort(all_dates.asi8, kind='stable')
+    all_dates = all_dates[order]
+    is_match = (np.arange(len(order)) < len(stamps))[order]
+
+    ddate = pd.DataFrame({'date': all_dates})
+    ddate['id_date'] = np.arange(start_id, start_id + len(ddate), dtype='int64')
+    ddate['date_iso'] = all_dates.strftime('%Y-%m-%d %H:%M:%S') if len(ddate) else pd.Series(dtype=object)
+
+    # heure du jour : formatage des secondes distinctes uniquement
+    seconds = (all_dates.asi8 - all_dates.normalize().asi8) // 10 ** 9
+    codes, uniques = pd.factorize(seconds)
+    labels = np.array([f'{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}' for s in uniques] + [None], dtype=object)
+    ddate['time'] = np.where(is_match, labels[codes], None)
+
+    ddate['year'] = all_dates.year
+    ddate['month'] = all_dates.month
+    ddate['day'] = all_dates.day
+    ddate['quarter'] = all_dates.quarter
+    ddate['weekday'] = all_dates.dayofweek + 1  # ISO : 1 = lundi
+    iso = all_dates.isocalendar()
+    ddate['iso_year'] = iso['year'].to_numpy('int64')
+    ddate['iso_week'] = iso['week'].to_numpy('int64')
+    ddate['season_phase'] = SEASON_PHASES[all_dates.month.to_numpy()]
+    return ddate[D_DATE_COLUMNS]
+
+
+def date_keys(ddate, dates):
+    """id_date de chaque valeur de `dates` (jointure sur l'entier datetime64), -1 si absente"""
+    index = pd.Index(pd.to_datetime(ddate['date']).to_numpy('datetime64[ns]'))
+    pos = index.get_indexer(pd.DatetimeIndex(dates).astype('datetime64[ns]'))
+    ids = ddate['id_date'].to_numpy('int64')
+    return np.where(pos >= 0, ids[pos], -1)
+
+
+# indépendance de la Tunisie (20 mars 1956) : la saison 1955-56 est comptée « After »
+INDEPENDENCE_YEAR = 1956
+
+
+def add_season_years(dseason):
+    """Complète `start_year`/`end_year` de D_Season à partir du libellé de saison (2019-20 -> 2019, 2020)
+
+    et BeforeAfterIndependence ('Before' / 'After' selon que la saison finit avant 1956 ou non).
+    """
+    dseason = dseason.copy()
+    years = [season_years(s) for s in dseason['season']]
+    for i, col in enumerate(('start_year', 'end_year')):
+        parsed = pd.Series([y[i] for y in years], index=dseason.index, dtype='Int64')
+        current = pd.to_numeric(dseason[col], errors='coerce').astype('Int64') if col in dseason.columns else None
+        dseason[col] = parsed if current is None else current.fillna(parsed)
+    last_year = dseason['end_year'].fillna(dseason['start_year'])
+    era = pd.Series(np.where(last_year >= INDEPENDENCE_YEAR, 'After', 'Before'), index=dseason.index, dtype=object)
+    era = era.where(last_year.notna().to_numpy(dtype=bool), None)
+    current = dseason[INDEPENDENCE_COLUMN] if INDEPENDENCE_COLUMN in dseason.columns else None
+    dseason[INDEPENDENCE_COLUMN] = era if current is None else current.fillna(era)
+    return dseason
+
+
+def build_dimensions(matches_df, data_dir, calendar=False):
     # D_Team: use existing D_Team.csv if present to keep ids
     teams_file = data_dir / 'D_Team.csv'
     if teams_file.exists():
@@ -232,7 +564,7 @@ def build_dimensions(matches_df, data_dir):
         dcomp = dcomp[['competition']].drop_duplicates().reset_index(drop=True)
         dcomp['id_competition'] = range(1, len(dcomp)+1)
     else:
-        comps = matches_df['competition'].fillna('ligue_1').unique()
+        comps = matches_df['competition'].astype(object).fillna('ligue_1').unique()
         dcomp = pd.DataFrame({'competition': sorted([str(c) for c in comps if c is not None])})
         dcomp['id_competition'] = range(1, len(dcomp)+1)
 
@@ -252,14 +584,16 @@ def build_dimensions(matches_df, data_dir):
             # ensure season_id is unique key
             dseason = dseason.drop_duplicates(subset=['season_id']).reset_index(drop=True)
         else:
-            dseason = pd.DataFrame({'season': matches_df['season'].dropna().unique()})
+            dseason = pd.DataFrame({'season': matches_df['season'].dropna().astype(object).unique()})
             dseason = dseason.reset_index().rename(columns={'index':'season_id'})
             dseason['season_id'] = dseason['season_id'] + 1
     else:
-        dseason = pd.DataFrame({'season': matches_df['season'].dropna().unique()})
+        dseason = pd.DataFrame({'season': matches_df['season'].dropna().astype(object).unique()})
         dseason = dseason.reset_index().rename(columns={'index':'season_id'})
         dseason['season_id'] = dseason['season_id'] + 1
 
+    dseason = add_season_years(dseason)
+
     # stadiums
     stad_file = data_dir / 'D_Stadium.csv'
     if stad_file.exists():
@@ -279,107 +613,228 @@ def build_dimensions(matches_df, data_dir):
         dstad['id_stadium'] = range(1, len(dstad)+1)
 
     # dates dimension
-    dates = []
-    for d in matches_df['date_parsed'].dropna().unique():
-        dates.append(pd.Timestamp(d))
-    if len(dates)==0:
-        ddate = pd.DataFrame(columns=['id_date','date','year','month','day','date_iso'])
-    else:
-        ddate = pd.DataFrame({'date': sorted(dates)})
-        ddate['id_date'] = range(1, len(ddate)+1)
-        ddate['date_iso'] = ddate['date'].dt.strftime('%Y-%m-%d %H:%M:%S')
-        ddate['year'] = ddate['date'].dt.year
-        ddate['month'] = ddate['date'].dt.month
-        ddate['day'] = ddate['date'].dt.day
+    dates = matches_df['date_parsed'].dropna().unique()
+    ddate = build_date_dimension(dates, fill_days=calendar_days(dates) if calendar else None)
 
     return dteam, dcomp, dseason, dstad, ddate
 
 
-def build_fact(matches_df, dteam, dcomp, dseason, dstad, ddate):
-    # Enhanced team mapping with fuzzy matching
-    def find_team_id_robust(team_name, team_map, team_list):
-        """Find team ID with fallback to fuzzy matching"""
+def normalize_team_name(s):
+    """Minuscules + suppression des accents (NFD), clé de comparaison des noms d'équipes"""
+    return ''.join(c for c in unicodedata.normalize('NFD', s.lower()) if unicodedata.category(c) != 'Mn')
+
+
+def _trigrams(s):
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class TeamResolver:
+    """Résolution nom d'équipe -> id_team, construite une seule fois depuis D_Team.
+
+    Même ordre de priorité que l'ancien `find_team_id_robust` :
+    1. correspondance exacte du nom
+    2. égalité des noms normalisés (accents/casse)
+    3. inclusion dans un sens ou dans l'autre des noms normalisés
+    En cas d'ambiguïté, la première équipe dans l'ordre de D_Team gagne.
+    Les étapes 2 et 3 passent par des index (hash du nom normalisé, trigrammes)
+    et chaque nom brut distinct n'est résolu qu'une fois.
+    """
+
+    def __init__(self, dteam):
+        self.team_map = {}
+        self._names = []          # noms dans l'ordre de D_Team
+        self._norm_names = []
+        self._norm_map = {}       # nom normalisé -> première position
+        self._trigram_index = {}  # trigramme -> positions
+        self._trigram_count = []
+        self._short = []          # positions des noms normalisés de moins de 3 caractères
+        self._cache = {}
+        self._misses = set()
+        self.stats = {'lookups': 0, 'cache_hits': 0, 'exact': 0, 'normalized': 0, 'substring': 0, 'miss': 0}
+        for name, tid in zip(dteam['team_name'], dteam['id_team']):
+            self.add(name, tid)
+
+    def add(self, team_name, id_team):
+        """Ajoute une équipe (en fin d'ordre) et invalide les échecs mis en cache"""
+        self.team_map[team_name] = id_team
+        if pd.isna(team_name):
+            return
+        pos = len(self._names)
+        norm = normalize_team_name(str(team_name))
+        self._names.append(team_name)
+        self._norm_names.append(norm)
+        self._norm_map.setdefault(norm, pos)
+        grams = _trigrams(norm)
+        self._trigram_count.append(len(grams))
+        if len(norm) < 3:
+            self._short.append(pos)
+        for g in grams:
+            self._trigram_index.setdefault(g, []).append(pos)
+        for k in self._misses:
+            self._cache.pop(k, None)
+        self._misses.clear()
+
+    def _substring_match(self, norm):
+        """Plus petite position dont le nom normalisé contient `norm` ou y est contenu"""
+        candidates = set(self._short)
+        grams = _trigrams(norm)
+        # nom d'équipe contenu dans l'entrée : tous ses trigrammes sont dans l'entrée
+        seen = {}
+        for g in grams:
+            for pos in self._trigram_index.get(g, ()):
+                seen[pos] = seen.get(pos, 0) + 1
+        candidates.update(pos for pos, n in seen.items() if n == self._trigram_count[pos])
+        # entrée contenue dans le nom d'équipe : l'équipe possède tous les trigrammes de l'entrée
+        if len(norm) < 3:
+            candidates.update(range(len(self._names)))
+        else:
+            candidates.update(pos for pos, n in seen.items() if n == len(grams))
+        for pos in sorted(candidates):
+            cand = self._norm_names[pos]
+            if cand in norm or norm in cand:
+                return pos
+        return None
+
+    def resolve(self, team_name):
+        """Retourne `(id_team, nom_retenu)` ; id_team vaut -1 si non trouvé"""
+        self.stats['lookups'] += 1
         if pd.isna(team_name):
             return -1, None
         team_str = str(team_name).strip()
-        
-        # Direct match
-        if team_str in team_map:
-            return team_map[team_str], team_str
-        
-        # Fuzzy: normalize accents and case
-        import unicodedata
-        def normalize(s):
-            return ''.join(c for c in unicodedata.normalize('NFD', s.lower()) if unicodedata.category(c) != 'Mn')
-        
-        normalized_input = normalize(team_str)
-        for team_name_orig in team_list:
-            if normalize(team_name_orig) == normalized_input:
-                return team_map[team_name_orig], team_name_orig
-        
-        # Fuzzy: contains
-        for team_name_orig in team_list:
-            if normalize(team_name_orig) in normalized_input or normalized_input in normalize(team_name_orig):
-                return team_map[team_name_orig], team_name_orig
-        
-        return -1, team_str
-    
+        if team_str in self._cache:
+            self.stats['cache_hits'] += 1
+            return self._cache[team_str]
+
+        if team_str in self.team_map:
+            res, kind = (self.team_map[team_str], team_str), 'exact'
+        else:
+            norm = normalize_team_name(team_str)
+            pos = self._norm_map.get(norm)
+            kind = 'normalized'
+            if pos is None:
+                pos = self._substring_match(norm)
+                kind = 'substring'
+            if pos is None:
+                res, kind = (-1, team_str), 'miss'
+                self._misses.add(team_str)
+            else:
+                name = self._names[pos]
+                res = (self.team_map[name], name)
+        self.stats[kind] += 1
+        self._cache[team_str] = res
+        return res
+
+    def resolve_series(self, names):
+        """Résout une Series de noms (un appel à `resolve` par nom distinct)"""
+        names = pd.Series(names)
+        codes, uniques = pd.factorize(names)
+        ids = np.array([self.resolve(u)[0] for u in uniques] + [-1], dtype='int64')
+        return pd.Series(ids[codes], index=names.index)
+
+
+def apply_key_registry(registry, dteam, dcomp, dseason, dstad, ddate):
+    """Remplace les ids des dimensions par les clés stables du registre.
+
+    Les ids calculés par `build_dimensions` servent de proposition pour les
+    membres nouveaux : un premier run donne donc les mêmes ids qu'avant.
+    """
+    dims = {'D_Team': dteam, 'D_Competition': dcomp, 'D_Season': dseason, 'D_Stadium': dstad, 'D_Date': ddate}
+    for name, df in dims.items():
+        key_col, id_col = DIMENSION_KEYS[name]
+        if len(df) == 0:
+            continue
+        df[id_col] = registry.assign(name, df[key_col], preferred_ids=df[id_col])
+    return dteam, dcomp, dseason, dstad, ddate
+
+
+# colonnes de F_Match (ordre du CREATE TABLE, sans capacity) et types en mémoire
+F_MATCH_DTYPES = {
+    'id_match': object,
+    'id_date': 'int64',
+    'id_home_team': 'int64',
+    'id_away_team': 'int64',
+    'id_competition': 'int64',
+    'season_id': 'int64',
+    'id_stadium': 'Int64',
+    'stage': object,
+    'status': object,
+    'result_home': 'int64',
+    'result_away': 'int64',
+    'regulation_time': object,
+    'penalties': object,
+    'venue': object,
+}
+
+
+def team_stadium_map(dteam):
+    """Series id_team -> stadium_id (première ligne par équipe, NA si pas de stade)"""
+    teams = dteam[dteam['id_team'] != -1].drop_duplicates(subset=['id_team'], keep='first')
+    return pd.Series(pd.to_numeric(teams['stadium_id'], errors='coerce').to_numpy(), index=teams['id_team'].to_numpy())
+
+
+def append_teams(dteam, names, registry=None):
+    """Ajoute les équipes `names` (triées) à D_Team avec des ids à la suite ; retourne `(dteam, lignes ajoutées)`"""
+    max_id = dteam['id_team'].max()
+    if pd.isna(max_id):
+        max_id = 0
+    missing_sorted = sorted(names)
+    new_ids = [max_id + i + 1 for i in range(len(missing_sorted))]
+    if registry is not None:
+        new_ids = registry.assign('D_Team', missing_sorted, preferred_ids=new_ids)
+    new_rows = []
+    for team_name, new_id in zip(missing_sorted, new_ids):
+        new_rows.append({
+            'id_team': new_id,
+            'team_name': team_name,
+            'location': None,
+            'stadium_id': None
+        })
+    return pd.concat([dteam, pd.DataFrame(new_rows)], ignore_index=True), new_rows
+
+
+def build_fact(matches_df, dteam, dcomp, dseason, dstad, ddate, registry=None):
+    resolver = TeamResolver(dteam)
+
     # maps
-    team_map = dict(zip(dteam['team_name'], dteam['id_team']))
-    team_list = list(dteam['team_name'])
     comp_map = dict(zip(dcomp['competition'], dcomp['id_competition']))
     season_map = dict(zip(dseason['season'], dseason['season_id']))
     stad_map = dict(zip(dstad['stadium_name'], dstad['id_stadium']))
-    date_map = dict(zip(ddate['date_iso'], ddate['id_date']))
 
     # First pass: collect missing teams
     missing_teams = set()
-    for team_name in matches_df['home_team_name']:
-        team_id, _ = find_team_id_robust(team_name, team_map, team_list)
-        if team_id == -1 and pd.notna(team_name):
-            missing_teams.add(str(team_name).strip())
-    
-    for team_name in matches_df['away_team_name']:
-        team_id, _ = find_team_id_robust(team_name, team_map, team_list)
-        if team_id == -1 and pd.notna(team_name):
-            missing_teams.add(str(team_name).strip())
-    
+    team_names = pd.concat([matches_df['home_team_name'], matches_df['away_team_name']]).dropna().unique()
+    for team_name in team_names:
+        team_id, team_str = resolver.resolve(team_name)
+        if team_id == -1:
+            missing_teams.add(team_str)
+
     # Add missing teams to dteam
     if missing_teams:
         print(f"Adding {len(missing_teams)} missing teams to D_Team...")
-        max_id = dteam['id_team'].max()
-        new_rows = []
-        for i, team_name in enumerate(sorted(missing_teams)):
-            new_rows.append({
-                'id_team': max_id + i + 1,
-                'team_name': team_name,
-                'location': None,
-                'stadium_id': None
-            })
-        new_teams_df = pd.DataFrame(new_rows)
-        dteam = pd.concat([dteam, new_teams_df], ignore_index=True)
-        
-        # Update team_map with new teams
-        team_map = dict(zip(dteam['team_name'], dteam['id_team']))
-        team_list = list(dteam['team_name'])
+        dteam, new_rows = append_teams(dteam, missing_teams, registry=registry)
+
+        # Update resolver with new teams
+        for row in new_rows:
+            resolver.add(row['team_name'], row['id_team'])
         print(f"  {len(missing_teams)} new teams added")
         for row in new_rows:
             print(f"    id_team={row['id_team']}: {row['team_name']}")
 
     f = pd.DataFrame()
     f['id_match'] = matches_df['id_match'].astype(str)
-    # date parsed to iso
-    f['date_iso'] = matches_df['date_parsed'].dt.strftime('%Y-%m-%d %H:%M:%S')
-    f['id_date'] = f['date_iso'].map(date_map).fillna(-1).astype(int)
+    f['id_date'] = date_keys(ddate, matches_df['date_parsed'])
 
     # Use robust mapping for teams
-    f['id_home_team'] = matches_df['home_team_name'].apply(lambda x: find_team_id_robust(x, team_map, team_list)[0])
-    f['id_away_team'] = matches_df['away_team_name'].apply(lambda x: find_team_id_robust(x, team_map, team_list)[0])
-    f['id_competition'] = matches_df['competition'].map(comp_map).fillna(-1).astype(int)
-    f['season_id'] = matches_df['season'].map(season_map).fillna(-1).astype(int)
+    f['id_home_team'] = resolver.resolve_series(matches_df['home_team_name'])
+    f['id_away_team'] = resolver.resolve_series(matches_df['away_team_name'])
+    st = resolver.stats
+    print(f"  team resolution: {st['lookups']} lookups, {st['cache_hits']} cached, "
+          f"{st['exact']} exact, {st['normalized']} normalized, {st['substring']} substring, {st['miss']} missing")
+    f['id_competition'] = matches_df['competition'].astype(object).map(comp_map).fillna(-1).astype(int)
+    f['season_id'] = matches_df['season'].astype(object).map(season_map).fillna(-1).astype(int)
 
     # Map id_stadium from home_team's stadium (if available)
-    f['id_stadium'] = f['id_home_team'].map(lambda hid: dteam[dteam['id_team'] == hid]['stadium_id'].iloc[0] if hid != -1 and len(dteam[dteam['id_team'] == hid]) > 0 and pd.notna(dteam[dteam['id_team'] == hid]['stadium_id'].iloc[0]) else None)
+    f['id_stadium'] = f['id_home_team'].map(team_stadium_map(dteam)).astype('Int64')
 
     f['stage'] = matches_df['stage']
     f['status'] = matches_df['status']
@@ -390,322 +845,364 @@ def build_fact(matches_df, dteam, dcomp, dseason, dstad, ddate):
     f['venue'] = matches_df['venue']
 
     # ensure columns order matching requested CREATE TABLE (removed capacity column)
-    cols = ['id_match','id_date','id_home_team','id_away_team','id_competition','season_id','id_stadium','stage','status','result_home','result_away','regulation_time','penalties','venue']
-    f = f[cols]
+    f = f[list(F_MATCH_DTYPES)].astype(F_MATCH_DTYPES)
     return f, dteam
 
 
-def load_topscorers_dimensions(data_dir, dteam):
-    """Load and clean D_TopScorers_AllTime and D_TopScorers_By_Season"""
-    
-    # Créer mappings robustes pour les noms d'équipes
-    # Mapping manuel pour corriger les variations d'accents et de formatage
-    manual_team_map = {
-        'Espérance de Tunis': 'Esperance Tunis',
-        'Étoile du Sahel': 'Etoile du Sahel',
-        'JS Métouia': 'JS Metlaoui',  
-        'OC Kerkennah': 'Océano Club Kerkennah',
-        'Olympique des Transports': 'SC Moknine',  
-        'Olympique du Kef': 'Jendouba Sport',  
-        'Sfax Railways Sports': 'SFAX RAIL',
-        'Sfax Rail': 'SFAX RAIL',
-        'Club de Hammam-Lif': 'CS Hammam-Lif',
-        'Club Bizertin': 'CA Bizertin',
-        'Olympique Béja': 'Olympique Beja',
-        'Avenir de Marsa': 'Avenir Sportif de La Marsa',
-        'Jeunesse Kairouanaise': 'JS Kairouan',
-        'US Tunis': 'US Tataouine',  # approximation
-        'Tunisia Haykel Guemamdia': 'AS Gabès',
-        'Tunisia Taieb Ben Zitoun': 'AS Gabès',
-    }
-    
-    # exact match + fuzzy match (removes prefixes like "Tunisia", "Nigeria", etc)
-    def find_team_id(team_name_str, team_map, dteam_df):
-        if pd.isna(team_name_str):
-            return -1
-        team_str = str(team_name_str).strip()
-        # exact match
-        if team_str in team_map:
-            return team_map[team_str]
-        # apply manual mapping
-        if team_str in manual_team_map:
-            mapped_name = manual_team_map[team_str]
-            if mapped_name in team_map:
-                return team_map[mapped_name]
-        # remove country prefix (e.g. "Tunisia X" -> "X")
-        parts = team_str.split()
-        if len(parts) > 1:
-            # check if first part is a country name, remove it
-            name_without_prefix = ' '.join(parts[1:])
-            if name_without_prefix in team_map:
-                return team_map[name_without_prefix]
-        # fuzzy match: look for contains
-        for team_name, tid in team_map.items():
-            if team_name.lower() in team_str.lower() or team_str.lower() in team_name.lower():
-                return tid
-        return -1
-    
-    # D_TopScorers_AllTime
-    dtopscore_all = None
-    alltimefile = data_dir / 'D_TopScorers_AllTime.csv'
-    if alltimefile.exists():
+# Mapping manuel des noms d'équipes des fichiers de buteurs (accents, anciens noms)
+MANUAL_TEAM_MAP = {
+    'Espérance de Tunis': 'Esperance Tunis',
+    'Étoile du Sahel': ('Etoile du Sahel', 'Etoile Sahel'),
+    'JS Métouia': 'JS Metlaoui',
+    'OC Kerkennah': 'Océano Club Kerkennah',
+    'Olympique des Transports': 'SC Moknine',
+    'Olympique du Kef': 'Jendouba Sport',
+    'Sfax Railways Sports': 'SFAX RAIL',
+    'Sfax Rail': 'SFAX RAIL',
+    'Club de Hammam-Lif': 'CS Hammam-Lif',
+    'Club Bizertin': 'CA Bizertin',
+    'Olympique Béja': 'Olympique Beja',
+    'Avenir de Marsa': 'Avenir Sportif de La Marsa',
+    'Jeunesse Kairouanaise': 'JS Kairouan',
+    'US Tunis': 'US Tataouine',  # approximation
+    'Tunisia Haykel Guemamdia': 'AS Gabès',
+    'Tunisia Taieb Ben Zitoun': 'AS Gabès',
+    # noms longs des effectifs (data/player_data)
+    'Avenir Sportif de Gabès': 'AS Gabes',
+    'Club Athlétique Bizertin': 'CA Bizertin',
+    'ES Sahel': 'Etoile Sahel',
+    'Etoile Sportive du Sahel': 'Etoile Sahel',
+    'Jeunesse Sportive Omrane': 'JS Omrane',
+    # palmarès (data/champions) ; plusieurs cibles possibles selon la source de D_Team
+    'Espérance Sportive': 'Esperance Tunis',
+    'Espérance sportive de Tunis': 'Esperance Tunis',
+    'Étoile sportive du Sahel': ('Etoile du Sahel', 'Etoile Sahel'),
+    'Club sportif sfaxien': 'CS Sfaxien',
+    'Club sportif de Hammam Lif': ('CS Hammam-Lif', 'Hammam-Lif'),
+    'Jeunesse de Hammam Lif': ('CS Hammam-Lif', 'Hammam-Lif'),
+    'CS Hammam-Lif': ('CS Hammam-Lif', 'Hammam-Lif'),
+    'Sfax Railway Sports': ('SFAX RAIL', 'Sfax Railways'),
+    'Sfax railway sport': ('SFAX RAIL', 'Sfax Railways'),
+    'Railway Sports': ('SFAX RAIL', 'Sfax Railways'),
+    'Olympique de Béja': 'Olympique Beja',
+    'El Makarem de Mahdia': 'EM Mahdia',
+    'Avenir sportif de La Marsa': ('Avenir Sportif de La Marsa', 'AS Marsa'),
+}
+
+# Tables de buteurs : fichier source, colonnes logiques -> candidats, entiers (valeur par défaut), sortie
+TOPSCORER_SPECS = [
+    {
+        'name': 'D_TopScorers_AllTime',
+        'label': 'all-time top scorers',
+        'columns': {
+            'player_name': ['name', 'player_name'],
+            'goals': ['goals', 'goal_count'],
+            'team_name_raw': ['team', 'team_name'],
+            'id_team': ['id_team', 'team_id'],
+        },
+        'integers': {'goals': 0},
+        'id_column': 'id_topscorer',
+        'output': ['id_topscorer', 'id_player', 'id_team', 'goals'],
+    },
+    {
+        'name': 'D_TopScorers_By_Season',
+        'label': 'season top scorers',
+        'columns': {
+            'season': ['season', 'season_name'],
+            'season_id': ['season_id', 'id_season'],
+            'player_name': ['name', 'player_name'],
+            'goals': ['goals', 'goal_count'],
+            'team_name_raw': ['team', 'team_name'],
+            'id_team': ['id_team', 'team_id'],
+        },
+        'integers': {'goals': 0, 'season_id': -1},
+        'id_column': 'id_topscorer_season',
+        'output': ['id_topscorer_season', 'season_id', 'id_player', 'id_team', 'goals'],
+    },
+]
+
+
+def primary_team(raw):
+    """Équipe principale d'une colonne "Team (80), Team2 (3)" -> "Team" (vectorisé, None si vide)"""
+    s = raw.astype('string').str.strip().str.split(',', n=1).str[0].str.strip()
+    s = s.str.split('(', n=1).str[0].str.strip().where(s.str.contains(')', regex=False).fillna(False), s)
+    return s.mask(s == '')
+
+
+class ScorerTeamLookup:
+    """Résolution des noms d'équipes des fichiers de buteurs -> id_team.
+
+    Ordre : nom exact, `MANUAL_TEAM_MAP` (clés comparées sans accents ni casse),
+    nom sans préfixe pays ("Tunisia X" -> "X"), puis repli approché via
+    `TeamResolver` (accents/casse, inclusion). Chaque nom distinct n'est résolu qu'une fois.
+    """
+
+    def __init__(self, dteam):
+        self.team_map = dict(zip(dteam['team_name'], dteam['id_team']))
+        self.resolver = TeamResolver(dteam)
+        self.manual = {normalize_team_name(k): (v,) if isinstance(v, str) else v for k, v in MANUAL_TEAM_MAP.items()}
+
+    def resolve(self, team_str):
+        """`(id_team, approché)` ; id_team vaut -1 si non trouvé"""
+        mapped = self.manual.get(normalize_team_name(team_str), ())
+        prefixless = (team_str.split(' ', 1)[1],) if ' ' in team_str else ()
+        for key in (team_str,) + tuple(mapped) + prefixless:
+            if key in self.team_map:
+                return self.team_map[key], False
+        tid, _ = self.resolver.resolve(team_str)
+        return tid, tid != -1
+
+    def resolve_series(self, names):
+        """(ids, masque des lignes résolues par le repli approché) pour une Series de noms"""
+        codes, uniques = pd.factorize(names)
+        resolved = [self.resolve(str(u)) for u in uniques] + [(-1, False)]
+        ids = np.array([r[0] for r in resolved], dtype='int64')
+        fuzzy = np.array([r[1] for r in resolved], dtype=bool)
+        return ids[codes], fuzzy[codes]
+
+
+def read_scorer_table(path, spec, lookup):
+    """Lit une table de buteurs selon `spec` ; colonnes logiques + id_team résolu"""
+    df = pd.read_csv(path)
+    lower_map = {c.lower(): c for c in df.columns}
+    renames = {}
+    for logical, candidates in spec['columns'].items():
+        col_l = pick_col(list(lower_map.keys()), candidates)
+        if col_l:
+            renames[lower_map[col_l]] = logical
+    df = df.rename(columns=renames)
+
+    source_ids = pd.to_numeric(df['id_team'], errors='coerce') if 'id_team' in df.columns else pd.Series(np.nan, index=df.index)
+    if 'team_name_raw' in df.columns:
+        # id_team source s'il est valide, sinon résolution du nom de l'équipe principale
+        team = primary_team(df['team_name_raw'])
+        mapped, fuzzy = lookup.resolve_series(team)
+        mapped = np.where(team.isna().to_numpy(), -1, mapped)
+        valid = (source_ids > 0).to_numpy()
+        df['id_team'] = np.where(valid, source_ids.fillna(-1).to_numpy(), mapped).astype(int)
+        n_fuzzy = int((fuzzy & ~valid & team.notna().to_numpy()).sum())
+        if n_fuzzy:
+            print(f'  {spec["name"]}: {n_fuzzy} row(s) matched to a team by fuzzy fallback')
+        df = df.drop(columns=['team_name_raw'])
+    else:
+        df['id_team'] = source_ids.fillna(-1).astype(int)
+
+    for col, default in spec['integers'].items():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(default).astype(int)
+    df[spec['id_column']] = range(1, len(df) + 1)
+    return df
+
+
+def load_topscorers_dimensions(data_dir, dteam, dplayer=None, registry=None):
+    """Charge les tables de buteurs (`TOPSCORER_SPECS`) ; leurs joueurs sont ajoutés à D_Player.
+
+    Un buteur dont le nom existe déjà dans `dplayer` (effectifs) en reprend l'id.
+    Retourne `(D_TopScorers_AllTime, D_TopScorers_By_Season, D_Player)` ; None pour une table absente.
+    """
+    lookup = ScorerTeamLookup(dteam)
+    tables = {}
+    for spec in TOPSCORER_SPECS:
+        path = data_dir / f'{spec["name"]}.csv'
+        if not path.exists():
+            continue
         try:
-            dtopscore_all = pd.read_csv(alltimefile)
-            # normalize columns
-            lower_map = {c.lower(): c for c in dtopscore_all.columns}
-            name_col_l = pick_col(list(lower_map.keys()), ['name', 'player_name'])
-            goals_col_l = pick_col(list(lower_map.keys()), ['goals', 'goal_count'])
-            team_col_l = pick_col(list(lower_map.keys()), ['team', 'team_name'])
-            id_team_col_l = pick_col(list(lower_map.keys()), ['id_team', 'team_id'])
-            
-            renames = {}
-            if name_col_l and name_col_l in lower_map:
-                renames[lower_map[name_col_l]] = 'player_name'
-            if goals_col_l and goals_col_l in lower_map:
-                renames[lower_map[goals_col_l]] = 'goals'
-            if team_col_l and team_col_l in lower_map:
-                renames[lower_map[team_col_l]] = 'team_name_raw'
-            if id_team_col_l and id_team_col_l in lower_map:
-                renames[lower_map[id_team_col_l]] = 'id_team'
-            
-            dtopscore_all = dtopscore_all.rename(columns=renames)
-            
-            # Build team map for mapping
-            team_map = dict(zip(dteam['team_name'], dteam['id_team']))
-            
-            # Clean team names: extract primary team name (first one in format "Team1 (x), Team2 (y)")
-            if 'team_name_raw' in dtopscore_all.columns:
-                def extract_primary_team(team_str):
-                    if pd.isna(team_str) or str(team_str).strip() == '':
-                        return None
-                    team_str = str(team_str).strip()
-                    # if contains comma, take first part
-                    if ',' in team_str:
-                        team_str = team_str.split(',')[0].strip()
-                    # if contains parenthesis, remove goals count (e.g. "Team (80)" -> "Team")
-                    if '(' in team_str and ')' in team_str:
-                        team_str = team_str[:team_str.index('(')].strip()
-                    return team_str if team_str else None
-                
-                dtopscore_all['team_name_cleaned'] = dtopscore_all['team_name_raw'].apply(extract_primary_team)
-                # Use source id_team if valid, otherwise use mapped id
-                def map_id_with_source(row):
-                    # If source has a valid id_team, use it
-                    if pd.notna(row['id_team']) and row['id_team'] > 0:
-                        return int(row['id_team'])
-                    # Otherwise, map from team name
-                    if pd.notna(row['team_name_cleaned']):
-                        return find_team_id(row['team_name_cleaned'], team_map, dteam)
-                    return -1
-                
-                dtopscore_all['id_team'] = dtopscore_all.apply(map_id_with_source, axis=1)
-                dtopscore_all = dtopscore_all.drop(columns=['team_name_raw', 'team_name_cleaned'])
-            else:
-                # ensure id_team exists and is int
-                if 'id_team' not in dtopscore_all.columns:
-                    dtopscore_all['id_team'] = -1
-                dtopscore_all['id_team'] = dtopscore_all['id_team'].fillna(-1).astype(int)
-            
-            # convert goals to int
-            if 'goals' in dtopscore_all.columns:
-                dtopscore_all['goals'] = pd.to_numeric(dtopscore_all['goals'], errors='coerce').fillna(0).astype(int)
-            
-            # create id_topscorer
-            dtopscore_all['id_topscorer'] = range(1, len(dtopscore_all) + 1)
-            dtopscore_all = dtopscore_all[['id_topscorer', 'player_name', 'id_team', 'goals']].drop_duplicates()
-            print(f'Loaded {len(dtopscore_all)} all-time top scorers')
+            tables[spec['name']] = read_scorer_table(path, spec, lookup)
         except Exception as e:
-            print(f'Failed to load D_TopScorers_AllTime: {e}')
-    
-    # D_TopScorers_By_Season
-    dtopscore_season = None
-    seasonfile = data_dir / 'D_TopScorers_By_Season.csv'
-    if seasonfile.exists():
-        try:
-            dtopscore_season = pd.read_csv(seasonfile)
-            # normalize columns
-            lower_map = {c.lower(): c for c in dtopscore_season.columns}
-            season_col_l = pick_col(list(lower_map.keys()), ['season', 'season_name'])
-            seasonid_col_l = pick_col(list(lower_map.keys()), ['season_id', 'id_season'])
-            name_col_l = pick_col(list(lower_map.keys()), ['name', 'player_name'])
-            goals_col_l = pick_col(list(lower_map.keys()), ['goals', 'goal_count'])
-            team_col_l = pick_col(list(lower_map.keys()), ['team', 'team_name'])
-            id_team_col_l = pick_col(list(lower_map.keys()), ['id_team', 'team_id'])
-            
-            renames = {}
-            if season_col_l and season_col_l in lower_map:
-                renames[lower_map[season_col_l]] = 'season'
-            if seasonid_col_l and seasonid_col_l in lower_map:
-                renames[lower_map[seasonid_col_l]] = 'season_id'
-            if name_col_l and name_col_l in lower_map:
-                renames[lower_map[name_col_l]] = 'player_name'
-            if goals_col_l and goals_col_l in lower_map:
-                renames[lower_map[goals_col_l]] = 'goals'
-            if team_col_l and team_col_l in lower_map:
-                renames[lower_map[team_col_l]] = 'team_name_raw'
-            if id_team_col_l and id_team_col_l in lower_map:
-                renames[lower_map[id_team_col_l]] = 'id_team'
-            
-            dtopscore_season = dtopscore_season.rename(columns=renames)
-            
-            # Build team map for mapping
-            team_map = dict(zip(dteam['team_name'], dteam['id_team']))
-            
-            # Clean team names: extract primary team name
-            if 'team_name_raw' in dtopscore_season.columns:
-                def extract_primary_team(team_str):
-                    if pd.isna(team_str) or str(team_str).strip() == '':
-                        return None
-                    team_str = str(team_str).strip()
-                    # if contains comma, take first part
-                    if ',' in team_str:
-                        team_str = team_str.split(',')[0].strip()
-                    # if contains parenthesis, remove goals count
-                    if '(' in team_str and ')' in team_str:
-                        team_str = team_str[:team_str.index('(')].strip()
-                    return team_str if team_str else None
-                
-                dtopscore_season['team_name_cleaned'] = dtopscore_season['team_name_raw'].apply(extract_primary_team)
-                # Use source id_team if valid, otherwise use mapped id
-                def map_id_with_source(row):
-                    # If source has a valid id_team, use it
-                    if pd.notna(row['id_team']) and row['id_team'] > 0:
-                        return int(row['id_team'])
-                    # Otherwise, map from team name
-                    if pd.notna(row['team_name_cleaned']):
-                        return find_team_id(row['team_name_cleaned'], team_map, dteam)
-                    return -1
-                
-                dtopscore_season['id_team'] = dtopscore_season.apply(map_id_with_source, axis=1)
-                dtopscore_season = dtopscore_season.drop(columns=['team_name_raw', 'team_name_cleaned'])
-            else:
-                # ensure id_team exists and is int
-                if 'id_team' not in dtopscore_season.columns:
-                    dtopscore_season['id_team'] = -1
-                dtopscore_season['id_team'] = dtopscore_season['id_team'].fillna(-1).astype(int)
-            
-            # convert goals to int
-            if 'goals' in dtopscore_season.columns:
-                dtopscore_season['goals'] = pd.to_numeric(dtopscore_season['goals'], errors='coerce').fillna(0).astype(int)
-            
-            # ensure season_id is int
-            if 'season_id' in dtopscore_season.columns:
-                dtopscore_season['season_id'] = pd.to_numeric(dtopscore_season['season_id'], errors='coerce').fillna(-1).astype(int)
-            
-            # create id_topscorer_season
-            dtopscore_season['id_topscorer_season'] = range(1, len(dtopscore_season) + 1)
-            dtopscore_season = dtopscore_season[['id_topscorer_season', 'season_id', 'player_name', 'id_team', 'goals']].drop_duplicates()
-            print(f'Loaded {len(dtopscore_season)} season top scorers')
-        except Exception as e:
-            print(f'Failed to load D_TopScorers_By_Season: {e}')
-    
-    return dtopscore_all, dtopscore_season
+            print(f'Failed to load {spec["name"]}: {e}')
 
+    if not tables:
+        return None, None, dplayer
+
+    results = []
+    for spec in TOPSCORER_SPECS:
+        df = tables.get(spec['name'])
+        if df is not None:
+            names = df['player_name'] if 'player_name' in df.columns else pd.Series(pd.NA, index=df.index)
+            dplayer, ids = add_players_by_name(dplayer, names, registry=registry)
+            df['id_player'] = ids.to_numpy()
+            df = df[spec['output']].drop_duplicates()
+            print(f'Loaded {len(df)} {spec["label"]}')
+        results.append(df)
+    return results[0], results[1], dplayer
+
+
+def seasons_for_start_years(dseason, years, registry=None):
+    """(D_Season complétée, season_id de chaque année de début) ; les saisons absentes sont ajoutées"""
+    def by_start(df):
+        # saison complète (2019-20) de préférence à une saison à une seule année (2019)
+        full = (df['end_year'] == df['start_year'] + 1).fillna(False)
+        ordered = pd.concat([df[full], df[~full]])
+        ordered = ordered[ordered['start_year'].notna()].drop_duplicates(subset=['start_year'])
+        return pd.Series(ordered['season_id'].to_numpy(), index=ordered['start_year'].astype('int64').to_numpy())
+
+    known = by_start(dseason)
+    missing = sorted(int(y) for y in pd.unique(years.dropna()) if int(y) not in known.index)
+    if missing:
+        n = len(dseason)
+        dseason = add_season_years(_append_members(dseason, [f'{y}-{str(y + 1)[2:]}' for y in missing], 'season', 'season_id'))
+        if registry is not None and len(dseason) > n:
+            new = dseason.iloc[n:]
+            dseason.loc[new.index, 'season_id'] = registry.assign('D_Season', new['season'], preferred_ids=new['season_id'])
+        print(f'  {len(dseason) - n} season(s) added to D_Season')
+        known = by_start(dseason)
+    return dseason, years.map(known).fillna(-1).astype('int64').to_numpy()
+
+
+def load_rosters(data_dir, dteam, dseason, registry=None):
+    """Stage effectifs : `(D_Season, D_Player, D_Position, F_Team_Player_Season)` depuis `ROSTER_GLOB`
+
+    Les équipes sont résolues contre D_Team (`ScorerTeamLookup`), les saisons par
+    année de début (ajoutées à D_Season si absentes). Tables None sans fichier d'effectifs.
+    """
+    paths = sorted(data_dir.glob(ROSTER_GLOB))
+    if not paths:
+        return dseason, None, None, None
+    roster = read_rosters(paths)
+    team_ids, fuzzy = ScorerTeamLookup(dteam).resolve_series(roster['team'])
+    dseason, season_ids = seasons_for_start_years(dseason, roster['start_year'], registry=registry)
+    dplayer, dposition, froster = build_roster_tables(roster, team_ids, season_ids, registry=registry)
+    unresolved = int((team_ids == -1).sum())
+    print(f'Loaded {len(roster)} roster rows: {len(dplayer)} players, {len(dposition)} positions, '
+          f'{len(froster)} team-player-season rows')
+    if fuzzy.any() or unresolved:
+        print(f'  teams: {int(fuzzy.sum())} row(s) by fuzzy fallback, {unresolved} row(s) unresolved (skipped)')
+    skipped = int(((team_ids == -1) | (season_ids == -1)).sum())
+    if len(roster) - skipped > len(froster):
+        print(f'  {len(roster) - skipped - len(froster)} duplicate team-player-season row(s) merged')
+    return dseason, dplayer, dposition, froster
+
+
+def load_champions(data_dir, dteam, dcomp, dseason, registry=None):
+    """Stage palmarès : `(D_Team, D_Competition, D_Season, F_Champions)` depuis data/champions.
+
+    Les saisons sont rapprochées de D_Season par année de début, les compétitions
+    par nom de fichier ; les équipes passent par `ScorerTeamLookup` et les clubs
+    historiques absents sont ajoutés à D_Team. F_Champions vaut None sans fichier.
+    """
+    paths = sorted((data_dir / 'champions').glob(CHAMPIONS_GLOB))
+    champ = read_champions(paths)
+    if champ is None:
+        return dteam, dcomp, dseason, None
+
+    if not (data_dir / 'D_Competition.csv').exists():
+        dcomp = _append_members(dcomp, champ['competition'], 'competition', 'id_competition')
+    comp_ids = champ['competition'].map(dict(zip(dcomp['competition'], dcomp['id_competition']))).fillna(-1).astype('int64')
+    dseason, season_ids = seasons_for_start_years(dseason, champ['start_year'], registry=registry)
+
+    labels = team_labels(pd.concat([champ['winner'], champ['runnerup']]))
+    lookup = ScorerTeamLookup(dteam)
+    team_ids = {}
+    fuzzy = 0
+    for raw, label in labels.items():
+        team_ids[raw], approx = lookup.resolve(label)
+        fuzzy += approx
+    # clubs absents : un seul ajout par nom normalisé ('Stade Gaulois' / 'Stade gaulois')
+    canonical = {}
+    for label in sorted(labels[raw] for raw, tid in team_ids.items() if tid == -1):
+        canonical.setdefault(normalize_team_name(label), label)
+    missing = set(canonical.values())
+    if missing:
+        dteam, new_rows = append_teams(dteam, missing, registry=registry)
+        added = {normalize_team_name(row['team_name']): row['id_team'] for row in new_rows}
+        team_ids.update({raw: added[normalize_team_name(labels[raw])] for raw, tid in team_ids.items() if tid == -1})
+
+    fchamp = pd.DataFrame({
+        'season_id': season_ids,
+        'competition_id': comp_ids.to_numpy(),
+        'winner_id': champ['winner'].map(team_ids).astype('Int64').array,
+        'runnerup_id': champ['runnerup'].map(team_ids).astype('Int64').array,
+        'goal_winner': champ['goal_winner'].array,
+        'goal_runnerup': champ['goal_runnerup'].array,
+    })
+    valid = (fchamp['season_id'] != -1) & (fchamp['competition_id'] != -1)
+    fchamp = fchamp[valid].drop_duplicates(subset=['season_id', 'competition_id'], keep='first').reset_index(drop=True)
+    print(f'Loaded {len(fchamp)} champions rows from {len(paths)} file(s): {len(labels)} team names, '
+          f'{fuzzy} by fuzzy fallback, {len(missing)} historical team(s) added to D_Team')
+    if int(valid.sum()) > len(fchamp):
+        print(f'  {int(valid.sum()) - len(fchamp)} duplicate season/competition row(s) skipped')
+    return dteam, dcomp, dseason, fchamp
+
+
+# Barèmes de points (victoire, nul, défaite)
+POINTS_3_1_0 = (3, 1, 0)
+POINTS_2_1_0 = (2, 1, 0)  # ancien barème (deux points pour une victoire)
+
+
+def _side_points(goals_for, goals_against, scheme):
+    """Points d'un côté du match ; 0 si un des scores manque"""
+    win, draw, loss = scheme
+    both = goals_for.notna() & goals_against.notna()
+    pts = np.where(goals_for > goals_against, win, np.where(goals_for == goals_against, draw, loss))
+    return np.where(both, pts, 0)
+
+
+def two_point_seasons(dseason, before_year):
+    """season_points {season_id: POINTS_2_1_0} pour les saisons commençant avant `before_year`"""
+    start_year = pd.to_numeric(dseason['season'].astype(str).str[:4], errors='coerce')
+    old = dseason.loc[start_year < before_year, 'season_id']
+    return {sid: POINTS_2_1_0 for sid in old}
+
+
+def build_team_season_agg(fmatch, points_scheme=POINTS_3_1_0, season_points=None):
+    """Generate F_Team_Season aggregated table with stats per team/season
+
+    `points_scheme` est le barème (victoire, nul, défaite) par défaut ;
+    `season_points` permet de le surcharger par season_id (ex: saisons à 2 points).
+    Seuls les matches joués sont comptés (`played_mask`, règle partagée avec F_Team_Cube).
+    """
+    fm = fmatch[played_mask(fmatch)]
+    home_goals = fm['result_home']
+    away_goals = fm['result_away']
+    both = home_goals.notna() & away_goals.notna()
+
+    if season_points:
+        season_scheme = fm['season_id'].map(lambda sid: season_points.get(sid, points_scheme))
+        scheme = tuple(season_scheme.str[i].to_numpy() for i in range(3))
+    else:
+        scheme = points_scheme
+
+    def perspective(team_col, goals_for, goals_against, side, other):
+        valid = fm[team_col].notna() & (fm[team_col] != -1)
+        zero = np.zeros(len(fm), dtype='int64')
+        sides = {
+            'season_id': fm['season_id'],
+            'id_team': fm[team_col],
+            f'matches_{side}': np.ones(len(fm), dtype='int64'),
+            f'matches_{other}': zero,
+            f'goals_for_{side}': goals_for.fillna(0),
+            f'goals_for_{other}': zero,
+            f'goals_against_{side}': goals_against.fillna(0),
+            f'goals_against_{other}': zero,
+            f'points_{side}': _side_points(goals_for, goals_against, scheme),
+            f'points_{other}': zero,
+            f'wins_{side}': (both & (goals_for > goals_against)).astype('int64'),
+            f'wins_{other}': zero,
+            f'draws_{side}': (both & (goals_for == goals_against)).astype('int64'),
+            f'draws_{other}': zero,
+            f'losses_{side}': (both & (goals_for < goals_against)).astype('int64'),
+            f'losses_{other}': zero,
+        }
+        return pd.DataFrame(sides, index=fm.index)[valid]
+
+    df_records = pd.concat([
+        perspective('id_home_team', home_goals, away_goals, 'home', 'away'),
+        perspective('id_away_team', away_goals, home_goals, 'away', 'home'),
+    ], ignore_index=True)
+    df_records['season_id'] = df_records['season_id'].astype(int)
+    df_records['id_team'] = df_records['id_team'].astype(int)
 
-def build_team_season_agg(fmatch):
-    """Generate F_Team_Season aggregated table with stats per team/season"""
-    
-    records = []
-    
-    for _, row in fmatch.iterrows():
-        season_id = row['season_id']
-        
-        # Skip if no valid season
-        if pd.isna(season_id) or season_id == -1:
-            continue
-        
-        home_team_id = row['id_home_team']
-        home_goals = row['result_home']
-        away_goals = row['result_away']
-        
-        # HOME TEAM STATS
-        if not pd.isna(home_team_id) and home_team_id != -1:
-            if pd.isna(home_goals) or pd.isna(away_goals):
-                home_points = 0
-            else:
-                home_goals_int = int(home_goals)
-                away_goals_int = int(away_goals)
-                if home_goals_int > away_goals_int:
-                    home_points = 3
-                elif home_goals_int == away_goals_int:
-                    home_points = 1
-                else:
-                    home_points = 0
-            
-            records.append({
-                'season_id': int(season_id),
-                'id_team': int(home_team_id),
-                'matches_home': 1,
-                'matches_away': 0,
-                'goals_for_home': int(home_goals) if not pd.isna(home_goals) else 0,
-                'goals_for_away': 0,
-                'goals_against_home': int(away_goals) if not pd.isna(away_goals) else 0,
-                'goals_against_away': 0,
-                'points_home': home_points,
-                'points_away': 0,
-                'wins_home': 1 if (not pd.isna(home_goals) and not pd.isna(away_goals) and int(home_goals) > int(away_goals)) else 0,
-                'wins_away': 0,
-                'draws_home': 1 if (not pd.isna(home_goals) and not pd.isna(away_goals) and int(home_goals) == int(away_goals)) else 0,
-                'draws_away': 0,
-                'losses_home': 1 if (not pd.isna(home_goals) and not pd.isna(away_goals) and int(home_goals) < int(away_goals)) else 0,
-                'losses_away': 0,
-            })
-        
-        # AWAY TEAM STATS
-        away_team_id = row['id_away_team']
-        if not pd.isna(away_team_id) and away_team_id != -1:
-            if pd.isna(home_goals) or pd.isna(away_goals):
-                away_points = 0
-            else:
-                home_goals_int = int(home_goals)
-                away_goals_int = int(away_goals)
-                if away_goals_int > home_goals_int:
-                    away_points = 3
-                elif away_goals_int == home_goals_int:
-                    away_points = 1
-                else:
-                    away_points = 0
-            
-            records.append({
-                'season_id': int(season_id),
-                'id_team': int(away_team_id),
-                'matches_home': 0,
-                'matches_away': 1,
-                'goals_for_home': 0,
-                'goals_for_away': int(away_goals) if not pd.isna(away_goals) else 0,
-                'goals_against_home': 0,
-                'goals_against_away': int(home_goals) if not pd.isna(home_goals) else 0,
-                'points_home': 0,
-                'points_away': away_points,
-                'wins_home': 0,
-                'wins_away': 1 if (not pd.isna(home_goals) and not pd.isna(away_goals) and int(away_goals) > int(home_goals)) else 0,
-                'draws_home': 0,
-                'draws_away': 1 if (not pd.isna(home_goals) and not pd.isna(away_goals) and int(away_goals) == int(home_goals)) else 0,
-                'losses_home': 0,
-                'losses_away': 1 if (not pd.isna(home_goals) and not pd.isna(away_goals) and int(away_goals) < int(home_goals)) else 0,
-            })
-    
-    df_records = pd.DataFrame(records)
-    
     # Aggregate by season_id + id_team
-    agg_dict = {
-        'matches_home': 'sum',
-        'matches_away': 'sum',
-        'goals_for_home': 'sum',
-        'goals_for_away': 'sum',
-        'goals_against_home': 'sum',
-        'goals_against_away': 'sum',
-        'points_home': 'sum',
-        'points_away': 'sum',
-        'wins_home': 'sum',
-        'wins_away': 'sum',
-        'draws_home': 'sum',
-        'draws_away': 'sum',
-        'losses_home': 'sum',
-        'losses_away': 'sum',
-    }
-    
-    f_team_season = df_records.groupby(['season_id', 'id_team'], as_index=False).agg(agg_dict)
+    stat_cols = [
+        'matches_home', 'matches_away',
+        'goals_for_home', 'goals_for_away',
+        'goals_against_home', 'goals_against_away',
+        'points_home', 'points_away',
+        'wins_home', 'wins_away',
+        'draws_home', 'draws_away',
+        'losses_home', 'losses_away',
+    ]
+    f_team_season = df_records.groupby(['season_id', 'id_team'], as_index=False)[stat_cols].sum()
     
     # Compute totals and averages
     f_team_season['matches_total'] = f_team_season['matches_home'] + f_team_season['matches_away']
@@ -751,74 +1248,516 @@ def build_team_season_agg(fmatch):
     return f_team_season
 
 
-def main():
-    print('Scanning matches...')
-    files = glob.glob(MATCHES_GLOB, recursive=True)
-    print(f'Found {len(files)} match files')
-    dfs = []
+# tables de faits écrites en datasets Parquet partitionnés (colonnes de partition)
+PARQUET_PARTITIONS = {
+    'F_Match': ['id_competition', 'season_id'],
+    'F_Team_Season': ['season_id'],
+    'F_Standings_Round': ['season_id'],
+}
+
+
+def write_parquet(df, path, partition_cols=None):
+    """Écrit `df` en Parquet (snappy) ; dataset partitionné si `partition_cols`"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise RuntimeError("pyarrow est requis pour --format parquet (pip install pyarrow)")
+    if partition_cols:
+        # un dataset partitionné n'est pas écrasé par to_parquet : on repart d'un dossier vide
+        if path.exists():
+            shutil.rmtree(path)
+        df.to_parquet(path, engine='pyarrow', compression='snappy', index=False, partition_cols=partition_cols)
+    else:
+        df.to_parquet(path, engine='pyarrow', compression='snappy', index=False)
+
+
+def write_outputs(outputs, output_dir, skip=(), fmt='csv'):
+    """Écrit les tables `{nom_fichier: DataFrame}` ; les tables None ou listées dans `skip` sont ignorées
+
+    `fmt` vaut 'csv', 'parquet' ou 'both'.
+    """
+    skip = {name.lower() for name in skip}
+    for name, df in outputs.items():
+        if df is None:
+            continue
+        if name.lower() in skip or name.lower().replace('_clean', '') in skip:
+            print(f'  skipping {name}')
+            continue
+        if fmt in ('csv', 'both'):
+            df.to_csv(output_dir / f'{name}.csv', index=False)
+        if fmt in ('parquet', 'both'):
+            write_parquet(df, output_dir / f'{name}.parquet', PARQUET_PARTITIONS.get(name))
+
+
+def build_arg_parser():
+    ap = argparse.ArgumentParser(description='ETL Data Warehouse football tunisien')
+    ap.add_argument('--workers', type=int, default=1,
+                    help='Nombre de processus pour lire les fichiers de matches (défaut: 1, séquentiel)')
+    ap.add_argument('--chunksize', type=int, default=None, metavar='ROWS',
+                    help='Lire les fichiers de matches par blocs de ROWS lignes (mémoire bornée pour les gros fichiers)')
+    ap.add_argument('--column-map-cache', default=None, metavar='PATH',
+                    help='Fichier JSON de correspondances de colonnes par en-tête, relu et mis à jour à chaque run')
+    ap.add_argument('--column-report', action='store_true',
+                    help='Afficher quelle heuristique a retenu chaque colonne, par en-tête de fichier')
+    ap.add_argument('--calendar', action='store_true',
+                    help='D_Date en calendrier continu : ajoute les jours sans match entre la première et la dernière date')
+    ap.add_argument('--points-scheme', choices=['3-1-0', '2-1-0'], default='3-1-0',
+                    help='Barème victoire-nul-défaite pour F_Team_Season (défaut: 3-1-0)')
+    ap.add_argument('--format', choices=['csv', 'parquet', 'both'], default='csv',
+                    help='Format des sorties (parquet: typé, compressé, faits partitionnés ; requiert pyarrow)')
+    ap.add_argument('--skip-output', action='append', default=[], metavar='TABLE',
+                    help="Ne pas écrire cette sortie (ex: F_Match), option répétable")
+    ap.add_argument('--incremental', action='store_true',
+                    help='Ne relire que les fichiers de matches nouveaux/modifiés depuis le dernier run (manifest)')
+    ap.add_argument('--key-registry', default=None, metavar='PATH',
+                    help='Registre SQLite des clés de substitution stables (défaut: warehouse_output/_keys.sqlite)')
+    ap.add_argument('--no-key-registry', action='store_true',
+                    help='Régénérer les ids des dimensions à chaque run (ancien comportement)')
+    ap.add_argument('--load', default=None, metavar='TARGET',
+                    help='Charger les tables dans une base après l\'ETL (sqlite:fichier.db, mssql[:chaîne ODBC], postgresql://...)')
+    ap.add_argument('--two-points-before', type=int, default=None, metavar='YEAR',
+                    help='Utiliser 2-1-0 pour les saisons commençant avant YEAR')
+    ap.add_argument('--standings-competition', action='append', default=None, metavar='NAME',
+                    help='Compétition classée par journée dans F_Standings_Round (défaut: ligue_1), option répétable')
+    ap.add_argument('--tie-breakers', type=parse_tie_breakers, default=DEFAULT_TIE_BREAKERS, metavar='KEYS',
+                    help="Critères de départage du classement, dans l'ordre (défaut: points,goal_diff,goals_for)")
+    ap.add_argument('--elo-k', type=float, default=ELO_DEFAULTS['k'], metavar='K',
+                    help=f"Facteur K du classement Elo F_Team_Rating (défaut: {ELO_DEFAULTS['k']:g})")
+    ap.add_argument('--elo-home-advantage', type=float, default=ELO_DEFAULTS['home_advantage'], metavar='POINTS',
+                    help=f"Avantage du terrain en points Elo (défaut: {ELO_DEFAULTS['home_advantage']:g})")
+    return ap
+
+
+# ---------------------------------------------------------------------------
+# Mode incrémental : manifest des fichiers sources + fusion dans les sorties
+# ---------------------------------------------------------------------------
+
+MANIFEST_FILE = '_manifest.json'
+
+
+def _source_key(path):
+    """Clé du manifest : chemin relatif à la racine du projet, séparateurs '/'"""
+    try:
+        return Path(path).resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return Path(path).resolve().as_posix()
+
+
+def file_fingerprint(path, with_hash=True):
+    st = os.stat(path)
+    fp = {'size': st.st_size, 'mtime': st.st_mtime}
+    if with_hash:
+        h = hashlib.sha256()
+        with open(path, 'rb') as fh:
+            for block in iter(lambda: fh.read(1 << 20), b''):
+                h.update(block)
+        fp['sha256'] = h.hexdigest()
+    return fp
+
+
+def build_manifest(files, matches):
+    """Manifest {clé_source: empreinte + id_match produits} pour les fichiers lus"""
+    ids_by_file = matches.groupby('source_file', sort=False, observed=True)['id_match'].agg(lambda s: s.astype(str).tolist())
+    manifest = {}
     for p in sorted(files):
-        try:
-            dfm = read_match_file(p)
-            # parse dates
-            dfm['date_parsed'] = dfm['date_raw'].apply(parse_date_safe)
-            dfs.append(dfm)
-        except Exception as e:
-            print('Failed reading', p, e)
-    if len(dfs)==0:
-        print('No match data found. Exiting.')
+        entry = file_fingerprint(p)
+        entry['match_ids'] = ids_by_file.get(p, [])
+        manifest[_source_key(p)] = entry
+    return manifest
+
+
+def load_manifest(output_dir):
+    path = output_dir / MANIFEST_FILE
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def save_manifest(output_dir, manifest):
+    with open(output_dir / MANIFEST_FILE, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh)
+
+
+def read_output(output_dir, name):
+    """Relit une sortie d'un run précédent (CSV, sinon Parquet) ; None si absente"""
+    csv_path = output_dir / f'{name}.csv'
+    parquet_path = output_dir / f'{name}.parquet'
+    if csv_path.exists():
+        return pd.read_csv(csv_path, dtype={'id_match': str})
+    if parquet_path.exists():
+        df = pd.read_parquet(parquet_path)
+        for c in PARQUET_PARTITIONS.get(name, []):
+            df[c] = df[c].astype('int64')
+        return df
+    return None
+
+
+def read_previous_outputs(output_dir):
+    """Dimensions et faits du run précédent, ou None s'il en manque un"""
+    names = ['D_Team_clean', 'D_Competition_clean', 'D_Season_clean', 'D_Stadium_clean', 'D_Date', 'F_Match', 'F_Team_Season']
+    previous = {}
+    for name in names:
+        df = read_output(output_dir, name)
+        if df is None:
+            return None
+        previous[name] = df
+    previous['D_Team_clean']['stadium_id'] = previous['D_Team_clean']['stadium_id'].astype('Int64')
+    previous['D_Date']['date'] = pd.to_datetime(previous['D_Date']['date'])
+    previous['F_Match'] = previous['F_Match'][list(F_MATCH_DTYPES)].astype(F_MATCH_DTYPES)
+    return previous
+
+
+def _append_members(dim, values, name_col, id_col):
+    """Ajoute à `dim` les valeurs absentes de `name_col` avec des ids à la suite"""
+    new = [v for v in pd.unique(pd.Series(values).dropna()) if v not in set(dim[name_col])]
+    if not new:
+        return dim
+    start = int(dim[id_col].max()) + 1 if len(dim) else 1
+    rows = pd.DataFrame({name_col: new, id_col: range(start, start + len(new))})
+    return pd.concat([dim, rows], ignore_index=True)
+
+
+def extend_dimensions(matches_df, data_dir, dcomp, dseason, dstad, ddate, calendar=False):
+    """Complète les dimensions existantes avec les membres des nouveaux matches.
+
+    Les ids existants sont conservés ; seules les dimensions que le run complet
+    dérive des matches (pas de fichier source dans `data_dir`) sont étendues.
+    Les nouvelles équipes sont ajoutées par `build_fact`.
+    """
+    if not (data_dir / 'D_Competition.csv').exists():
+        dcomp = _append_members(dcomp, matches_df['competition'], 'competition', 'id_competition')
+    if not (data_dir / 'D_Season.csv').exists():
+        dseason = add_season_years(_append_members(dseason, matches_df['season'], 'season', 'season_id'))
+    if not (data_dir / 'D_Stadium.csv').exists():
+        dstad = _append_members(dstad, matches_df['venue'], 'stadium_name', 'id_stadium')
+
+    dates = pd.DatetimeIndex(matches_df['date_parsed'].dropna().unique())
+    dates = dates[~dates.isin(ddate['date'])]
+    fill = calendar_days(dates.append(pd.DatetimeIndex(ddate['date'])), known=ddate['date']) if calendar else None
+    if len(dates) or (fill is not None and len(fill)):
+        start = int(ddate['id_date'].max()) + 1 if len(ddate) else 1
+        ddate = pd.concat([ddate, build_date_dimension(dates, start_id=start, fill_days=fill)], ignore_index=True)
+    return dcomp, dseason, dstad, ddate
+
+
+def _team_season_keys(fmatch):
+    """Couples (season_id, id_team) touchés par les lignes de `fmatch`"""
+    return set(zip(fmatch['season_id'], fmatch['id_home_team'])) | set(zip(fmatch['season_id'], fmatch['id_away_team']))
+
+
+def update_team_season_agg(f_team_season, fmatch, affected, **points):
+    """Recalcule uniquement les groupes (season_id, id_team) de `affected` dans F_Team_Season"""
+    affected = pd.MultiIndex.from_tuples(sorted(affected), names=['season_id', 'id_team'])
+    home = pd.MultiIndex.from_arrays([fmatch['season_id'], fmatch['id_home_team']])
+    away = pd.MultiIndex.from_arrays([fmatch['season_id'], fmatch['id_away_team']])
+    part = build_team_season_agg(fmatch[home.isin(affected) | away.isin(affected)], **points)
+    part = part[pd.MultiIndex.from_frame(part[['season_id', 'id_team']]).isin(affected)]
+    keep = f_team_season[~pd.MultiIndex.from_frame(f_team_season[['season_id', 'id_team']]).isin(affected)]
+    merged = pd.concat([keep, part], ignore_index=True)[part.columns]
+    return merged.sort_values(['season_id', 'id_team']).reset_index(drop=True)
+
+
+def run_incremental(args, files, manifest, previous):
+    """Relit seulement les fichiers nouveaux/modifiés et fusionne dans les sorties existantes"""
+    current = {_source_key(p): p for p in files}
+    changed = []
+    for key, p in sorted(current.items()):
+        entry = manifest.get(key)
+        fp = file_fingerprint(p, with_hash=False)
+        if entry and entry['size'] == fp['size'] and entry['mtime'] == fp['mtime']:
+            continue
+        fp = file_fingerprint(p)
+        if entry and entry['sha256'] == fp['sha256']:
+            entry['mtime'] = fp['mtime']  # simple touch : contenu identique
+            continue
+        changed.append(p)
+    removed = [key for key in manifest if key not in current]
+    print(f'Incremental: {len(changed)} new/changed file(s), {len(removed)} removed')
+    if not changed and not removed:
+        save_manifest(OUTPUT_DIR, manifest)
+        print('Nothing to do. Outputs are up to date.')
         return
-    matches = pd.concat(dfs, ignore_index=True)
 
-    # build dimensions
-    print('Building dimensions...')
-    dteam, dcomp, dseason, dstad, ddate = build_dimensions(matches, DATA_DIR)
+    stale_ids = set()
+    for key in removed + [_source_key(p) for p in changed]:
+        stale_ids.update(manifest.get(key, {}).get('match_ids', []))
+
+    if args.column_map_cache:
+        COLUMN_MAPS.load(args.column_map_cache)
+    dfs = load_matches(changed, workers=args.workers, chunksize=args.chunksize)
+    report_column_maps(args)
+    dims = (previous['D_Team_clean'], previous['D_Competition_clean'], previous['D_Season_clean'],
+            previous['D_Stadium_clean'], previous['D_Date'])
+    matches = concat_matches(dfs) if dfs else None
+    if matches is not None:
+        dims = (dims[0],) + extend_dimensions(matches, DATA_DIR, *dims[1:], calendar=args.calendar)
+
+    # manifest à jour avant la fusion : il donne l'ordre des lignes d'un run complet
+    for key in removed:
+        del manifest[key]
+    if matches is not None:
+        manifest.update(build_manifest(changed, matches))
+    run_pipeline(args, matches, dims, manifest, previous=previous, stale_ids=stale_ids)
+
+
+def merge_fact(fmatch_old, fmatch_new, stale_ids, manifest):
+    """(F_Match fusionné, lignes remplacées) : les lignes de `stale_ids` et celles relues
+    sont remplacées par `fmatch_new`, dans l'ordre d'un run complet (ordre trié des fichiers)"""
+    stale_ids = set(stale_ids) | set(fmatch_new['id_match'])
+    dropped = fmatch_old[fmatch_old['id_match'].isin(stale_ids)]
+    fmatch = pd.concat([fmatch_old[~fmatch_old['id_match'].isin(stale_ids)], fmatch_new], ignore_index=True)
+    order = {}
+    for key in sorted(manifest):
+        for mid in manifest[key].get('match_ids', []):
+            order.setdefault(mid, len(order))
+    fmatch = fmatch.iloc[fmatch['id_match'].map(order).fillna(len(order)).argsort(kind='stable')].reset_index(drop=True)
+    return fmatch.astype(F_MATCH_DTYPES), dropped
+
+
+def run_pipeline(args, matches, dims, manifest, previous=None, stale_ids=()):
+    """Étapes communes au run complet et au run incrémental, une fois les matches lus :
+    clés stables -> effectifs et buteurs -> F_Match -> palmarès -> agrégats -> écriture.
 
+    `dims` = (dteam, dcomp, dseason, dstad, ddate) ; `matches` est None si aucun fichier
+    n'a été relu. En incrémental, `previous` (sorties du run précédent) et `stale_ids`
+    (id_match à remplacer) servent à fusionner F_Match et à ne recalculer que le nécessaire.
+    """
+    dteam, dcomp, dseason, dstad, ddate = dims
+    registry = open_key_registry(args)
+    if registry is not None:
+        dteam, dcomp, dseason, dstad, ddate = apply_key_registry(registry, dteam, dcomp, dseason, dstad, ddate)
+
+    print('Loading player rosters...')
+    dseason, dplayer, dposition, froster = load_rosters(DATA_DIR, dteam, dseason, registry=registry)
     # load topscorers dimensions
     print('Loading topscorers dimensions...')
-    dtopscore_all, dtopscore_season = load_topscorers_dimensions(DATA_DIR, dteam)
+    dtopscore_all, dtopscore_season, dplayer = load_topscorers_dimensions(DATA_DIR, dteam, dplayer, registry=registry)
 
-    # prepare matches with parsed dates
-    matches['date_parsed'] = pd.to_datetime(matches['date_parsed'])
     print('Building fact table F_Match...')
-    fmatch, dteam = build_fact(matches, dteam, dcomp, dseason, dstad, ddate)
-    
+    if matches is not None:
+        # prepare matches with parsed dates
+        matches['date_parsed'] = pd.to_datetime(matches['date_parsed'])
+        fmatch, dteam = build_fact(matches, dteam, dcomp, dseason, dstad, ddate, registry=registry)
+    else:
+        fmatch = previous['F_Match'].iloc[0:0]
+    if previous is not None:
+        fmatch_new = fmatch
+        fmatch, dropped = merge_fact(previous['F_Match'], fmatch_new, stale_ids, manifest)
+    print('Loading champions...')
+    dteam, dcomp, dseason, fchamp = load_champions(DATA_DIR, dteam, dcomp, dseason, registry=registry)
+    if registry is not None:
+        registry.close()
+
     # Clean up stadium_id: replace -1 with None and convert to Int64 (nullable int)
     dteam['stadium_id'] = dteam['stadium_id'].replace(-1, None)
     dteam['stadium_id'] = dteam['stadium_id'].astype('Int64')
-    
-    # save dimensions (after build_fact to include new teams)
-    dteam.to_csv(OUTPUT_DIR / 'D_Team_clean.csv', index=False)
-    dcomp.to_csv(OUTPUT_DIR / 'D_Competition_clean.csv', index=False)
-    dseason.to_csv(OUTPUT_DIR / 'D_Season_clean.csv', index=False)
-    dstad.to_csv(OUTPUT_DIR / 'D_Stadium_clean.csv', index=False)
-    ddate.to_csv(OUTPUT_DIR / 'D_Date.csv', index=False)
-    if dtopscore_all is not None:
-        dtopscore_all.to_csv(OUTPUT_DIR / 'D_TopScorers_AllTime_clean.csv', index=False)
-    if dtopscore_season is not None:
-        dtopscore_season.to_csv(OUTPUT_DIR / 'D_TopScorers_By_Season_clean.csv', index=False)
-    
-    # Save updated D_Team with new teams
-    dteam.to_csv(OUTPUT_DIR / 'D_Team_clean.csv', index=False)
-    fmatch.to_csv(OUTPUT_DIR / 'F_Match.csv', index=False)
-
-    # Generate F_Team_Season aggregated table
-    print('Generating F_Team_Season aggregated table...')
-    fmatch_reload = pd.read_csv(OUTPUT_DIR / 'F_Match.csv')
-    f_team_season = build_team_season_agg(fmatch_reload)
-    f_team_season.to_csv(OUTPUT_DIR / 'F_Team_Season.csv', index=False)
-    print(f'  Generated {len(f_team_season)} team-season records')
-
-    # champions: copy/clean D_Champions.csv if exists
-    champions_file = DATA_DIR / 'D_Champions.csv'
-    if champions_file.exists():
-        try:
-            dchamp = pd.read_csv(champions_file)
-            dchamp.to_csv(OUTPUT_DIR / 'D_Champions_clean.csv', index=False)
-            print('D_Champions copied to output')
-        except Exception:
-            print('Failed to copy D_Champions')
 
-    print('ETL complete. CSVs saved to', OUTPUT_DIR)
+    # Generate F_Team_Season aggregated table (directement depuis le fait en mémoire)
+    if previous is None:
+        print('Generating F_Team_Season aggregated table...')
+        f_team_season = build_team_season_agg(fmatch, **points_options(args, dseason))
+        print(f'  Generated {len(f_team_season)} team-season records')
+    else:
+        affected = _team_season_keys(dropped) | _team_season_keys(fmatch_new)
+        print(f'Updating {len(affected)} F_Team_Season group(s)...')
+        f_team_season = update_team_season_agg(previous['F_Team_Season'], fmatch, affected,
+                                               **points_options(args, dseason))
+    print('Materializing F_Team_Cube (competition x season x team x side)...')
+    if previous is None:
+        f_cube = update_cube(args, fmatch, dseason)
+    else:
+        f_cube = update_cube(args, fmatch, dseason, previous=read_output(OUTPUT_DIR, 'F_Team_Cube'),
+                             added=fmatch_new, removed=dropped)
+    print('Generating F_Standings_Round (standings after each round)...')
+    f_standings = standings_table(args, fmatch, dcomp, dseason, ddate)
+    print('Rating teams (F_Team_Rating)...')
+    if previous is None:
+        elo, f_rating = update_ratings(args, fmatch, ddate)
+    else:
+        elo, f_rating = update_ratings(args, fmatch, ddate, previous_rating=read_output(OUTPUT_DIR, 'F_Team_Rating'),
+                                       changed=_changed_matches(dropped, fmatch_new))
+    print('Precomputing head-to-head and form tables...')
+    f_h2h, f_form = matchup_tables(fmatch, ddate)
+
+    # sorties, écrites une seule fois à la fin (après build_fact pour inclure les nouvelles équipes)
+    outputs = build_outputs(dteam, dcomp, dseason, dstad, ddate, dtopscore_all, dtopscore_season, fmatch, f_team_season,
+                            dplayer=dplayer, dposition=dposition, froster=froster, fchamp=fchamp,
+                            f_standings=f_standings, f_rating=f_rating, f_h2h=f_h2h, f_form=f_form,
+                            f_cube=f_cube)
+    write_outputs(outputs, OUTPUT_DIR, skip=args.skip_output, fmt=args.format)
+    save_manifest(OUTPUT_DIR, manifest)
+    elo.save(OUTPUT_DIR / RATINGS_CHECKPOINT_FILE)
+    if args.load:
+        print(f'Loading warehouse into {args.load}...')
+        load_warehouse(outputs, args.load)
+
+    peak = peak_memory_mb()
+    if peak is not None:
+        print(f'Peak memory: {peak:.0f} MB')
+    if previous is not None:
+        print(f'Incremental ETL complete: {len(dropped)} fact rows replaced by {len(fmatch_new)} ({len(fmatch)} total).')
+    else:
+        print('ETL complete. Outputs saved to', OUTPUT_DIR)
+
+
+def build_outputs(dteam, dcomp, dseason, dstad, ddate, dtopscore_all, dtopscore_season, fmatch, f_team_season,
+                  dplayer=None, dposition=None, froster=None, fchamp=None, f_standings=None, f_rating=None,
+                  f_h2h=None, f_form=None, f_cube=None):
+    """Tables de sortie `{nom_fichier: DataFrame}` dans l'ordre d'écriture"""
+    outputs = {
+        'D_Team_clean': dteam,
+        'D_Competition_clean': dcomp,
+        'D_Season_clean': dseason,
+        'D_Stadium_clean': dstad,
+        'D_Date': ddate,
+        'D_Player': dplayer,
+        'D_Position': dposition,
+        'D_TopScorers_AllTime_clean': dtopscore_all,
+        'D_TopScorers_By_Season_clean': dtopscore_season,
+        'F_Match': fmatch,
+        'F_Team_Season': f_team_season,
+        'F_Standings_Round': f_standings,
+        'F_Team_Rating': f_rating,
+        'F_Head_To_Head': f_h2h,
+        'F_Team_Form': f_form,
+        'F_Team_Cube': f_cube,
+        'F_Team_Player_Season': froster,
+        'F_Champions': fchamp,
+    }
+    return outputs
+
+
+def open_key_registry(args):
+    """Registre de clés stables (None si désactivé par --no-key-registry)"""
+    if args.no_key_registry:
+        return None
+    return KeyRegistry(args.key_registry or KEY_REGISTRY_FILE)
+
+
+def report_column_maps(args):
+    """Résumé (ou rapport détaillé) des schémas d'en-tête rencontrés, et persistance du cache"""
+    lines = COLUMN_MAPS.report()
+    print('  ' + lines[0])
+    if args.column_report:
+        for line in lines[1:]:
+            print('  ' + line)
+    if args.column_map_cache:
+        COLUMN_MAPS.save(args.column_map_cache)
+
+
+def points_options(args, dseason):
+    """Arguments barème de points pour build_team_season_agg depuis la ligne de commande"""
+    points_scheme = POINTS_2_1_0 if args.points_scheme == '2-1-0' else POINTS_3_1_0
+    season_points = two_point_seasons(dseason, args.two_points_before) if args.two_points_before else None
+    return {'points_scheme': points_scheme, 'season_points': season_points}
+
+
+def _changed_matches(dropped, fmatch_new):
+    """Lignes de F_Match réellement ajoutées, modifiées ou supprimées par un run incrémental
+
+    Un fichier relu remplace toutes ses lignes : celles identiques avant et après s'annulent.
+    """
+    both = pd.concat([dropped.astype(F_MATCH_DTYPES), fmatch_new.astype(F_MATCH_DTYPES)], ignore_index=True)
+    return both[~both.duplicated(subset=list(F_MATCH_DTYPES), keep=False)]
+
+
+def update_ratings(args, fmatch, ddate, previous_rating=None, changed=None):
+    """(EloRatings, F_Team_Rating) : reprise au point de contrôle si possible, sinon tout l'historique
+
+    La reprise n'applique que les matches postérieurs au point de contrôle ; elle est
+    possible si les paramètres Elo sont inchangés et si aucune ligne `changed` n'est
+    antérieure ou égale à la dernière date notée.
+    """
+    params = {'k': args.elo_k, 'home_advantage': args.elo_home_advantage, 'initial': ELO_DEFAULTS['initial']}
+    matches = rated_matches(fmatch, ddate)
+    elo = EloRatings.load(OUTPUT_DIR / RATINGS_CHECKPOINT_FILE) if previous_rating is not None else None
+    if elo is not None and elo.params == params and elo.last_date is not None:
+        touched = rated_matches(changed, ddate)['date'] if changed is not None else matches['date']
+        if touched.empty or touched.min() > elo.last_date:
+            checkpoint = elo.last_date
+            new = matches[matches['date'] > checkpoint]
+            f_rating = pd.concat([previous_rating[RATING_COLUMNS], elo.update(new)], ignore_index=True)
+            print(f'  Elo ratings resumed from checkpoint {checkpoint:%Y-%m-%d}: {len(new)} new match(es) rated')
+            return elo, f_rating
+    elo = EloRatings(**params)
+    f_rating = elo.update(matches)
+    print(f'  {len(matches)} matches rated, {int((elo.played > 0).sum())} teams')
+    return elo, f_rating
+
+
+def update_cube(args, fmatch, dseason, previous=None, added=None, removed=None):
+    """F_Team_Cube complet, ou mis à jour par différence (`added` - `removed`) à partir de `previous`"""
+    points = points_options(args, dseason)
+    if previous is None:
+        f_cube = build_cube(team_side_facts(fmatch, dseason, **points))
+        print(f'  {len(f_cube)} cube cells')
+    else:
+        f_cube = refresh_cube(previous, team_side_facts(added, dseason, **points),
+                              team_side_facts(removed, dseason, **points))
+        print(f'  {len(f_cube)} cube cells ({len(previous)} before, refreshed from {len(added)} new / '
+              f'{len(removed)} replaced fact rows)')
+    return f_cube
+
+
+def matchup_tables(fmatch, ddate):
+    """(F_Head_To_Head, F_Team_Form), recalculés en entier depuis F_Match (fenêtres vectorisées)"""
+    matches = played_matches(fmatch, ddate)
+    f_h2h, f_form = build_head_to_head(matches), build_team_form(matches)
+    print(f'  {len(f_h2h)} team pairs, {len(f_form)} team-match form rows')
+    return f_h2h, f_form
+
+
+LEAGUE_COMPETITIONS = ('ligue_1',)
+
+
+def standings_table(args, fmatch, dcomp, dseason, ddate):
+    """F_Standings_Round des compétitions de championnat, avec le barème de F_Team_Season
+
+    Recalculé en entier depuis F_Match (aussi en mode incrémental) : le cumul d'une
+    journée dépend de toutes les précédentes.
+    """
+    names = args.standings_competition or LEAGUE_COMPETITIONS
+    ids = dcomp.loc[dcomp['competition'].isin(names), 'id_competition']
+    f_standings = build_standings(fmatch, competitions=ids, tie_breakers=args.tie_breakers, ddate=ddate,
+                                  **points_options(args, dseason))
+    tables = f_standings.groupby(['id_competition', 'season_id', 'phase', 'pool']).ngroups
+    print(f'  Generated {len(f_standings)} standings rows ({tables} table(s) in '
+          f'{f_standings.groupby(["id_competition", "season_id"]).ngroups} season(s))')
+    return f_standings
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    print('Scanning matches...')
+    files = glob.glob(MATCHES_GLOB, recursive=True)
+    print(f'Found {len(files)} match files')
+    if args.workers > 1:
+        print(f'  reading with {args.workers} worker processes')
+
+    if args.incremental:
+        manifest = load_manifest(OUTPUT_DIR)
+        previous = read_previous_outputs(OUTPUT_DIR) if manifest else None
+        if previous is not None:
+            run_incremental(args, files, manifest, previous)
+            return
+        print('No previous run found (manifest or outputs missing): full rebuild')
+
+    if args.column_map_cache:
+        COLUMN_MAPS.load(args.column_map_cache)
+    dfs = load_matches(files, workers=args.workers, chunksize=args.chunksize)
+    report_column_maps(args)
+    if len(dfs)==0:
+        print('No match data found. Exiting.')
+        return
+    matches = concat_matches(dfs)
+    print(f'  {len(matches)} matches, {matches.memory_usage(deep=True).sum() / 2 ** 20:.1f} MB in memory')
+
+    # build dimensions
+    print('Building dimensions...')
+    dims = build_dimensions(matches, DATA_DIR, calendar=args.calendar)
+    run_pipeline(args, matches, dims, build_manifest(files, matches))
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,87 @@
+"""
+Registre persistant des clés de substitution des dimensions (SQLite, stdlib).
+
+Chaque membre d'une dimension est identifié par sa clé naturelle (nom d'équipe,
+saison, date ISO...) ; le registre lui attribue un id stable d'un run à l'autre :
+- un membre déjà connu garde toujours son id ;
+- un nouveau membre reçoit l'id proposé s'il est libre, sinon le prochain id libre.
+
+Usage:
+  from key_registry import KeyRegistry
+
+  with KeyRegistry('warehouse_output/_keys.sqlite') as reg:
+      ids = reg.assign('D_Team', ['Club Africain', 'CS Sfaxien'])
+"""
+
+import sqlite3
+
+
+class KeyRegistry:
+    """Registre {(dimension, clé naturelle) -> id} stocké dans une base SQLite"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path)
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS surrogate_keys ('
+                ' dimension TEXT NOT NULL,'
+                ' natural_key TEXT NOT NULL,'
+                ' id INTEGER NOT NULL,'
+                ' PRIMARY KEY (dimension, natural_key),'
+                ' UNIQUE (dimension, id))'
+            )
+        self._keys = {}   # dimension -> {clé naturelle: id}, chargé à la demande
+        self._used = {}   # dimension -> ids déjà attribués
+        self._next = {}   # dimension -> prochain id libre
+
+    def _load(self, dimension):
+        if dimension not in self._keys:
+            rows = self.conn.execute(
+                'SELECT natural_key, id FROM surrogate_keys WHERE dimension = ?', (dimension,)).fetchall()
+            self._keys[dimension] = dict(rows)
+            self._used[dimension] = {i for _, i in rows}
+            self._next[dimension] = max(self._used[dimension], default=0) + 1
+        return self._keys[dimension]
+
+    def lookup(self, dimension, key):
+        """Id du membre `key` ou None s'il n'est pas enregistré"""
+        return self._load(dimension).get(str(key))
+
+    def assign(self, dimension, keys, preferred_ids=None):
+        """Ids des `keys` (dans l'ordre), en allouant les membres nouveaux.
+
+        `preferred_ids` (même longueur que `keys`) propose un id pour chaque
+        membre nouveau ; il n'est retenu que s'il n'est pas déjà utilisé.
+        """
+        known = self._load(dimension)
+        used = self._used[dimension]
+        keys = [str(k) for k in keys]
+        preferred = list(preferred_ids) if preferred_ids is not None else [None] * len(keys)
+        new_rows = []
+        ids = []
+        for key, pref in zip(keys, preferred):
+            if key not in known:
+                if pref is not None and pref == pref and int(pref) > 0 and int(pref) not in used:
+                    new_id = int(pref)
+                else:
+                    while self._next[dimension] in used:
+                        self._next[dimension] += 1
+                    new_id = self._next[dimension]
+                known[key] = new_id
+                used.add(new_id)
+                new_rows.append((dimension, key, new_id))
+            ids.append(known[key])
+        if new_rows:
+            with self.conn:
+                self.conn.executemany('INSERT INTO surrogate_keys (dimension, natural_key, id) VALUES (?, ?, ?)', new_rows)
+        return ids
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,244 @@
+"""
+Confrontations directes et forme des équipes, précalculées pour les tableaux de bord.
+
+Construit à partir de F_Match (et des dates de D_Date) :
+- F_Head_To_Head : une ligne par paire non ordonnée (id_team_a < id_team_b), tous matches confondus
+- F_Team_Form : une ligne par équipe et par match, forme sur les 5 / 10 derniers matches
+  (fenêtres glissantes par différence de sommes cumulées, sans boucle)
+
+`MatchupIndex` répond en O(1) (dictionnaires sur les tables précalculées) à :
+  "bilan X-Y", "N dernières confrontations X-Y", "forme actuelle de X".
+
+Usage:
+  from matchups import build_head_to_head, build_team_form, MatchupIndex
+  index = MatchupIndex.from_outputs('warehouse_output')
+  index.head_to_head_record(70, 43); index.last_meetings(70, 43, n=5); index.current_form(70)
+  python src/matchups.py --matches 1000000     # benchmark sur des matches synthétiques
+"""
+
+import numpy as np
+import pandas as pd
+
+FORM_WINDOWS = (5, 10)
+FORM_POINTS = (3, 1, 0)
+
+HEAD_TO_HEAD_COLUMNS = ['id_team_a', 'id_team_b', 'matches', 'wins_a', 'draws', 'wins_b', 'goals_a', 'goals_b',
+                        'first_id_date', 'last_id_date', 'last_id_match']
+
+
+def played_matches(fmatch, ddate):
+    """Matches avec score, équipes et date connues, triés par date (ordre de F_Match à date égale)"""
+    dates = pd.Series(pd.to_datetime(ddate['date']).to_numpy(), index=ddate['id_date'].to_numpy())
+    fm = pd.DataFrame({
+        'id_match': fmatch['id_match'].to_numpy(),
+        'id_date': fmatch['id_date'].to_numpy('int64'),
+        'date': fmatch['id_date'].map(dates).to_numpy('datetime64[ns]'),
+        'id_competition': fmatch['id_competition'].to_numpy('int64'),
+        'season_id': fmatch['season_id'].to_numpy('int64'),
+        'id_home_team': fmatch['id_home_team'].to_numpy('int64'),
+        'id_away_team': fmatch['id_away_team'].to_numpy('int64'),
+        'result_home': pd.to_numeric(fmatch['result_home'], errors='coerce').to_numpy('float64'),
+        'result_away': pd.to_numeric(fmatch['result_away'], errors='coerce').to_numpy('float64'),
+    })
+    # score -1 : match pas encore joué (ou forfait sans score)
+    valid = (fm['date'].notna() & (fm['result_home'] >= 0) & (fm['result_away'] >= 0)
+             & (fm['id_home_team'] > 0) & (fm['id_away_team'] > 0))
+    fm = fm[valid].sort_values('date', kind='stable').reset_index(drop=True)
+    fm[['result_home', 'result_away']] = fm[['result_home', 'result_away']].astype('int64')
+    return fm
+
+
+def build_head_to_head(matches):
+    """F_Head_To_Head : bilan de chaque paire d'équipes (id_team_a < id_team_b) sur `played_matches`"""
+    home = matches['id_home_team'].to_numpy()
+    away = matches['id_away_team'].to_numpy()
+    swap = home > away
+    goals_home, goals_away = matches['result_home'].to_numpy(), matches['result_away'].to_numpy()
+    pairs = pd.DataFrame({
+        'id_team_a': np.where(swap, away, home),
+        'id_team_b': np.where(swap, home, away),
+        'goals_a': np.where(swap, goals_away, goals_home),
+        'goals_b': np.where(swap, goals_home, goals_away),
+        'id_date': matches['id_date'].to_numpy(),
+        'id_match': matches['id_match'].to_numpy(),
+    })
+    pairs['wins_a'] = (pairs['goals_a'] > pairs['goals_b']).astype('int64')
+    pairs['draws'] = (pairs['goals_a'] == pairs['goals_b']).astype('int64')
+    pairs['wins_b'] = (pairs['goals_a'] < pairs['goals_b']).astype('int64')
+    # matches déjà triés par date : first / last suivent la chronologie
+    h2h = pairs.groupby(['id_team_a', 'id_team_b'], sort=True).agg(
+        matches=('wins_a', 'size'), wins_a=('wins_a', 'sum'), draws=('draws', 'sum'), wins_b=('wins_b', 'sum'),
+        goals_a=('goals_a', 'sum'), goals_b=('goals_b', 'sum'),
+        first_id_date=('id_date', 'first'), last_id_date=('id_date', 'last'), last_id_match=('id_match', 'last'),
+    ).reset_index()
+    return h2h[HEAD_TO_HEAD_COLUMNS]
+
+
+def build_team_form(matches, windows=FORM_WINDOWS, points=FORM_POINTS):
+    """F_Team_Form : après chaque match d'une équipe, bilan de ses `windows` derniers matches
+
+    Colonnes par fenêtre w : points/wins/draws/losses/goals_for/goals_against_last{w},
+    plus form_last{w} pour la plus petite ('WDLWW', le plus récent à droite).
+    """
+    n = len(matches)
+    team = np.concatenate([matches['id_home_team'].to_numpy(), matches['id_away_team'].to_numpy()])
+    gf = np.concatenate([matches['result_home'].to_numpy(), matches['result_away'].to_numpy()])
+    ga = np.concatenate([matches['result_away'].to_numpy(), matches['result_home'].to_numpy()])
+    # ordre chronologique : rang du match, domicile avant extérieur
+    order = np.lexsort((np.repeat([0, 1], n), np.tile(np.arange(n), 2), team))
+    base = ['id_match', 'id_date', 'id_competition', 'season_id']
+    form = pd.DataFrame({c: np.tile(matches[c].to_numpy(), 2)[order] for c in base})
+    form.insert(0, 'id_team', team[order])
+    gf, ga = gf[order], ga[order]
+    win, draw, loss = points
+    stats = {
+        'points': np.where(gf > ga, win, np.where(gf == ga, draw, loss)),
+        'wins': (gf > ga).astype('int64'),
+        'draws': (gf == ga).astype('int64'),
+        'losses': (gf < ga).astype('int64'),
+        'goals_for': gf,
+        'goals_against': ga,
+    }
+
+    # position de chaque ligne dans l'historique de son équipe (lignes triées par équipe)
+    first = np.r_[0, np.flatnonzero(np.diff(form['id_team'].to_numpy())) + 1]
+    start = np.repeat(first, np.diff(np.r_[first, len(form)]))
+    seq = np.arange(len(form)) - start
+    form['matches'] = seq + 1
+    for name, values in stats.items():
+        cum = np.cumsum(values)
+        for w in windows:
+            # somme des w dernières valeurs = cumul - cumul w lignes plus tôt (borné au début de l'équipe)
+            back = np.arange(len(form)) - w
+            prev = np.where(seq >= w, cum[np.maximum(back, 0)], np.where(start > 0, cum[start - 1], 0))
+            form[f'{name}_last{w}'] = cum - prev
+
+    # chaîne de forme de la plus petite fenêtre
+    w = min(windows)
+    letters = np.where(gf > ga, 'W', np.where(gf == ga, 'D', 'L')).astype(object)
+    text = pd.Series(letters)
+    for lag in range(1, w):
+        shifted = pd.Series(np.roll(letters, lag)).where(seq >= lag, '')
+        text = shifted + text
+    form[f'form_last{w}'] = text.to_numpy()
+    columns = (['id_team'] + base + ['matches', f'form_last{w}']
+               + [f'{name}_last{k}' for k in windows for name in stats])
+    return form[columns]
+
+
+class MatchupIndex:
+    """Recherches O(1) sur F_Head_To_Head, F_Team_Form et les matches joués
+
+    Les dictionnaires sont construits une fois (à partir des tables précalculées) ;
+    chaque requête n'est ensuite qu'un accès par clé et une tranche de tableau.
+    """
+
+    def __init__(self, head_to_head, form, matches):
+        self.head_to_head = head_to_head.reset_index(drop=True)
+        self._h2h = {c: self.head_to_head[c].to_numpy() for c in self.head_to_head.columns}
+        self._pairs = dict(zip(zip(self.head_to_head['id_team_a'].tolist(), self.head_to_head['id_team_b'].tolist()),
+                               range(len(self.head_to_head))))
+        self.form = form.reset_index(drop=True)
+        self._form = {c: self.form[c].to_numpy() for c in self.form.columns}
+        # F_Team_Form est trié par équipe puis chronologiquement : dernière ligne de chaque équipe
+        teams = self.form['id_team'].to_numpy()
+        last = np.r_[np.flatnonzero(np.diff(teams)), len(teams) - 1] if len(teams) else np.array([], dtype='int64')
+        self._latest = dict(zip(teams[last].tolist(), last.tolist()))
+
+        # confrontations triées par paire puis par date ; tranche [début, fin) par paire
+        home, away = matches['id_home_team'].to_numpy(), matches['id_away_team'].to_numpy()
+        a, b = np.minimum(home, away), np.maximum(home, away)
+        order = np.lexsort((np.arange(len(matches)), b, a))
+        self.meetings = matches.iloc[order].reset_index(drop=True)
+        a, b = a[order], b[order]
+        bounds = np.r_[0, np.flatnonzero((np.diff(a) != 0) | (np.diff(b) != 0)) + 1, len(a)] if len(a) else [0]
+        self._slices = {(int(a[s]), int(b[s])): (int(s), int(e)) for s, e in zip(bounds[:-1], bounds[1:])}
+
+    @classmethod
+    def from_matches(cls, fmatch, ddate):
+        """Index construit directement depuis F_Match et D_Date"""
+        matches = played_matches(fmatch, ddate)
+        return cls(build_head_to_head(matches), build_team_form(matches), matches)
+
+    @classmethod
+    def from_outputs(cls, output_dir):
+        """Index relu depuis les CSV de l'ETL (F_Head_To_Head, F_Team_Form, F_Match, D_Date)"""
+        from pathlib import Path
+        output_dir = Path(output_dir)
+        read = lambda name: pd.read_csv(output_dir / f'{name}.csv', dtype={'id_match': str, 'last_id_match': str})
+        ddate = read('D_Date')
+        return cls(read('F_Head_To_Head'), read('F_Team_Form'), played_matches(read('F_Match'), ddate))
+
+    def head_to_head_record(self, team, opponent):
+        """Bilan de `team` contre `opponent` (dict, du point de vue de `team`) ; None s'ils ne se sont pas rencontrés"""
+        a, b = min(team, opponent), max(team, opponent)
+        i = self._pairs.get((a, b))
+        if i is None:
+            return None
+        col = self._h2h
+        mine, theirs = ('a', 'b') if team == a else ('b', 'a')
+        return {
+            'id_team': team, 'id_opponent': opponent, 'matches': int(col['matches'][i]),
+            'wins': int(col[f'wins_{mine}'][i]), 'draws': int(col['draws'][i]), 'losses': int(col[f'wins_{theirs}'][i]),
+            'goals_for': int(col[f'goals_{mine}'][i]), 'goals_against': int(col[f'goals_{theirs}'][i]),
+            'last_id_date': int(col['last_id_date'][i]), 'last_id_match': col['last_id_match'][i],
+        }
+
+    def last_meetings(self, team, opponent, n=5):
+        """`n` dernières confrontations entre les deux équipes (plus récente en premier)"""
+        start, stop = self._slices.get((min(team, opponent), max(team, opponent)), (0, 0))
+        return self.meetings.iloc[max(start, stop - n):stop].iloc[::-1]
+
+    def current_form(self, team):
+        """Dernière ligne de F_Team_Form de l'équipe (dict) ; None si elle n'a pas joué"""
+        i = self._latest.get(team)
+        return None if i is None else {c: values[i] for c, values in self._form.items()}
+
+
+def synthetic_fact(n, teams=200, seed=0):
+    """(F_Match, D_Date) synthétiques : `n` matches, 8 par jour"""
+    rng = np.random.default_rng(seed)
+    home = rng.integers(1, teams + 1, n)
+    away = (home + rng.integers(1, teams, n) - 1) % teams + 1
+    days = n // 8 + 1
+    ddate = pd.DataFrame({'id_date': np.arange(1, days + 1),
+                          'date': pd.Timestamp('1920-01-01') + pd.to_timedelta(np.arange(days), unit='D')})
+    fmatch = pd.DataFrame({
+        'id_match': np.arange(n).astype(str),
+        'id_date': np.arange(n) // 8 + 1,
+        'id_home_team': home,
+        'id_away_team': away,
+        'id_competition': 2,
+        'season_id': np.arange(n) // 240 + 1,
+        'result_home': rng.poisson(1.3, n),
+        'result_away': rng.poisson(1.0, n),
+    })
+    return fmatch, ddate
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Benchmark des confrontations directes et de la forme.')
+    parser.add_argument('--matches', type=int, default=1_000_000, help='Nombre de matches synthétiques (défaut: 1 000 000)')
+    args = parser.parse_args()
+
+    fmatch, ddate = synthetic_fact(args.matches)
+    t0 = time.perf_counter()
+    matches = played_matches(fmatch, ddate)
+    h2h, form = build_head_to_head(matches), build_team_form(matches)
+    elapsed = time.perf_counter() - t0
+    print(f'{args.matches:,} matches -> {len(h2h):,} head-to-head pairs, {len(form):,} form rows in {elapsed:.2f}s')
+
+    t0 = time.perf_counter()
+    index = MatchupIndex(h2h, form, matches)
+    print(f'  index built in {time.perf_counter() - t0:.2f}s')
+    rng = np.random.default_rng(1)
+    queries = rng.integers(1, 201, (10_000, 2))
+    t0 = time.perf_counter()
+    for x, y in queries.tolist():
+        index.head_to_head_record(x, y)
+        index.current_form(x)
+    elapsed = time.perf_counter() - t0
+    print(f'  {len(queries):,} head-to-head + form lookups in {elapsed:.2f}s ({elapsed / len(queries) * 1e6:.0f} µs/lookup pair)')
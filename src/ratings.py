@@ -0,0 +1,187 @@
+"""
+Classement Elo des équipes (F_Team_Rating) rejoué sur F_Match dans l'ordre chronologique.
+
+- notes et nombre de matches notés dans des tableaux numpy indexés par id_team
+- formule Elo (type World Football Elo) : avantage du terrain, K multiplié selon l'écart de buts
+- un match aux tirs au but compte comme un nul (score du temps réglementaire)
+- point de reprise JSON (notes, paramètres, dernière date) : un run incrémental n'applique
+  que les matches postérieurs au point de reprise
+
+Usage:
+  from ratings import EloRatings, rated_matches
+  python src/ratings.py --matches 1000000     # benchmark sur des matches synthétiques
+"""
+
+import json
+import numpy as np
+import pandas as pd
+
+ELO_DEFAULTS = {'k': 20.0, 'home_advantage': 65.0, 'initial': 1500.0}
+
+# statuts d'un match réellement joué (les matches attribués sur tapis vert ne sont pas notés)
+RATED_STATUSES = ('FINISHED', 'AFTER EXTRA TIME', 'AFTER PENALTIES')
+
+RATING_COLUMNS = ['id_match', 'id_date', 'id_competition', 'season_id', 'id_team', 'id_opponent',
+                  'rating_before', 'rating_after', 'matches_rated']
+
+
+def rated_matches(fmatch, ddate):
+    """Matches notés, triés par date (ordre de F_Match à date égale) : date, goals_home, goals_away en plus"""
+    fm = fmatch
+    if 'status' in fm:
+        fm = fm[fm['status'].isin(RATED_STATUSES) | fm['status'].isna()]
+    dates = pd.Series(pd.to_datetime(ddate['date']).to_numpy(), index=ddate['id_date'].to_numpy())
+    out = pd.DataFrame({
+        'id_match': fm['id_match'].to_numpy(),
+        'id_date': fm['id_date'].to_numpy('int64'),
+        'date': fm['id_date'].map(dates).to_numpy('datetime64[ns]'),
+        'id_competition': fm['id_competition'].to_numpy('int64'),
+        'season_id': fm['season_id'].to_numpy('int64'),
+        'id_home_team': fm['id_home_team'].to_numpy('int64'),
+        'id_away_team': fm['id_away_team'].to_numpy('int64'),
+        'goals_home': pd.to_numeric(fm['result_home'], errors='coerce').to_numpy('float64'),
+        'goals_away': pd.to_numeric(fm['result_away'], errors='coerce').to_numpy('float64'),
+    })
+    # tirs au but : le score retenu est celui du temps réglementaire ('1-1')
+    if 'regulation_time' in fm and 'status' in fm:
+        shootout = (fm['status'] == 'AFTER PENALTIES').to_numpy()
+        regulation = fm['regulation_time'].astype('string').str.extract(r'(\d+)\s*-\s*(\d+)')
+        for i, col in enumerate(('goals_home', 'goals_away')):
+            goals = pd.to_numeric(regulation[i], errors='coerce').to_numpy('float64')
+            out[col] = np.where(shootout & ~np.isnan(goals), goals, out[col])
+    # score -1 : match pas encore joué (ou forfait sans score)
+    valid = (out['date'].notna() & (out['goals_home'] >= 0) & (out['goals_away'] >= 0)
+             & (out['id_home_team'] > 0) & (out['id_away_team'] > 0))
+    return out[valid].sort_values('date', kind='stable').reset_index(drop=True)
+
+
+class EloRatings:
+    """Notes Elo courantes par id_team, mises à jour match par match"""
+
+    def __init__(self, k=ELO_DEFAULTS['k'], home_advantage=ELO_DEFAULTS['home_advantage'],
+                 initial=ELO_DEFAULTS['initial']):
+        self.params = {'k': float(k), 'home_advantage': float(home_advantage), 'initial': float(initial)}
+        self.rating = np.empty(0, dtype='float64')
+        self.played = np.empty(0, dtype='int64')
+        self.last_date = None
+
+    def _grow(self, max_team):
+        if max_team >= len(self.rating):
+            extra = max_team + 1 - len(self.rating)
+            self.rating = np.append(self.rating, np.full(extra, self.params['initial']))
+            self.played = np.append(self.played, np.zeros(extra, dtype='int64'))
+
+    def update(self, matches):
+        """Applique `matches` (sortie de `rated_matches`) ; retourne les lignes F_Team_Rating
+
+        Les matches doivent être postérieurs à `last_date` (ValueError sinon).
+        """
+        if matches.empty:
+            return pd.DataFrame(columns=RATING_COLUMNS)
+        if self.last_date is not None and matches['date'].min() <= self.last_date:
+            raise ValueError(f"Matches antérieurs au point de reprise ({self.last_date}) : rejouer tout l'historique")
+        home = matches['id_home_team'].to_numpy('int64')
+        away = matches['id_away_team'].to_numpy('int64')
+        self._grow(int(max(home.max(), away.max())))
+
+        gh = matches['goals_home'].to_numpy('float64')
+        ga = matches['goals_away'].to_numpy('float64')
+        result = np.where(gh > ga, 1.0, np.where(gh == ga, 0.5, 0.0))
+        # K selon l'écart de buts : x1 (0-1 but), x1.5 (2 buts), x(11 + n)/8 au-delà
+        diff = np.abs(gh - ga)
+        k = self.params['k'] * np.where(diff <= 1, 1.0, np.where(diff == 2, 1.5, (11 + diff) / 8))
+
+        # boucle séquentielle sur des listes Python (plus rapide que l'indexation numpy élément par élément)
+        rating, played = self.rating.tolist(), self.played.tolist()
+        hfa = self.params['home_advantage']
+        n = len(home)
+        before_h, before_a, after_h, after_a = [0.0] * n, [0.0] * n, [0.0] * n, [0.0] * n
+        count_h, count_a = [0] * n, [0] * n
+        for i, (h, a, w, kk) in enumerate(zip(home.tolist(), away.tolist(), result.tolist(), k.tolist())):
+            rh, ra = rating[h], rating[a]
+            expected = 1.0 / (10.0 ** ((ra - rh - hfa) / 400.0) + 1.0)
+            delta = kk * (w - expected)
+            rating[h], rating[a] = rh + delta, ra - delta
+            played[h] += 1
+            played[a] += 1
+            before_h[i], before_a[i], after_h[i], after_a[i] = rh, ra, rh + delta, ra - delta
+            count_h[i], count_a[i] = played[h], played[a]
+        self.rating = np.array(rating, dtype='float64')
+        self.played = np.array(played, dtype='int64')
+        self.last_date = matches['date'].max()
+
+        # deux lignes par match (domicile puis extérieur), dans l'ordre de jeu
+        def side(team, opponent, before, after, count):
+            return {'id_team': team, 'id_opponent': opponent, 'rating_before': np.round(before, 2),
+                    'rating_after': np.round(after, 2), 'matches_rated': np.array(count, dtype='int64')}
+
+        base = {c: np.repeat(matches[c].to_numpy(), 2) for c in ('id_match', 'id_date', 'id_competition', 'season_id')}
+        sides = [side(home, away, before_h, after_h, count_h), side(away, home, before_a, after_a, count_a)]
+        inter = {c: np.stack([np.asarray(sides[0][c]), np.asarray(sides[1][c])], axis=1).ravel() for c in sides[0]}
+        return pd.DataFrame({**base, **inter})[RATING_COLUMNS]
+
+    def current(self):
+        """Notes courantes des équipes déjà notées : id_team, rating, matches_rated"""
+        ids = np.flatnonzero(self.played)
+        return pd.DataFrame({'id_team': ids, 'rating': self.rating[ids].round(2), 'matches_rated': self.played[ids]})
+
+    def save(self, path):
+        ids = np.flatnonzero(self.played)
+        state = {
+            'params': self.params,
+            'last_date': None if self.last_date is None else pd.Timestamp(self.last_date).isoformat(),
+            'ratings': {str(i): [float(self.rating[i]), int(self.played[i])] for i in ids},
+        }
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(state, fh)
+
+    @classmethod
+    def load(cls, path):
+        """Point de reprise enregistré par `save` ; None si absent"""
+        try:
+            with open(path, encoding='utf-8') as fh:
+                state = json.load(fh)
+        except FileNotFoundError:
+            return None
+        engine = cls(**state['params'])
+        ratings = {int(i): v for i, v in state['ratings'].items()}
+        if ratings:
+            engine._grow(max(ratings))
+            for i, (value, count) in ratings.items():
+                engine.rating[i], engine.played[i] = value, count
+        engine.last_date = pd.Timestamp(state['last_date']) if state['last_date'] else None
+        return engine
+
+
+def synthetic_rated_matches(n, teams=200, seed=0):
+    """`n` matches synthétiques au format de `rated_matches` (8 matches par jour)"""
+    rng = np.random.default_rng(seed)
+    home = rng.integers(1, teams + 1, n)
+    away = (home + rng.integers(1, teams, n) - 1) % teams + 1
+    return pd.DataFrame({
+        'id_match': np.arange(n).astype(str),
+        'id_date': np.arange(n) // 8 + 1,
+        'date': pd.Timestamp('1920-01-01') + pd.to_timedelta(np.arange(n) // 8, unit='D'),
+        'id_competition': 2,
+        'season_id': np.arange(n) // 240 + 1,
+        'id_home_team': home,
+        'id_away_team': away,
+        'goals_home': rng.poisson(1.3, n).astype('float64'),
+        'goals_away': rng.poisson(1.0, n).astype('float64'),
+    })
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Benchmark du classement Elo sur des matches synthétiques.')
+    parser.add_argument('--matches', type=int, default=1_000_000, help='Nombre de matches synthétiques (défaut: 1 000 000)')
+    args = parser.parse_args()
+
+    matches = synthetic_rated_matches(args.matches)
+    t0 = time.perf_counter()
+    history = EloRatings().update(matches)
+    elapsed = time.perf_counter() - t0
+    print(f'{args.matches:,} matches -> {len(history):,} rating rows in {elapsed:.2f}s '
+          f'({args.matches / elapsed:,.0f} matches/s)')
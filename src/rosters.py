@@ -0,0 +1,208 @@
+"""
+Effectifs des équipes par saison (data/player_data/*_all_teams_seasons.csv).
+
+Construit les tables de sql/schema.sql :
+- D_Player (id_player, player_name, birth_date, nationality) : un joueur par (nom, date de naissance)
+- D_Position (id_position, position_name)
+- F_Team_Player_Season (season_id, id_team, id_player, number, id_position, market_value)
+
+Tout est vectorisé : les valeurs marchandes ('€800k', '€1.20m') sont converties
+sur les valeurs distinctes, les joueurs sont dédoublonnés par factorisation de
+la clé (nom, date de naissance). Les équipes et les saisons sont résolues par
+l'ETL (`etl.load_rosters`), qui passe les ids ligne à ligne.
+
+Usage:
+  from rosters import read_rosters, build_roster_tables
+  python src/rosters.py --rows 500000     # benchmark sur un effectif synthétique
+"""
+
+import numpy as np
+import pandas as pd
+
+# colonne logique -> noms de colonnes candidats (minuscules, sans BOM)
+ROSTER_COLUMN_CANDIDATES = {
+    'season': ['season', 'season_name'],
+    'season_id': ['season_id', 'id_season'],
+    'team': ['team', 'team_name', 'club'],
+    'number': ['number', 'shirt_number'],
+    'player_name': ['name', 'player_name'],
+    'position': ['position', 'position_name'],
+    'birth_date': ['birth_date', 'date_of_birth', 'dob'],
+    'nationality': ['nationality'],
+    'market_value': ['market_value', 'value'],
+}
+
+BIRTH_DATE_FORMAT = '%d/%m/%Y'
+
+# suffixes des valeurs marchandes
+MARKET_VALUE_UNITS = {'': 1, 'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}
+
+
+def parse_market_values(values):
+    """'€800k' -> 800000, '€1.20m' -> 1200000, '-' -> NA (Int64), calculé sur les valeurs distinctes"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype='string'))
+    parts = pd.Series(uniques, dtype='string').str.lower().str.extract(r'([\d][\d.,]*)\s*([kmb]?)')
+    amount = pd.to_numeric(parts[0].str.replace(',', '.', regex=False), errors='coerce')
+    unit = parts[1].fillna('').map(MARKET_VALUE_UNITS).astype('float64')
+    parsed = (amount * unit).round().to_numpy('float64', na_value=np.nan)
+    out = np.append(parsed, np.nan)[codes]
+    return pd.array(out, dtype='Int64')
+
+
+def on_distinct(values, func):
+    """Applique `func` (vectorisée) aux seules valeurs distinctes de `values` puis redéploie"""
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=False)
+    return pd.Series(func(pd.Series(uniques)).to_numpy()[codes], index=getattr(values, 'index', None))
+
+
+def _season_start(labels):
+    start = labels.astype('string').str.extract(r'^\s*(\d{2}|\d{4})\s*[/\-_–]')[0]
+    first = pd.to_numeric(start, errors='coerce').astype('float64')
+    # deux chiffres : 54/55 -> 1954, 25/26 -> 2025
+    century = np.where(first > pd.Timestamp.now().year % 100 + 1, 1900, 2000)
+    return first.where(start.str.len().ne(2).fillna(True), century + first).astype('Int64')
+
+
+def season_start_years(season, season_id=None):
+    """Année de début de saison : `season_id` si c'est une année, sinon libellé 'yy/yy' ou 'yyyy-yy'"""
+    start = pd.Series(pd.NA, index=season.index, dtype='Int64')
+    if season_id is not None:
+        ids = on_distinct(season_id, lambda u: pd.to_numeric(u, errors='coerce').astype('Int64'))
+        start = ids.where(ids > 1800)
+    return start.fillna(on_distinct(season, _season_start)).astype('Int64')
+
+
+def parse_birth_dates(values):
+    """Dates de naissance jj/mm/aaaa -> datetime64 (NaT si invalide), converties sur les valeurs distinctes"""
+    parsed = on_distinct(values, lambda u: pd.to_datetime(u, format=BIRTH_DATE_FORMAT, errors='coerce'))
+    return parsed.astype('datetime64[ns]')
+
+
+def read_rosters(paths):
+    """Lit et normalise les fichiers d'effectifs (colonnes logiques + start_year)"""
+    frames = []
+    for path in paths:
+        df = pd.read_csv(path, encoding='utf-8-sig', dtype=str)
+        lower = {c.strip().lower(): c for c in df.columns}
+        out = pd.DataFrame(index=df.index)
+        for logical, candidates in ROSTER_COLUMN_CANDIDATES.items():
+            col = next((lower[c] for c in candidates if c in lower), None)
+            out[logical] = df[col].str.strip() if col is not None else None
+        frames.append(out)
+    roster = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=list(ROSTER_COLUMN_CANDIDATES))
+    roster = roster.replace({'-': None, '': None})
+    roster = roster[roster['player_name'].notna()].reset_index(drop=True)
+    roster['start_year'] = season_start_years(roster['season'], roster['season_id'])
+    roster['birth_date'] = parse_birth_dates(roster['birth_date'])
+    roster['market_value'] = parse_market_values(roster['market_value'])
+    return roster
+
+
+def player_keys(names, birth_dates):
+    """Clés naturelles du registre : 'nom|aaaa-mm-jj' ('nom|' sans date de naissance)"""
+    births = pd.Series(pd.to_datetime(birth_dates)).dt.strftime('%Y-%m-%d').fillna('')
+    return (pd.Series(names, dtype=object).astype(str).reset_index(drop=True) + '|' + births.reset_index(drop=True)).tolist()
+
+
+def _assign_ids(dplayer, start, registry):
+    ids = np.arange(start, start + len(dplayer), dtype='int64')
+    if registry is not None and len(dplayer):
+        ids = registry.assign('D_Player', player_keys(dplayer['player_name'], dplayer['birth_date']), preferred_ids=ids)
+    return np.asarray(ids, dtype='int64')
+
+
+def build_players(roster, registry=None):
+    """(D_Player, id_player de chaque ligne) : un joueur par couple (nom, date de naissance)"""
+    name_codes, _ = pd.factorize(roster['player_name'])
+    birth_codes, births = pd.factorize(roster['birth_date'], use_na_sentinel=False)
+    codes, _ = pd.factorize(name_codes.astype('int64') * (len(births) + 1) + birth_codes)
+    grouped = roster.groupby(codes, sort=True)
+    dplayer = pd.DataFrame({
+        'player_name': grouped['player_name'].first().to_numpy(),
+        'birth_date': grouped['birth_date'].first().to_numpy(),
+        'nationality': grouped['nationality'].first().to_numpy(),
+    })
+    dplayer.insert(0, 'id_player', _assign_ids(dplayer, 1, registry))
+    return dplayer, dplayer['id_player'].to_numpy()[codes]
+
+
+def add_players_by_name(dplayer, names, registry=None):
+    """(D_Player complétée, id_player de chaque nom) ; un nom déjà connu prend le premier joueur de ce nom"""
+    names = pd.Series(names, dtype='string').str.strip()
+    if dplayer is None:
+        dplayer = pd.DataFrame({'id_player': pd.Series(dtype='int64'), 'player_name': pd.Series(dtype=object),
+                                'birth_date': pd.Series(dtype='datetime64[ns]'), 'nationality': pd.Series(dtype=object)})
+    known = dplayer.drop_duplicates(subset=['player_name'])
+    by_name = pd.Series(known['id_player'].to_numpy(), index=known['player_name'].to_numpy())
+    new = pd.unique(names[names.notna() & ~names.isin(by_name.index)])
+    if len(new):
+        added = pd.DataFrame({'player_name': np.asarray(new, dtype=object), 'birth_date': pd.NaT, 'nationality': None})
+        start = int(dplayer['id_player'].max()) + 1 if len(dplayer) else 1
+        added.insert(0, 'id_player', _assign_ids(added, start, registry))
+        dplayer = pd.concat([dplayer, added], ignore_index=True)
+        by_name = pd.concat([by_name, pd.Series(added['id_player'].to_numpy(), index=added['player_name'].to_numpy())])
+    return dplayer, names.map(by_name).astype('Int64')
+
+
+def build_roster_tables(roster, team_ids, season_ids, registry=None):
+    """(D_Player, D_Position, F_Team_Player_Season) ; `team_ids`/`season_ids` alignés sur `roster` (-1 = inconnu)
+
+    Les lignes sans équipe ou saison résolue sont écartées du fait (clés NOT NULL) ;
+    un même joueur listé deux fois pour une équipe-saison (alias du nom d'équipe) n'est gardé qu'une fois.
+    """
+    dplayer, player_ids = build_players(roster, registry=registry)
+
+    positions = pd.Series(sorted(roster['position'].dropna().unique()), dtype=object)
+    dposition = pd.DataFrame({'id_position': np.arange(1, len(positions) + 1, dtype='int64'), 'position_name': positions})
+    position_ids = pd.Series(dposition['id_position'].to_numpy(), index=positions.to_numpy())
+
+    fact = pd.DataFrame({
+        'season_id': np.asarray(season_ids, dtype='int64'),
+        'id_team': np.asarray(team_ids, dtype='int64'),
+        'id_player': player_ids,
+        'number': roster['number'].to_numpy(dtype=object),
+        'id_position': roster['position'].map(position_ids).astype('Int64').array,
+        'market_value': roster['market_value'].array,
+    })
+    fact = fact[(fact['season_id'] != -1) & (fact['id_team'] != -1)]
+    fact = fact.drop_duplicates(subset=['season_id', 'id_team', 'id_player'], keep='first').reset_index(drop=True)
+    return dplayer, dposition, fact
+
+
+def synthetic_roster(rows, seed=0):
+    """Effectif synthétique de `rows` lignes au format du fichier source"""
+    rng = np.random.default_rng(seed)
+    players = rng.integers(0, max(rows // 6, 1), rows)
+    values = np.array(['-', '€25k', '€50k', '€100k', '€800k', '€1.20m', '€2.50m'], dtype=object)
+    years = 1954 + players % 70
+    return pd.DataFrame({
+        'season': [f'{y % 100:02d}/{(y + 1) % 100:02d}' for y in years],
+        'season_id': years.astype(str),
+        'team': np.array([f'Team {i}' for i in range(40)], dtype=object)[rng.integers(0, 40, rows)],
+        'number': rng.integers(1, 40, rows).astype(str),
+        'player_name': np.char.add('Player ', players.astype(str)).astype(object),
+        'position': np.array(['Goalkeeper', 'Centre-Back', 'Midfielder', 'Centre-Forward'], dtype=object)[players % 4],
+        'birth_date': pd.to_datetime(1e9 * (3e8 + players * 86400.0)).strftime(BIRTH_DATE_FORMAT).to_numpy(dtype=object),
+        'nationality': 'Tunisia',
+        'market_value': values[rng.integers(0, len(values), rows)],
+    })
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Benchmark du stage effectifs sur des données synthétiques.')
+    parser.add_argument('--rows', type=int, default=500_000, help='Nombre de lignes (défaut: 500 000)')
+    args = parser.parse_args()
+
+    roster = synthetic_roster(args.rows)
+    t0 = time.perf_counter()
+    roster['start_year'] = season_start_years(roster['season'], roster['season_id'])
+    roster['birth_date'] = parse_birth_dates(roster['birth_date'])
+    roster['market_value'] = parse_market_values(roster['market_value'])
+    team_ids = pd.factorize(roster['team'])[0] + 1
+    dplayer, dposition, fact = build_roster_tables(roster, team_ids, roster['start_year'].to_numpy('int64'))
+    elapsed = time.perf_counter() - t0
+    print(f'{args.rows:,} roster rows -> {len(dplayer):,} players, {len(fact):,} team-player-season rows '
+          f'in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)')
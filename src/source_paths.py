@@ -0,0 +1,174 @@
+"""
+Analyse des chemins de fichiers sources : compétition et saison d'un fichier de matches.
+
+Table de règles (regex précompilées) appliquée au nom de fichier, la compétition
+étant déduite du dossier parent ; le résultat est mis en cache par chemin.
+
+Exemples :
+  .../matches/ligue_1/tunisia_ligue_professionnelle_1_2019_2020.csv -> ligue_1, 2019-20, 2019, 2020
+  .../matches/cup/tunisia_tunisia_cup_tunisia_cup_2012.csv           -> cup, 2012-13, 2012, 2013
+  .../matches/super_cup/super_cup_super_cup_2019.csv                 -> super_cup, 2019-20, 2019, 2020
+
+Usage:
+  from source_paths import parse_source_path, season_years, season_label
+  python src/source_paths.py --n 1000000     # benchmark sur des chemins synthétiques
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# dossiers reconnus comme compétition (le dernier du chemin l'emporte)
+COMPETITION_DIRS = {
+    'ligue_1': 'ligue_1',
+    'cup': 'cup',
+    'super_cup': 'super_cup',
+    'supercup': 'supercup',
+}
+
+# compétitions dont un nom de fichier à une seule année désigne la saison year/year+1
+SINGLE_YEAR_SEASON_COMPETITIONS = ('super_cup', 'cup')
+
+PATH_CACHE_SIZE = 65_536
+
+
+class SourceInfo(NamedTuple):
+    competition: Optional[str]
+    season: Optional[str]
+    start_year: Optional[int]
+    end_year: Optional[int]
+
+
+def _expand_year(start, short):
+    """Année de fin complète à partir de l'année de début et d'un suffixe (20 -> 2020, 01 -> 2001)"""
+    width = len(short)
+    if width >= 4:
+        return int(short)
+    end = int(str(start)[:4 - width] + short)
+    return end + 10 ** width if end < start else end
+
+
+def _two_years(m, comp):
+    # yyyy_yyyy ou yyyy-yy (2019_2020, 2000-01, 2010_2011)
+    year1, year2 = m.group(1), m.group(2)
+    season = f'{year1}-{year2[2:]}' if len(year2) == 4 else f'{year1}-{year2}'
+    start = int(year1)
+    return season, start, _expand_year(start, year2)
+
+
+def _single_year(m, comp):
+    # une seule année en fin de nom (super_cup_2019) : saison year/year+1 pour les coupes
+    year = int(m.group(1))
+    if comp in SINGLE_YEAR_SEASON_COMPETITIONS:
+        return f'{year}-{str(year + 1)[2:]}', year, year + 1
+    # ligue_1 avec une seule année : données probablement incomplètes, fin inconnue
+    return str(year), year, None
+
+
+# règles appliquées dans l'ordre au nom de fichier ; la première qui correspond l'emporte
+SEASON_RULES = [
+    (re.compile(r'(\d{4})[\-_](\d{2,4})'), _two_years),
+    (re.compile(r'(\d{4})(?:\.csv)?$'), _single_year),
+]
+
+# saison déjà normalisée (2019-20, 2019/2020, 1922–23) ou année seule
+SEASON_LABEL = re.compile(r'^\s*(\d{4})(?:\s*[\-_/\u2013]\s*(\d{2,4}))?\s*$')
+
+
+def parse_source_path_uncached(path):
+    """`SourceInfo` d'un chemin de fichier de matches (sans cache)"""
+    parts = str(path).replace('\\', '/').split('/')
+    comp = None
+    for part in reversed(parts):
+        comp = COMPETITION_DIRS.get(part.lower())
+        if comp is not None:
+            break
+    fname = parts[-1]
+    for pattern, build in SEASON_RULES:
+        m = pattern.search(fname)
+        if m:
+            return SourceInfo(comp, *build(m, comp))
+    return SourceInfo(comp, None, None, None)
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def _parse_cached(path):
+    return parse_source_path_uncached(path)
+
+
+def parse_source_path(path):
+    """`SourceInfo(competition, season, start_year, end_year)` d'un chemin, mis en cache par chemin"""
+    return _parse_cached(str(path))
+
+
+@lru_cache(maxsize=4096)
+def season_years(season):
+    """(start_year, end_year) d'un libellé de saison ('2019-20' -> (2019, 2020)) ; None si inconnu"""
+    m = SEASON_LABEL.match(str(season))
+    if not m:
+        return None, None
+    start = int(m.group(1))
+    return start, (_expand_year(start, m.group(2)) if m.group(2) else None)
+
+
+@lru_cache(maxsize=4096)
+def season_label(text, competition=None):
+    """(libellé D_Season, start_year, end_year) d'une saison écrite librement.
+
+    '1922–23' -> ('1922-23', 1922, 1923) ; une année seule suit la règle des noms
+    de fichiers : saison year/year+1 pour les coupes, année seule sinon.
+    """
+    start, end = season_years(text)
+    if start is None:
+        return None, None, None
+    if end is None:
+        if competition not in SINGLE_YEAR_SEASON_COMPETITIONS:
+            return str(start), start, None
+        end = start + 1
+    return f'{start}-{str(end)[2:]}', start, end
+
+
+def synthetic_paths(n, seed=0):
+    """`n` chemins synthétiques aux formats du dossier data/matches"""
+    import random
+    rnd = random.Random(seed)
+    templates = [
+        'data/matches/ligue_1/tunisia_ligue_professionnelle_1_{y}_{y1}.csv',
+        'data/matches/cup/tunisia_tunisia_cup_tunisia_cup_{y}_{y1}.csv',
+        'data/matches/cup/tunisia_tunisia_cup_tunisia_cup_{y}.csv',
+        'data/matches/super_cup/super_cup_super_cup_{y}.csv',
+        'C:\\data\\matches\\ligue_1\\tunisia_ligue_professionnelle_1_{y}-{s}.csv',
+    ]
+    out = []
+    for i in range(n):
+        y = rnd.randrange(1920, 2030)
+        out.append(f'archive_{i % 5000}/' + rnd.choice(templates).format(y=y, y1=y + 1, s=str(y + 1)[2:]))
+    return out
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Benchmark du parseur de chemins sources.')
+    parser.add_argument('--n', type=int, default=1_000_000, help='Nombre de chemins synthétiques (défaut: 1 000 000)')
+    args = parser.parse_args()
+
+    paths = synthetic_paths(args.n)
+    distinct = len(set(paths))
+    print(f'{args.n:,} synthetic paths ({distinct:,} distinct)')
+
+    t0 = time.perf_counter()
+    for p in paths:
+        parse_source_path_uncached(p)
+    elapsed = time.perf_counter() - t0
+    print(f'  uncached : {elapsed:.2f}s ({args.n / elapsed:,.0f} paths/s)')
+
+    # catalogue re-scanné : les mêmes chemins reviennent d'un scan à l'autre
+    catalog = paths[:PATH_CACHE_SIZE // 2]
+    _parse_cached.cache_clear()
+    t0 = time.perf_counter()
+    for i in range(args.n):
+        parse_source_path(catalog[i % len(catalog)])
+    elapsed = time.perf_counter() - t0
+    print(f'  cached   : {elapsed:.2f}s ({args.n / elapsed:,.0f} paths/s, {_parse_cached.cache_info()})')
@@ -0,0 +1,213 @@
+"""
+Classements de championnat après chaque journée (F_Standings_Round).
+
+À partir de F_Match, pour chaque (compétition, saison) :
+- la journée est lue dans `stage` ('ROUND 3' -> 3) ; les autres phases sont ignorées
+- deux équipes qui rejouent un numéro de journée ouvrent une nouvelle phase (poules puis play-offs,
+  chaque phase recommençant à 'ROUND 1') ; dans une phase, les poules sont les groupes
+  d'équipes qui se rencontrent (composantes connexes)
+- chaque équipe de la poule a une ligne par journée (cumul reporté si elle n'a pas joué)
+- cumuls (matches, victoires, nuls, défaites, buts, points) en une passe `cumsum`
+- position par tri lexicographique sur des critères de départage configurables
+
+Usage:
+  from standings import build_standings
+  python src/standings.py --matches 1000000     # benchmark sur des matches synthétiques
+"""
+
+import numpy as np
+import pandas as pd
+
+ROUND_PATTERN = r'^\s*ROUND\s+(\d+)\s*$'
+
+# critère de départage -> tri croissant ?
+TIE_BREAKERS = {
+    'points': False,
+    'goal_diff': False,
+    'goals_for': False,
+    'wins': False,
+    'goals_against': True,
+    'losses': True,
+}
+DEFAULT_TIE_BREAKERS = ('points', 'goal_diff', 'goals_for')
+
+STANDINGS_COLUMNS = ['id_competition', 'season_id', 'phase', 'pool', 'round', 'id_team', 'position', 'played',
+                     'wins', 'draws', 'losses', 'goals_for', 'goals_against', 'goal_diff', 'points']
+
+
+def parse_tie_breakers(text):
+    """'points,goal_diff,wins' -> ('points', 'goal_diff', 'wins') ; ValueError si critère inconnu"""
+    keys = tuple(k.strip() for k in str(text).split(',') if k.strip())
+    unknown = [k for k in keys if k not in TIE_BREAKERS]
+    if unknown:
+        raise ValueError(f"Critère(s) de départage inconnu(s): {unknown} (possibles: {', '.join(TIE_BREAKERS)})")
+    return keys
+
+
+def _round_results(fmatch, competitions, points_scheme, season_points, ddate=None):
+    """Une ligne par équipe et par match de journée : round, buts, résultat, points"""
+    fm = fmatch
+    if competitions is not None:
+        fm = fm[fm['id_competition'].isin(list(competitions))]
+    # numéro de journée extrait sur les libellés distincts
+    codes, stages = pd.factorize(fm['stage'].astype('string'))
+    numbers = pd.to_numeric(pd.Series(stages, dtype='string').str.extract(ROUND_PATTERN)[0], errors='coerce')
+    rounds = pd.Series(np.append(numbers.to_numpy('float64', na_value=np.nan), np.nan)[codes], index=fm.index)
+    # score -1 : match pas encore joué (ou forfait sans score)
+    keep = (rounds.notna() & fm['result_home'].ge(0) & fm['result_away'].ge(0)
+            & (fm['id_home_team'] != -1) & (fm['id_away_team'] != -1) & (fm['season_id'] != -1))
+    fm, rounds = fm[keep], rounds[keep].astype('int64')
+
+    if season_points:
+        schemes = fm['season_id'].map(lambda sid: season_points.get(sid, points_scheme))
+        win, draw, loss = (schemes.str[i].to_numpy() for i in range(3))
+    else:
+        win, draw, loss = points_scheme
+
+    def side(team, goals_for, goals_against):
+        gf = fm[goals_for].to_numpy('int64')
+        ga = fm[goals_against].to_numpy('int64')
+        return pd.DataFrame({
+            'id_competition': fm['id_competition'].to_numpy('int64'),
+            'season_id': fm['season_id'].to_numpy('int64'),
+            'round': rounds.to_numpy(),
+            'id_team': fm[team].to_numpy('int64'),
+            'played': 1,
+            'wins': (gf > ga).astype('int64'),
+            'draws': (gf == ga).astype('int64'),
+            'losses': (gf < ga).astype('int64'),
+            'goals_for': gf,
+            'goals_against': ga,
+            'points': np.where(gf > ga, win, np.where(gf == ga, draw, loss)).astype('int64'),
+        })
+
+    home = side('id_home_team', 'result_home', 'result_away')
+    away = side('id_away_team', 'result_away', 'result_home')
+    dates = None
+    if ddate is not None:
+        by_id = pd.Series(pd.to_datetime(ddate['date']).to_numpy(), index=ddate['id_date'].to_numpy())
+        dates = fm['id_date'].map(by_id).to_numpy('datetime64[ns]')
+    phase = _phases(home, away, dates)
+    home['phase'] = away['phase'] = phase
+    home['pool'] = away['pool'] = _pools(home, away, phase)
+    return pd.concat([home, away], ignore_index=True)
+
+
+def _phases(home, away, dates=None):
+    """Phase (1, 2, ...) de chaque match : n-ième fois que les deux équipes jouent ce numéro de journée
+
+    Un match reporté garde sa phase tant que l'une des deux équipes n'a pas encore joué ce
+    numéro ; une saison n'a que les phases ouvertes par une nouvelle 'ROUND 1', ce qui écarte
+    les journées mal numérotées dans la source. Les matches sont pris dans l'ordre de `dates`,
+    dans l'ordre des lignes sans dates.
+    """
+    n = len(home)
+    order = np.argsort(dates, kind='stable') if dates is not None else np.arange(n)
+    keys = ['id_competition', 'season_id', 'id_team', 'round']
+    # côtés domicile et extérieur entrelacés dans l'ordre chronologique des matches
+    both = np.stack([order, order + n], axis=1).ravel()
+    sides = pd.concat([home[keys], away[keys]], ignore_index=True).iloc[both]
+    seen = np.empty(2 * n, dtype='int64')
+    seen[both] = sides.groupby(keys, sort=False).cumcount().to_numpy()
+    phase = np.minimum(seen[:n], seen[n:]) + 1
+    season = [home['id_competition'], home['season_id']]
+    opened = pd.Series(np.where(home['round'].to_numpy() == 1, phase, 1)).groupby(season).transform('max')
+    return np.minimum(phase, opened.to_numpy())
+
+
+def _pools(home, away, phase):
+    """Poule (1, 2, ...) de chaque match dans sa (compétition, saison, phase) : composantes connexes
+
+    Propagation vectorisée du plus petit numéro d'équipe le long des matches, jusqu'à stabilité.
+    """
+    season = pd.DataFrame({'c': home['id_competition'], 's': home['season_id'], 'p': phase}).groupby(
+        ['c', 's', 'p'], sort=False).ngroup().to_numpy('int64')
+    teams = np.concatenate([home['id_team'].to_numpy('int64'), away['id_team'].to_numpy('int64')])
+    codes, _ = pd.factorize(np.concatenate([season, season]) * (teams.max() + 1 if len(teams) else 1) + teams)
+    n = len(home)
+    h, a = codes[:n], codes[n:]
+    label = np.arange(codes.max() + 1 if n else 0)
+    while True:
+        low = np.minimum(label[h], label[a])
+        new = label.copy()
+        np.minimum.at(new, h, low)
+        np.minimum.at(new, a, low)
+        new = new[new]
+        if np.array_equal(new, label):
+            break
+        label = new
+    # numérotation 1, 2, ... dans chaque (compétition, saison, phase), dans l'ordre du plus petit sommet
+    pools = pd.Series(label[h]).groupby(season).rank(method='dense').astype('int64')
+    return pools.to_numpy()
+
+
+def build_standings(fmatch, competitions=None, points_scheme=(3, 1, 0), season_points=None,
+                    tie_breakers=DEFAULT_TIE_BREAKERS, ddate=None):
+    """F_Standings_Round : classement de chaque équipe après chaque journée.
+
+    `competitions` limite aux id_competition donnés (championnats) ; `points_scheme`
+    et `season_points` ont le même sens que pour F_Team_Season ; `tie_breakers`
+    ordonne les critères de départage (cf. `TIE_BREAKERS`), l'id_team départageant en dernier ;
+    `ddate` (D_Date) date les matches pour découper les phases.
+    """
+    res = _round_results(fmatch, competitions, points_scheme, season_points, ddate)
+    if res.empty:
+        return pd.DataFrame(columns=STANDINGS_COLUMNS)
+    keys = ['id_competition', 'season_id', 'phase', 'pool']
+    stats = ['played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against', 'points']
+    per_round = res.groupby(keys + ['id_team', 'round'], as_index=False)[stats].sum()
+
+    # grille équipes x journées de chaque poule : le cumul est reporté les journées sans match
+    teams = per_round[keys + ['id_team']].drop_duplicates()
+    rounds = per_round[keys + ['round']].drop_duplicates()
+    grid = teams.merge(rounds, on=keys)
+    table = grid.merge(per_round, on=keys + ['id_team', 'round'], how='left')
+    table[stats] = table[stats].fillna(0).astype('int64')
+    table = table.sort_values(keys + ['id_team', 'round'], kind='stable').reset_index(drop=True)
+    table[stats] = table.groupby(keys + ['id_team'], sort=False)[stats].cumsum()
+    table['goal_diff'] = table['goals_for'] - table['goals_against']
+
+    order = list(tie_breakers) + ['id_team']
+    ascending = [TIE_BREAKERS[k] for k in tie_breakers] + [True]
+    table = table.sort_values(keys + ['round'] + order, ascending=[True] * (len(keys) + 1) + ascending, kind='stable')
+    table['position'] = table.groupby(keys + ['round'], sort=False).cumcount() + 1
+    return table[STANDINGS_COLUMNS].reset_index(drop=True)
+
+
+def synthetic_matches(n, teams=16, seed=0):
+    """`n` matches de championnat synthétiques : saisons aller-retour de `teams` équipes (méthode du cercle)"""
+    rng = np.random.default_rng(seed)
+    half = teams // 2
+    per_leg = (teams - 1) * half
+    idx = np.arange(n)
+    season, in_season = idx // (2 * per_leg), idx % (2 * per_leg)
+    leg, rnd, slot = in_season // per_leg, in_season % per_leg // half, in_season % half
+    first = np.where(slot == 0, teams - 1, (rnd + slot) % (teams - 1))
+    second = (rnd - slot) % (teams - 1)
+    home, away = np.where(leg == 0, first, second), np.where(leg == 0, second, first)
+    offset = (season % 3) * teams + 1
+    return pd.DataFrame({
+        'id_competition': 2,
+        'season_id': season + 1,
+        'id_date': season * 1000 + leg * 100 + rnd,
+        'id_home_team': home + offset,
+        'id_away_team': away + offset,
+        'stage': pd.Categorical(np.char.add('ROUND ', (leg * (teams - 1) + rnd + 1).astype(str))),
+        'result_home': rng.poisson(1.3, n),
+        'result_away': rng.poisson(1.0, n),
+    })
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Benchmark du calcul des classements par journée.')
+    parser.add_argument('--matches', type=int, default=1_000_000, help='Nombre de matches synthétiques (défaut: 1 000 000)')
+    args = parser.parse_args()
+
+    fm = synthetic_matches(args.matches)
+    t0 = time.perf_counter()
+    out = build_standings(fm)
+    elapsed = time.perf_counter() - t0
+    print(f'{args.matches:,} matches -> {len(out):,} standings rows in {elapsed:.2f}s')
@@ -1,32 +1,70 @@
 """
-Outils pour valider les CSV contre les définitions de schéma.
+Outils pour valider les CSV (et fichiers/datasets Parquet) contre les définitions de schéma.
 Usage:
   from src.config.schema_definitions import SCHEMA_DEFINITIONS
-  from src.tools.validate_schema import validate_csv_file
+  from src.tools.validate_schema import validate_csv_file, validate_parquet_file, validate_all_in_directory
 
   validate_csv_file("warehouse_output/D_Team_clean.csv", "D_Team")
+  validate_parquet_file("warehouse_output/F_Match.parquet", "F_Match")
+  validate_all_in_directory("warehouse_output", workers=4)
+
+  python -m src.tools.validate_schema --dir warehouse_output --report validation.json
 
 Le script signale :
-- colonnes manquantes requises
+- colonnes manquantes requises (lecture de l'en-tête seul)
 - colonnes supplémentaires (non bloquant)
+- valeurs d'un mauvais type (`COLUMN_TYPES`) et valeurs nulles des colonnes requises,
+  en lisant le corps du fichier par blocs et seulement les colonnes utiles
+- clés étrangères absentes de la table référencée (`FOREIGN_KEYS`), par ensembles de clés hachés ;
+  clés en double dans les colonnes référencées
+
+Les fichiers d'un répertoire sont validés en parallèle (un processus par fichier), puis les clés
+étrangères sont vérifiées à partir des clés collectées pendant la lecture (une seule passe par fichier).
 
-Retourne dict {"ok": bool, "errors": [...], "warnings": [...]}.
+Retourne dict {"ok": bool, "errors": [...], "warnings": [...]} par fichier.
 """
 
+import csv
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
 import pandas as pd
-from typing import Dict, List
-from ..config.schema_definitions import SCHEMA_DEFINITIONS
+from ..config.schema_definitions import SCHEMA_DEFINITIONS, FILENAME_TO_TABLE, COLUMN_TYPES, FOREIGN_KEYS, FILE_COLUMNS
+
+CHUNK_SIZE = 200_000
+MAX_EXAMPLES = 5
 
 
 def _normalize_col(c: str) -> str:
     return c.strip().lower().replace(' ', '_')
 
 
+def _result(errors=None, warnings=None, **extra) -> Dict:
+    errors, warnings = errors or [], warnings or []
+    return {"ok": len(errors) == 0, "errors": errors, "warnings": warnings, **extra}
+
+
+def table_for_file(fname: str) -> Optional[str]:
+    """Table cible d'un fichier : alias de FILENAME_TO_TABLE, sinon nom de table (sans `_clean`)"""
+    stem = os.path.splitext(os.path.basename(fname.rstrip('/')))[0].lower()
+    for table, aliases in FILENAME_TO_TABLE.items():
+        if stem in {os.path.splitext(a.lower())[0] for a in aliases}:
+            return table
+    short = stem[:-len('_clean')] if stem.endswith('_clean') else stem
+    for table in SCHEMA_DEFINITIONS:
+        if table.lower() == short:
+            return table
+    return None
+
+
 def validate_dataframe_columns(df: pd.DataFrame, table: str) -> Dict:
     table_def = SCHEMA_DEFINITIONS.get(table)
     if not table_def:
-        return {"ok": False, "errors": [f"Table '{table}' non définie dans SCHEMA_DEFINITIONS."], "warnings": []}
+        return _result([f"Table '{table}' non définie dans SCHEMA_DEFINITIONS."])
 
     df_cols = {_normalize_col(c) for c in df.columns}
     required = {c.lower() for c in table_def.get('required', [])}
@@ -42,63 +80,265 @@ def validate_dataframe_columns(df: pd.DataFrame, table: str) -> Dict:
     if extra:
         warnings.append(f"Colonnes non attendues (extra): {extra}")
 
-    return {"ok": len(errors) == 0, "errors": errors, "warnings": warnings}
+    return _result(errors, warnings)
 
 
-def validate_csv_file(path: str, table: str) -> Dict:
+# -- lecture ------------------------------------------------------------------
+
+def read_csv_columns(path: str) -> List[str]:
+    """Colonnes d'un CSV (première ligne seule)."""
+    for encoding in ('utf-8-sig', 'latin1'):
+        try:
+            with open(path, newline='', encoding=encoding) as fh:
+                return next(csv.reader(fh), [])
+        except UnicodeDecodeError:
+            continue
+    return []
+
+
+def read_parquet_columns(path: str) -> List[str]:
+    """Colonnes d'un fichier Parquet ou d'un dataset partitionné (schéma seul, sans lire les données)."""
+    import pyarrow.dataset as ds
+    return ds.dataset(path, format='parquet', partitioning='hive').schema.names
+
+
+def iter_chunks(path: str, columns: List[str], chunksize: int = CHUNK_SIZE, text_columns=()):
+    """Blocs (DataFrame) des `columns` du fichier, CSV ou Parquet par lots
+
+    Les colonnes CSV numériques sont typées par le lecteur C (rapide) ; `text_columns` restent du texte.
+    """
+    if not columns:
+        return
+    if path.lower().rstrip('/').endswith('.parquet'):
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        for batch in dataset.to_batches(columns=columns, batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(path, usecols=columns, dtype={c: str for c in text_columns}, chunksize=chunksize,
+                           encoding_errors='replace')
+
+
+def _invalid(values: pd.Series, kind: str) -> pd.Series:
+    """Masque des valeurs non nulles qui ne sont pas du type `kind`"""
+    if kind == 'date':
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return pd.Series(False, index=values.index)
+        parsed = pd.to_datetime(values, errors='coerce', format='ISO8601')
+        return parsed.isna()
+    if pd.api.types.is_bool_dtype(values):
+        return pd.Series(True, index=values.index)
+    if pd.api.types.is_integer_dtype(values) or (kind == 'float' and pd.api.types.is_float_dtype(values)):
+        return pd.Series(False, index=values.index)
+    # colonne non typée par le lecteur : au moins une valeur n'est pas un nombre
+    parsed = pd.to_numeric(values, errors='coerce')
+    bad = parsed.isna()
+    if kind == 'int':
+        bad |= parsed.mod(1).ne(0) & parsed.notna()
+    return bad
+
+
+def _key_values(values: pd.Series, kind: Optional[str]):
+    """Valeurs distinctes non nulles d'une colonne de clé, normalisées ('3', '3.0' et 3 -> 3)"""
+    values = values.dropna()
+    if kind == 'int':
+        values = pd.to_numeric(values, errors='coerce').dropna().astype('int64')
+    else:
+        values = values.astype(str)
+    return pd.unique(values.to_numpy())
+
+
+# -- validation d'un fichier --------------------------------------------------
+
+def scan_file(path: str, table: str, key_columns=(), chunksize: int = CHUNK_SIZE) -> Dict:
+    """Valide un fichier (colonnes, types, nulls) et collecte les clés distinctes de `key_columns`
+
+    Le résultat porte `rows`, `seconds` et `keys` ({colonne: (valeurs distinctes, nombre de valeurs)}).
+    """
+    t0 = time.perf_counter()
     if not os.path.exists(path):
-        return {"ok": False, "errors": [f"Fichier non trouvé: {path}"], "warnings": []}
+        return _result([f"Fichier non trouvé: {path}"], table=table)
+    is_parquet = path.lower().rstrip('/').endswith('.parquet')
+    try:
+        columns = read_parquet_columns(path) if is_parquet else read_csv_columns(path)
+    except ImportError:
+        return _result(["pyarrow est requis pour valider les fichiers Parquet."], table=table)
+    except Exception as e:
+        return _result([f"Erreur lecture {'Parquet' if is_parquet else 'CSV'}: {e}"], table=table)
 
+    res = validate_dataframe_columns(pd.DataFrame(columns=columns), table)
+    res['table'] = table
+    table_def = SCHEMA_DEFINITIONS.get(table)
+    if not table_def:
+        return res
+
+    by_name = {_normalize_col(c): c for c in columns}
+    not_null = {c.lower() for c in table_def.get('required', [])} - {c.lower() for c in table_def.get('nullable', [])}
+    keys = {_normalize_col(c) for c in key_columns}
+    wanted = [c for c in by_name if c in COLUMN_TYPES or c in not_null or c in keys]
+
+    bad_type = {c: [0, []] for c in wanted if c in COLUMN_TYPES}
+    nulls = {c: 0 for c in wanted if c in not_null}
+    collected = {c: ([], 0) for c in wanted if c in keys}
+    rows = 0
     try:
-        df = pd.read_csv(path)
+        text = [by_name[c] for c in wanted if COLUMN_TYPES.get(c) not in ('int', 'float')]
+        for chunk in iter_chunks(path, [by_name[c] for c in wanted], chunksize, text):
+            chunk.columns = [_normalize_col(c) for c in chunk.columns]
+            rows += len(chunk)
+            for col in nulls:
+                nulls[col] += int(chunk[col].isna().sum())
+            for col, counter in bad_type.items():
+                values = chunk[col].dropna()
+                bad = values[_invalid(values, COLUMN_TYPES[col]).to_numpy()]
+                counter[0] += len(bad)
+                counter[1].extend(bad.head(MAX_EXAMPLES - len(counter[1])).tolist())
+            for col, (parts, count) in collected.items():
+                parts.append(_key_values(chunk[col], COLUMN_TYPES.get(col)))
+                collected[col] = (parts, count + int(chunk[col].notna().sum()))
     except Exception as e:
-        return {"ok": False, "errors": [f"Erreur lecture CSV: {e}"], "warnings": []}
+        res['errors'].append(f"Erreur lecture des données: {e}")
+
+    for col, count in nulls.items():
+        if count:
+            res['errors'].append(f"Colonne {col}: {count} valeur(s) nulle(s)")
+    for col, (count, examples) in bad_type.items():
+        if count:
+            res['errors'].append(f"Colonne {col}: {count} valeur(s) non conforme(s) au type {COLUMN_TYPES[col]} "
+                                 f"(ex. {[str(v) for v in examples]})")
+    res['keys'] = {col: (pd.unique(np.concatenate(parts)) if parts else np.empty(0), count)
+                   for col, (parts, count) in collected.items()}
+    res['rows'] = rows
+    res['seconds'] = round(time.perf_counter() - t0, 3)
+    res['ok'] = len(res['errors']) == 0
+    return res
+
+
+def validate_csv_file(path: str, table: str) -> Dict:
+    res = scan_file(path, table)
+    res.pop('keys', None)
+    return res
+
+
+def validate_parquet_file(path: str, table: str) -> Dict:
+    return validate_csv_file(path, table)
+
+
+# -- répertoire ---------------------------------------------------------------
+
+def _file_column(table: str, col: str) -> str:
+    """Nom dans les sorties de l'ETL d'une colonne de table (cf. FILE_COLUMNS)"""
+    return FILE_COLUMNS.get(table, {}).get(col, col)
 
-    return validate_dataframe_columns(df, table)
 
+def _referenced_columns() -> Dict[str, set]:
+    """{table: colonnes (noms des fichiers) référencées par une clé étrangère}"""
+    refs = {}
+    for fks in FOREIGN_KEYS.values():
+        for _, ref_table, ref_col in fks:
+            refs.setdefault(ref_table, set()).add(_file_column(ref_table, ref_col))
+    return refs
 
-def validate_all_in_directory(directory: str) -> Dict[str, Dict]:
-    """Parcours `directory` et tente de valider chaque CSV en le mappant à une table via le nom de fichier."""
-    results = {}
-    for fname in os.listdir(directory):
-        if not fname.lower().endswith('.csv'):
+
+def check_foreign_keys(results: Dict[str, Dict]) -> None:
+    """Ajoute aux résultats les erreurs de clés étrangères et de clés en double (clés de `scan_file`)
+
+    Une table présente dans plusieurs fichiers (ex. CSV et Parquet) est référencée par l'union de leurs clés.
+    """
+    scanned = [r for r in results.values() if r.get('table') and 'keys' in r]
+    refs = _referenced_columns()
+    parts = {}
+    for res in scanned:
+        for col in refs.get(res['table'], ()):
+            if col not in res['keys']:
+                continue
+            values, count = res['keys'][col]
+            parts.setdefault((res['table'], col), []).append(values)
+            if len(values) < count:
+                res['errors'].append(f"Colonne {col}: {count - len(values)} clé(s) en double")
+    index = {key: pd.Index(pd.unique(np.concatenate(arrays))) for key, arrays in parts.items()}
+
+    for res in scanned:
+        for col, ref_table, ref_col in FOREIGN_KEYS.get(res['table'], []):
+            if col not in res['keys']:
+                continue
+            ref = index.get((ref_table, _file_column(ref_table, ref_col)))
+            if ref is None:
+                res['warnings'].append(f"Clé étrangère {col} -> {ref_table}.{ref_col} non vérifiée (table absente)")
+                continue
+            values = pd.Index(res['keys'][col][0])
+            missing = values[~values.isin(ref)]
+            if len(missing):
+                res['errors'].append(f"Clé étrangère {col} -> {ref_table}.{ref_col}: {len(missing)} valeur(s) "
+                                     f"absente(s) (ex. {[str(v) for v in missing[:MAX_EXAMPLES]]})")
+
+
+def _scan_task(task):
+    path, table, key_columns, chunksize = task
+    return scan_file(path, table, key_columns, chunksize)
+
+
+def validate_all_in_directory(directory: str, workers: Optional[int] = None, chunksize: int = CHUNK_SIZE,
+                              foreign_keys: bool = True) -> Dict[str, Dict]:
+    """Valide chaque CSV/Parquet de `directory` (table déduite du nom de fichier), en parallèle si `workers > 1`.
+
+    `workers` vaut par défaut le nombre de processeurs ; `foreign_keys=False` saute les clés étrangères.
+    """
+    refs = _referenced_columns() if foreign_keys else {}
+    results, tasks = {}, []
+    for fname in sorted(os.listdir(directory)):
+        if not fname.lower().endswith(('.csv', '.parquet')):
             continue
-        key = os.path.splitext(fname)[0].lower()
-        # tenter de deviner la table
-        guessed_table = None
-        for table_name, patterns in SCHEMA_DEFINITIONS.items():
-            # on ne mappe pas ici; patterns lives in FILENAME_TO_TABLE (if needed)
-            pass
-        # fallback: table name equals key (normalisé en majuscule Camel)
-        # ex: d_team_clean -> D_Team
-        candidate = ''.join([p.capitalize() for p in key.split('_')])
-        # try different common forms
-        # simple heuristic: check SCHEMA_DEFINITIONS keys by lowercase match
-        for table_name in SCHEMA_DEFINITIONS.keys():
-            if table_name.lower() == candidate.lower():
-                guessed_table = table_name
-                break
-        # if not found, try removing suffixes like _clean or _all
-        if not guessed_table:
-            short = key.replace('_clean', '').replace('_alltime', '').replace('_by_season','')
-            for table_name in SCHEMA_DEFINITIONS.keys():
-                if table_name.lower() == short.lower():
-                    guessed_table = table_name
-                    break
-        if not guessed_table:
-            results[fname] = {"ok": False, "errors": ["Impossible de deviner la table cible depuis le nom de fichier."], "warnings": []}
+        table = table_for_file(fname)
+        if not table:
+            results[fname] = _result(["Impossible de deviner la table cible depuis le nom de fichier."])
             continue
-        results[fname] = validate_csv_file(os.path.join(directory, fname), guessed_table)
-    return results
+        keys = set(refs.get(table, ())) | {col for col, _, _ in FOREIGN_KEYS.get(table, [])} if foreign_keys else set()
+        tasks.append((fname, (os.path.join(directory, fname), table, sorted(keys), chunksize)))
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            scanned = list(pool.map(_scan_task, [task for _, task in tasks]))
+    else:
+        scanned = [_scan_task(task) for _, task in tasks]
+    for (fname, _), res in zip(tasks, scanned):
+        results[fname] = res
+
+    if foreign_keys:
+        check_foreign_keys(results)
+    for res in results.values():
+        res.pop('keys', None)
+        res['ok'] = len(res['errors']) == 0
+    return dict(sorted(results.items()))
+
+
+def write_report(results: Dict[str, Dict], path: str, directory: str = None, seconds: float = None) -> None:
+    """Rapport JSON : {"ok", "directory", "seconds", "files": {fichier: résultat}}"""
+    report = {
+        "ok": all(r.get('ok') for r in results.values()),
+        "directory": directory,
+        "seconds": seconds,
+        "files": results,
+    }
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=1, ensure_ascii=False)
 
 
 if __name__ == '__main__':
     import argparse
-    parser = argparse.ArgumentParser(description='Valide les CSV d\'un répertoire contre le schéma attendu.')
-    parser.add_argument('--dir', default='warehouse_output', help='Dossier contenant les CSV à valider (défaut: warehouse_output)')
+    parser = argparse.ArgumentParser(description='Valide les CSV/Parquet d\'un répertoire contre le schéma attendu.')
+    parser.add_argument('--dir', default='warehouse_output', help='Dossier contenant les CSV/Parquet à valider (défaut: warehouse_output)')
+    parser.add_argument('--workers', type=int, default=None, help='Processus en parallèle (défaut: nombre de processeurs)')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE, help=f'Lignes lues par bloc (défaut: {CHUNK_SIZE})')
+    parser.add_argument('--no-foreign-keys', action='store_true', help='Ne pas vérifier les clés étrangères')
+    parser.add_argument('--report', default=None, help='Écrit le rapport JSON dans ce fichier')
     args = parser.parse_args()
 
-    res = validate_all_in_directory(args.dir)
+    t0 = time.perf_counter()
+    res = validate_all_in_directory(args.dir, workers=args.workers, chunksize=args.chunksize,
+                                    foreign_keys=not args.no_foreign_keys)
+    elapsed = round(time.perf_counter() - t0, 3)
     any_errors = False
     for f, r in res.items():
         print(f"== {f} ==")
@@ -113,6 +353,10 @@ if __name__ == '__main__':
             print("  OK")
         print()
 
+    if args.report:
+        write_report(res, args.report, directory=args.dir, seconds=elapsed)
+        print(f"Rapport JSON écrit dans {args.report}")
+    print(f"{len(res)} fichier(s) validé(s) en {elapsed:.2f}s")
     if any_errors:
         print("Validation échouée: des erreurs ont été détectées.")
         raise SystemExit(2)
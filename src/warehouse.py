@@ -0,0 +1,219 @@
+"""
+Base analytique embarquée sur les sorties de l'ETL (warehouse_output/), sans serveur.
+
+- moteur local : DuckDB s'il est installé, sinon SQLite (stdlib)
+- chaque sortie D_* / F_* (CSV, sinon Parquet) devient une table ; le suffixe `_clean`
+  est retiré pour retrouver les noms de sql/schema.sql (D_Team_clean.csv -> D_Team)
+- les index et la vue V_Team_Season sont repris de sql/schema.sql
+- requêtes paramétrées (`?`) avec cache des résultats par (requête, paramètres, version des données) ;
+  la version est l'empreinte (nom, taille, date) des fichiers sources : un nouveau run de l'ETL
+  invalide le cache au prochain `refresh()`
+
+Usage:
+  from warehouse import Warehouse
+  wh = Warehouse('warehouse_output')
+  wh.query('SELECT * FROM V_Team_Season WHERE id_team = ?', (70,))
+  wh.named('team_seasons', 70)
+  python src/warehouse.py "SELECT COUNT(*) FROM F_Match" --dir warehouse_output
+"""
+
+import re
+import time
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+SCHEMA_FILE = ROOT / 'sql' / 'schema.sql'
+
+TABLE_PREFIXES = ('D_', 'F_')
+QUERY_CACHE_SIZE = 256
+
+INDEX_PATTERN = re.compile(r'CREATE\s+INDEX\s+(\w+)\s+ON\s+(\w+)\s*\(([^)]*)\)\s*;', re.IGNORECASE)
+VIEW_PATTERN = re.compile(r'CREATE\s+(?:OR\s+ALTER\s+)?VIEW\s+(\w+)\s+AS\s+(.*?);', re.IGNORECASE | re.DOTALL)
+
+# requêtes fréquentes des tableaux de bord (paramètres positionnels `?`)
+QUERIES = {
+    'team_seasons': 'SELECT * FROM V_Team_Season WHERE id_team = ? ORDER BY season_id',
+    'season_table': 'SELECT * FROM V_Team_Season WHERE season_id = ? ORDER BY points DESC, goals_diff DESC',
+    'team_matches': ('SELECT * FROM F_Match WHERE id_home_team = ? OR id_away_team = ? '
+                     'ORDER BY id_date DESC LIMIT ?'),
+    'standings_after_round': ('SELECT * FROM F_Standings_Round WHERE season_id = ? AND round = ? '
+                              'ORDER BY phase, pool, position'),
+    'cube_level': 'SELECT * FROM F_Team_Cube WHERE grouping = ?',
+}
+
+
+def table_name(stem):
+    """Nom de table d'une sortie : D_Team_clean -> D_Team"""
+    return stem[:-len('_clean')] if stem.endswith('_clean') else stem
+
+
+def schema_objects(schema_file=SCHEMA_FILE):
+    """(index, vues) de sql/schema.sql : [(nom, table, colonnes)], [(nom, SELECT)]"""
+    text = Path(schema_file).read_text(encoding='utf-8')
+    text = re.sub(r'--[^\n]*', '', text)
+    indexes = [(name, table, ', '.join(c.strip() for c in cols.split(','))) for name, table, cols in INDEX_PATTERN.findall(text)]
+    views = [(name, body.strip()) for name, body in VIEW_PATTERN.findall(text)]
+    return indexes, views
+
+
+def available_engine():
+    """'duckdb' s'il est installé, sinon 'sqlite'"""
+    try:
+        import duckdb  # noqa: F401
+        return 'duckdb'
+    except ImportError:
+        return 'sqlite'
+
+
+class Warehouse:
+    """Sorties de l'ETL ouvertes comme une base analytique locale, avec cache de requêtes"""
+
+    def __init__(self, output_dir='warehouse_output', engine='auto', schema_file=SCHEMA_FILE,
+                 cache_size=QUERY_CACHE_SIZE):
+        self.output_dir = Path(output_dir)
+        self.engine = available_engine() if engine == 'auto' else engine
+        self.schema_file = schema_file
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = self.misses = 0
+        self.conn = None
+        self.tables = {}
+        self.version = None
+        self.refresh(force=True)
+
+    # -- sources ----------------------------------------------------------
+
+    def sources(self):
+        """{table: chemin} des sorties D_* / F_* (le CSV l'emporte sur le Parquet)"""
+        found = {}
+        for path in sorted(self.output_dir.glob('*.parquet')) + sorted(self.output_dir.glob('*.csv')):
+            if path.stem.startswith(TABLE_PREFIXES):
+                found[table_name(path.stem)] = path
+        return found
+
+    def data_version(self, sources=None):
+        """Empreinte des fichiers sources (nom, taille, date de modification)"""
+        h = hashlib.sha1()
+        for table, path in sorted((sources or self.sources()).items()):
+            files = sorted(path.rglob('*')) if path.is_dir() else [path]
+            for f in files:
+                st = f.stat()
+                h.update(f'{table}|{f.name}|{st.st_size}|{st.st_mtime_ns}\n'.encode())
+        return h.hexdigest()[:16]
+
+    def refresh(self, force=False):
+        """Recharge les tables si les sorties ont changé ; retourne True si rechargé"""
+        sources = self.sources()
+        version = self.data_version(sources)
+        if not force and version == self.version:
+            return False
+        t0 = time.perf_counter()
+        if self.conn is not None:
+            self.conn.close()
+        self.conn = self._connect()
+        self.tables = {}
+        for table, path in sources.items():
+            self._register(table, self._read(path))
+            self.tables[table] = path
+        self._create_schema_objects()
+        self.version = version
+        self._cache.clear()
+        print(f'Warehouse ({self.engine}): {len(self.tables)} tables loaded in {time.perf_counter() - t0:.2f}s '
+              f'(data version {version})')
+        return True
+
+    @staticmethod
+    def _read(path):
+        if path.suffix == '.csv':
+            return pd.read_csv(path, dtype={'id_match': str, 'last_id_match': str})
+        return pd.read_parquet(path)
+
+    # -- moteur -----------------------------------------------------------
+
+    def _connect(self):
+        if self.engine == 'duckdb':
+            import duckdb
+            return duckdb.connect(':memory:')
+        if self.engine == 'sqlite':
+            return sqlite3.connect(':memory:', check_same_thread=False)
+        raise ValueError(f"Moteur inconnu: {self.engine!r} (duckdb, sqlite)")
+
+    def _register(self, table, df):
+        if self.engine == 'duckdb':
+            self.conn.register('_frame', df)
+            self.conn.execute(f'CREATE TABLE {table} AS SELECT * FROM _frame')
+            self.conn.unregister('_frame')
+        else:
+            df.to_sql(table, self.conn, index=False)
+
+    def _create_schema_objects(self):
+        """Index et vues de sql/schema.sql dont les tables sont chargées"""
+        indexes, views = schema_objects(self.schema_file)
+        for name, table, cols in indexes:
+            if table in self.tables:
+                self.conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table}({cols})')
+        for name, body in views:
+            try:
+                self.conn.execute(f'CREATE VIEW {name} AS {body}')
+            except Exception as exc:  # table absente ou syntaxe propre au serveur
+                print(f'  view {name} skipped: {exc}')
+
+    # -- requêtes ---------------------------------------------------------
+
+    def query(self, sql, params=()):
+        """Résultat (DataFrame) de `sql` avec paramètres positionnels `?`, mis en cache par version des données"""
+        key = (sql, tuple(params), self.version)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached.copy()
+        self.misses += 1
+        if self.engine == 'duckdb':
+            result = self.conn.execute(sql, list(params)).df()
+        else:
+            result = pd.read_sql_query(sql, self.conn, params=tuple(params))
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result.copy()
+
+    def named(self, name, *params):
+        """Requête prédéfinie de `QUERIES`"""
+        try:
+            sql = QUERIES[name]
+        except KeyError:
+            raise ValueError(f"Requête inconnue: {name!r} (disponibles: {', '.join(QUERIES)})") from None
+        if name == 'team_matches' and len(params) == 2:
+            params = (params[0], params[0], params[1])
+        return self.query(sql, params)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Requêtes SQL sur les sorties de l'ETL (DuckDB ou SQLite embarqué).")
+    parser.add_argument('sql', nargs='?', default='SELECT COUNT(*) AS matches FROM F_Match',
+                        help='Requête SQL (paramètres ? remplis par --param)')
+    parser.add_argument('--param', action='append', default=[], help='Valeur de paramètre (répétable, dans l\'ordre)')
+    parser.add_argument('--dir', default='warehouse_output', help='Dossier des sorties ETL (défaut: warehouse_output)')
+    parser.add_argument('--engine', choices=['auto', 'duckdb', 'sqlite'], default='auto')
+    args = parser.parse_args()
+
+    wh = Warehouse(args.dir, engine=args.engine)
+    params = [int(p) if p.lstrip('-').isdigit() else p for p in args.param]
+    for attempt in ('cold', 'cached'):
+        t0 = time.perf_counter()
+        result = wh.query(args.sql, params)
+        print(f'{attempt}: {len(result)} row(s) in {(time.perf_counter() - t0) * 1000:.1f} ms')
+    print(result.to_string(max_rows=20))